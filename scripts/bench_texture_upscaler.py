@@ -0,0 +1,138 @@
+"""
+Quality/speed benchmark of the TextureUpscaler denoise tiers.
+
+Every sample is downscaled by --scale (optionally JPEG-compressed, like a
+scraped listing image), upscaled back with each tier and compared with the
+original: time per image, PSNR and SSIM.
+
+With --maps, the fused generate_maps() is compared with the original separate
+normal/displacement map functions instead (time, peak allocation, equality).
+
+Usage:
+  python3 bench_texture_upscaler.py                        # public/clothing
+  python3 bench_texture_upscaler.py path/to/images --jpeg-quality 0
+  python3 bench_texture_upscaler.py --maps
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from texture_upscaler import DENOISE_TIERS, TextureUpscaler, collect_inputs
+
+DEFAULT_SAMPLES = os.path.join(os.path.dirname(__file__), "..", "public", "clothing")
+
+def legacy_normal_map(img):
+    """generate_normal_map() before generate_maps(), kept as a reference"""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if len(img.shape) == 3 else img
+    gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3, scale=1, delta=0, borderType=cv2.BORDER_DEFAULT)
+    gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3, scale=1, delta=0, borderType=cv2.BORDER_DEFAULT)
+    z = np.ones_like(gx) * 5.0
+    normal = np.dstack((-gx, -gy, z))
+    norm = np.linalg.norm(normal, axis=2, keepdims=True)
+    normal = normal / (norm + 1e-5)
+    normal_rgb = ((normal + 1) * 0.5 * 255).astype(np.uint8)
+    return cv2.cvtColor(normal_rgb, cv2.COLOR_RGB2BGR)
+
+def legacy_displacement_map(img):
+    """generate_displacement_map() before generate_maps(), kept as a reference"""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if len(img.shape) == 3 else img
+    return cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8)).apply(gray)
+
+def measure(fn, *args):
+    """(seconds, peak bytes allocated, result) of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+def bench_maps(references, scale):
+    upscaler = TextureUpscaler()
+    legacy = lambda img: {"normal": legacy_normal_map(img), "disp": legacy_displacement_map(img)}
+    totals = {"legacy": [0.0, 0], "fused": [0.0, 0]}
+    identical = 0
+    for ref in references:
+        # Maps are generated from upscaled images, so measure at that size
+        img = cv2.resize(ref, (ref.shape[1] * scale, ref.shape[0] * scale), interpolation=cv2.INTER_CUBIC)
+        results = {}
+        for name, fn in (("legacy", legacy), ("fused", upscaler.generate_maps)):
+            seconds, peak, results[name] = measure(fn, img)
+            totals[name][0] += seconds
+            totals[name][1] = max(totals[name][1], peak)
+        identical += all(np.array_equal(results["legacy"][k], results["fused"][k]) for k in ("normal", "disp"))
+
+    h, w = img.shape[:2]
+    print(f"{len(references)} images at {w}x{h}\n")
+    print("| maps   | ms / image | peak alloc (MB) |")
+    print("|--------|-----------:|----------------:|")
+    for name, (seconds, peak) in totals.items():
+        print(f"| {name:6s} | {seconds / len(references) * 1000:10.0f} | {peak / 1e6:15.0f} |")
+    print(f"\nIdentical maps: {identical}/{len(references)}")
+
+def ssim(a, b):
+    """Mean SSIM of the luma channels (Gaussian window, sigma 1.5)"""
+    a = cv2.cvtColor(a, cv2.COLOR_BGR2GRAY).astype(np.float64)
+    b = cv2.cvtColor(b, cv2.COLOR_BGR2GRAY).astype(np.float64)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    blur = lambda x: cv2.GaussianBlur(x, (11, 11), 1.5)
+    mu_a, mu_b = blur(a), blur(b)
+    var_a = blur(a * a) - mu_a * mu_a
+    var_b = blur(b * b) - mu_b * mu_b
+    cov = blur(a * b) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim_map.mean())
+
+def degrade(reference, scale, jpeg_quality):
+    h, w = reference.shape[:2]
+    low = cv2.resize(reference, (w // scale, h // scale), interpolation=cv2.INTER_AREA)
+    if jpeg_quality:
+        _, encoded = cv2.imencode(".jpg", low, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+        low = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+    return low
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TextureUpscaler denoise tiers")
+    parser.add_argument("samples", nargs="?", default=DEFAULT_SAMPLES, help="Image, directory or manifest")
+    parser.add_argument("--scale", type=int, default=4)
+    parser.add_argument("--jpeg-quality", type=int, default=60, help="Compress the downscaled input (0 = lossless)")
+    parser.add_argument("--limit", type=int, default=8, help="Samples to use")
+    parser.add_argument("--maps", action="store_true", help="Benchmark map generation instead of denoise tiers")
+    args = parser.parse_args()
+
+    references = []
+    for path in collect_inputs(args.samples)[:args.limit]:
+        img = cv2.imread(path, cv2.IMREAD_COLOR)
+        if img is not None:
+            h, w = img.shape[:2]
+            references.append(img[:h - h % args.scale, :w - w % args.scale])
+    if not references:
+        print(f"No images found in {args.samples}")
+        return
+    if args.maps:
+        bench_maps(references, args.scale)
+        return
+    print(f"{len(references)} samples, {args.scale}x, JPEG quality {args.jpeg_quality or 'lossless'}\n")
+
+    inputs = [degrade(ref, args.scale, args.jpeg_quality) for ref in references]
+    print("| tier     | ms / image | PSNR (dB) | SSIM   |")
+    print("|----------|-----------:|----------:|-------:|")
+    for tier in DENOISE_TIERS:
+        upscaler = TextureUpscaler(denoise=tier)
+        seconds, psnr, score = 0.0, 0.0, 0.0
+        for ref, low in zip(references, inputs):
+            start = time.perf_counter()
+            out = upscaler._upscale_fallback(low, args.scale)
+            seconds += time.perf_counter() - start
+            psnr += cv2.PSNR(ref, np.asarray(out))
+            score += ssim(ref, np.asarray(out))
+        n = len(references)
+        print(f"| {tier:8s} | {seconds / n * 1000:10.0f} | {psnr / n:9.2f} | {score / n:.4f} |")
+
+if __name__ == "__main__":
+    main()
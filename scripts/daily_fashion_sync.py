@@ -6,15 +6,8 @@ Aggregates data from Luxury and K-Fashion platforms and updates Supabase.
 
 import asyncio
 import os
-import json
 from datetime import datetime
-from typing import List, Dict, Any
-
-try:
-    from supabase import create_client, Client
-except ImportError:
-    print("Supabase library not found. Install with: pip install supabase")
-    Client = None
+from typing import List, Dict, Any, Optional
 
 import sys
 from pathlib import Path
@@ -23,7 +16,16 @@ sys.path.append(str(Path(__file__).parent / "scrapers"))
 
 from luxury_scrapers import FarfetchScraper, SsenseScraper
 from k_fashion_scrapers import MusinsaScraper, WConceptScraper
-from config import OUTPUT_FILE
+from config import OUTPUT_FILE, MAX_CONCURRENT_BRANDS
+from browser_pool import BrowserPool
+from http_fetcher import HttpFetcher
+from product_cache import ProductCache
+from scheduler import run_bounded
+from supabase_sync import SupabaseSyncer
+from ndjson_store import iter_ndjson, compact_ndjson, write_products_document
+from product import iter_products
+from checkpoint import CheckpointJournal
+from metrics import RunMetrics
 
 # Scraper registry
 SCRAPERS = {
@@ -33,72 +35,131 @@ SCRAPERS = {
     "WCONCEPT": WConceptScraper
 }
 
-async def run_sync(test_mode: bool = False, limit: int = 10):
+async def run_platform(name: str, scraper_cls, limit: int, test_mode: bool, pool: BrowserPool,
+                       http: HttpFetcher, journal: CheckpointJournal, metrics: RunMetrics,
+                       cache: Optional[ProductCache] = None) -> Path:
+    """Scrape one platform into its NDJSON stream and return the stream path"""
+    print(f"\nrunning {name}...")
+    scraper = scraper_cls(limit=limit, test_mode=test_mode, pool=pool, http=http, cache=cache, stream=True,
+                          resume=journal.has_brand(name), metrics=metrics)
+
+    # Scrape default categories
+    categories = ["women-tops", "women-dresses"]
+
+    for cat in categories:
+        if journal.is_done(name, cat):
+            print(f"⏭️  {name}: {cat} already scraped, skipping")
+            continue
+        if scraper.circuit_open(cat):
+            print(f"⛔ {name}: site keeps failing, skipping {cat}")
+            journal.mark_skipped(name, cat, "circuit open")
+            continue
+        if scraper.get_category_url(cat):
+            # Per-host politeness is handled by the scraper's rate limiter
+            products = await scraper.scrape(cat)
+            if products:
+                journal.mark_done(name, cat, len(products))
+            elif scraper.circuit_open(cat):
+                journal.mark_skipped(name, cat, "circuit open")
+
+    scraper.close_stream()
+    return scraper.stream_path
+
+async def run_sync(test_mode: bool = False, limit: int = 10, concurrency: int = MAX_CONCURRENT_BRANDS,
+                   full: bool = False, resume: bool = False) -> bool:
+    """Returns False when brands failed or were skipped, leaving the journal for --resume"""
     print(f"🌍 Starting Universal Fashion Sync (Test Mode: {test_mode})")
 
-    all_products = []
-
-    # 1. Run Scrapers
-    for name, scraper_cls in SCRAPERS.items():
-        try:
-            print(f"\nrunning {name}...")
-            scraper = scraper_cls(limit=limit, test_mode=test_mode)
-
-            # Scrape default categories
-            categories = ["women-tops", "women-dresses"]
-
-            for cat in categories:
-                if scraper.get_category_url(cat):
-                    products = await scraper.scrape(cat)
-                    all_products.extend(products)
-                    await asyncio.sleep(1) # Polite delay
-
-        except Exception as e:
-            print(f"❌ Error scraping {name}: {e}")
-
-    print(f"\n📊 Total collected items: {len(all_products)}")
+    # Finished platform categories survive a crash; --resume skips them and the
+    # sync below runs over the streams of both attempts.
+    journal = CheckpointJournal("daily_sync-test" if test_mode else "daily_sync", resume=resume)
+    if journal.resuming:
+        print(f"⏯️  Resuming: {len(journal.entries)} platform categories already scraped")
+
+    metrics = RunMetrics("daily_sync-test" if test_mode else "daily_sync")
+
+    # Fingerprint cache: skips unchanged detail pages and limits the sync to the delta.
+    # Mock data never touches it; --full re-reads every detail page and syncs everything.
+    cache = None if test_mode else ProductCache()
+    scraper_cache = None if full else cache
+
+    # 1. Run Scrapers (platforms in parallel, sharing one browser and one HTTP session)
+    async with BrowserPool(max_contexts=max(1, concurrency)) as pool, HttpFetcher() as http:
+        jobs = {
+            name: (lambda name=name, cls=scraper_cls: run_platform(
+                name, cls, limit, test_mode, pool, http, journal, metrics, scraper_cache))
+            for name, scraper_cls in SCRAPERS.items()
+        }
+        results = await run_bounded(jobs, concurrency)
+        metrics.browser_launch_seconds = pool.launch_seconds
+
+    # Products are read back from the per-platform streams instead of being
+    # kept in memory; only the delta is materialized
+    streams = [results[name] for name in SCRAPERS if isinstance(results[name], Path)]
+    total = sum(1 for _ in iter_ndjson(streams))
+    print(f"\n📊 Total collected items: {total}")
+
+    # Supabase rows keep the table's column names (url, image, ...), see Product.to_row()
+    if cache is not None and not full:
+        delta = [p.to_row() for p in cache.changed(iter_products(streams))]
+        print(f"🔎 {len(delta)} new or changed since the last run")
+    else:
+        delta = [p.to_row() for p in iter_products(streams)]
 
     # 2. Sync to Supabase
     supabase_url = os.environ.get("SUPABASE_URL")
     supabase_key = os.environ.get("SUPABASE_KEY")
 
-    if supabase_url and supabase_key and Client:
-        try:
-            print("☁️  Syncing to Supabase...")
-            supabase: Client = create_client(supabase_url, supabase_key)
-
-            # Upsert in batches
-            batch_size = 100
-            for i in range(0, len(all_products), batch_size):
-                batch = all_products[i:i+batch_size]
-
-                # Clean data for DB (remove internal keys if any)
-                # Assuming table 'products' exists with matching columns
-                data, count = supabase.table("products").upsert(batch).execute()
-                print(f"   Upserted batch {i//batch_size + 1}")
-
+    if supabase_url and supabase_key:
+        print(f"☁️  Syncing {len(delta)} rows to Supabase...")
+        with metrics.phase("sync"):
+            report = await SupabaseSyncer(supabase_url, supabase_key).sync(delta)
+        print(f"   {report.summary()}")
+
+        # Only rows Supabase accepted are recorded; failed or unsent rows are retried next run
+        if cache is not None:
+            synced_ids = {row["id"] for row in report.synced}
+            cache.record(p for p in iter_products(streams) if p.id in synced_ids)
+
+        if report.failed:
+            print(f"❌ {len(report.failed)} rows failed to sync")
+            save_failed(report.failed)
+        else:
             print("✅ Supabase Sync Complete")
-
-        except Exception as e:
-            print(f"❌ Supabase Sync Failed: {e}")
-            print("   Falling back to local JSON save.")
-            save_local(all_products)
     else:
-        print("⚠️  Supabase credentials not found or client missing. Saving locally.")
-        save_local(all_products)
-
-def save_local(products: List[Dict[str, Any]]):
+        print("⚠️  Supabase credentials not found. Saving locally.")
+        with metrics.phase("save"):
+            save_local(streams)
+        # Nothing reached Supabase, so the cache is left alone and the next
+        # run with credentials still syncs these products
+
+    if cache is not None:
+        cache.close()
+    metrics.write()
+
+    failed = [name for name in SCRAPERS if isinstance(results[name], Exception)]
+    if failed:
+        print(f"❌ Did not finish: {', '.join(failed)}")
+    if journal.skipped:
+        units = ", ".join(f"{brand}/{cat}" for brand, cat in journal.skipped)
+        print(f"⛔ Skipped by circuit breaker: {units}")
+    if failed or journal.skipped:
+        journal.close()
+        print("⚠️  Run incomplete; rerun with --resume to retry what is missing")
+        return False
+    journal.finish()
+    return True
+
+def save_local(streams: List[Path]):
+    """Compact the platform streams into the local snapshot file"""
     output_path = OUTPUT_FILE.parent / "universal_products_latest.json"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "syncedAt": datetime.now().isoformat(),
-            "count": len(products),
-            "products": products
-        }, f, ensure_ascii=False, indent=2)
+    count = compact_ndjson(streams, output_path, {"syncedAt": datetime.now().isoformat()})
+    print(f"💾 Saved {count} products to {output_path}")
 
-    print(f"💾 Saved to {output_path}")
+def save_failed(products: List[Dict[str, Any]]):
+    output_path = OUTPUT_FILE.parent / "universal_products_failed.json"
+    write_products_document(output_path, {"syncedAt": datetime.now().isoformat()}, products, len(products))
+    print(f"💾 Saved failed rows to {output_path}")
 
 if __name__ == "__main__":
     # Check for test mode flag or env var
@@ -106,6 +167,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--test", action="store_true", help="Run in test mode with mock data")
     parser.add_argument("--limit", type=int, default=10, help="Limit per category")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_BRANDS, help="Platforms scraped in parallel")
+    parser.add_argument("--full", action="store_true", help="Ignore the product cache and sync every product")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run instead of starting over")
     args = parser.parse_args()
 
-    asyncio.run(run_sync(test_mode=args.test, limit=args.limit))
+    complete = asyncio.run(run_sync(test_mode=args.test, limit=args.limit, concurrency=args.concurrency,
+                                    full=args.full, resume=args.resume))
+    # Non-zero when the journal is left for --resume, so CI keeps the checkpoint
+    if not complete:
+        sys.exit(1)
@@ -0,0 +1,37 @@
+import asyncio
+import re
+from typing import Any, List
+
+class ApiCapture:
+    """
+    Collects JSON bodies of responses whose URL matches one of `patterns`.
+
+    Attach it to a page before navigating; the retailer's own grid requests
+    (including the extra pages fetched while scrolling) are then read
+    directly, without rendering or querying the DOM.
+    """
+
+    def __init__(self, page, patterns: List[str]):
+        self.patterns = [re.compile(p) for p in patterns]
+        self._pending: List[asyncio.Task] = []
+        page.on("response", self._on_response)
+
+    def matches(self, url: str) -> bool:
+        return any(p.search(url) for p in self.patterns)
+
+    def _on_response(self, response):
+        if self.matches(response.url):
+            self._pending.append(asyncio.ensure_future(self._read(response)))
+
+    @staticmethod
+    async def _read(response) -> Any:
+        try:
+            return await response.json()
+        except Exception:
+            # Not JSON (redirect, HTML error page) or body already discarded
+            return None
+
+    async def payloads(self) -> List[Any]:
+        """All captured JSON payloads, in response order"""
+        results = await asyncio.gather(*self._pending)
+        return [r for r in results if r is not None]
@@ -0,0 +1,84 @@
+"""
+Re-derives texture_type and material_blend from composition for stored catalogs, e.g. after a
+PRESETS change.
+
+Usage:
+  python3 backfill_texture_types.py ../../data/scraped_products.json
+  python3 backfill_texture_types.py history.ndjson --output history.fixed.ndjson --workers 8
+"""
+import argparse
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from material_mapper import MaterialMapper
+from ndjson_store import NdjsonWriter, iter_ndjson, write_products_document
+
+BATCH_SIZE = 200000
+
+
+def reclassify(products: List[Dict[str, Any]], workers: Optional[int] = None) -> int:
+    """Updates texture_type/material_blend in place, returns how many products changed."""
+    # Brands without material data never carried a texture_type; leave them be
+    textured = [p for p in products if "composition" in p or "texture_type" in p]
+    compositions = [p.get("composition") for p in textured]
+    presets = MaterialMapper.classify_many(compositions, workers=workers)
+    blends = MaterialMapper.blend_many(compositions, workers=workers)
+    changed = 0
+    for product, preset, blend in zip(textured, presets, blends):
+        stored = product.get("material_blend")
+        if product.get("texture_type") != preset or stored is None or tuple(stored) != blend:
+            product["texture_type"] = preset
+            product["material_blend"] = blend
+            changed += 1
+    return changed
+
+
+def backfill_document(source: Path, output: Path, workers: Optional[int]) -> Tuple[int, int]:
+    with open(source, encoding="utf-8") as f:
+        document = json.load(f)
+
+    products = document.pop("products", [])
+    count_key = "totalCount" if "totalCount" in document else "count"
+    document.pop(count_key, None)
+
+    changed = reclassify(products, workers)
+    write_products_document(output, document, products, len(products), count_key=count_key)
+    return len(products), changed
+
+
+def backfill_ndjson(source: Path, output: Path, workers: Optional[int]) -> Tuple[int, int]:
+    # Batched so multi-million-row histories never sit in memory at once
+    total = changed = 0
+    rows = iter_ndjson([source])
+    with NdjsonWriter(output, reset=True) as writer:
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            changed += reclassify(batch, workers)
+            total += writer.write(batch)
+    return total, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill texture_type from composition")
+    parser.add_argument("source", type=Path, help="Products .json document or .ndjson stream")
+    parser.add_argument("--output", type=Path, help="Defaults to rewriting the source")
+    parser.add_argument("--workers", type=int, help="Classifier processes (default: CPU count)")
+    args = parser.parse_args()
+
+    output = args.output or args.source
+    if args.source.suffix == ".ndjson":
+        if output == args.source:
+            parser.error("NDJSON input needs a separate --output")
+        total, changed = backfill_ndjson(args.source, output, args.workers)
+    else:
+        total, changed = backfill_document(args.source, output, args.workers)
+
+    print(f"✅ Reclassified {total} products, {changed} texture types changed -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,135 +1,446 @@
 import asyncio
-import json
-import random
 import re
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 
 try:
-    from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-    from fake_useragent import UserAgent
+    from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 except ImportError:
     print("Dependencies missing. Run: pip install -r scripts/scrapers/requirements.txt")
     exit(1)
 
 from config import (
-    HEADLESS, VIEWPORT, DEFAULT_TIMEOUT, RETRY_COUNT, RETRY_DELAY,
-    REQUEST_DELAY_MIN, REQUEST_DELAY_MAX, DATA_DIR, KRW_TO_USD_RATE
+    DEFAULT_TIMEOUT, RETRY_COUNT, NAVIGATION_WAIT_UNTIL, GRID_READY_TIMEOUT,
+    SCROLL_MAX_ROUNDS, SCROLL_STALL_ROUNDS, SCROLL_GROWTH_TIMEOUT,
+    DATA_DIR, TEST_DATA_DIR, KRW_TO_USD_RATE, BRAND_SELECTORS, DETAIL_COMPOSITION_SELECTORS
+)
+from api_capture import ApiCapture
+from detail_crawler import DetailCrawler
+from product import Product
+from product_cache import ProductCache
+from ndjson_store import NdjsonWriter, iter_ndjson, compact_ndjson, write_products_document
+from extraction import extract_cards, card_selectors, count_cards, CARDS_GREW_JS
+from browser_pool import BrowserPool
+from http_fetcher import HttpFetcher, extract_cards_html
+from metrics import RunMetrics, TransferCounter
+from snapshots import Snapshot, SnapshotStore, StaticCapture, serve_snapshot
+from scheduler import (
+    HostRateLimiter, HOST_RATE_LIMITER, HostCircuitBreaker, HOST_CIRCUIT_BREAKER, CircuitOpenError, backoff_delay
 )
 
 class BaseScraper(ABC):
-    def __init__(self, brand_name: str, limit: int = 50, test_mode: bool = False):
+    # Regexes for retailer JSON endpoints understood by parse_api_payload().
+    # When set, products are read from captured responses and the DOM is
+    # only used as a fallback.
+    API_PATTERNS: List[str] = []
+
+    # Visit every product's detail page to read its material composition
+    DETAIL_COMPOSITION = False
+
+    # "browser" renders listings in Chromium; "http" fetches server-rendered
+    # listings with aiohttp and parses them with BeautifulSoup (same selector
+    # spec), falling back to the browser when the HTML has no product cards
+    FETCHER = "browser"
+
+    def __init__(
+        self,
+        brand_name: str,
+        limit: int = 50,
+        test_mode: bool = False,
+        pool: Optional[BrowserPool] = None,
+        http: Optional[HttpFetcher] = None,
+        fetcher: Optional[str] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        detail_rate_limiter: Optional[HostRateLimiter] = None,
+        breaker: Optional[HostCircuitBreaker] = None,
+        cache: Optional[ProductCache] = None,
+        stream: bool = False,
+        resume: bool = False,
+        metrics: Optional[RunMetrics] = None,
+        record_to: Optional[SnapshotStore] = None,
+        replay_from: Optional[SnapshotStore] = None,
+    ):
         self.brand_name = brand_name
         self.limit = limit
         self.test_mode = test_mode
-        self.ua = UserAgent()
-        self.products: List[Dict[str, Any]] = []
+        # Shared browser pool lent by the orchestrator; a private one is
+        # created per scrape() call when running standalone.
+        self.pool = pool
+        # Shared HTTP session for FETCHER = "http"; `fetcher` overrides the class default
+        self.http = http
+        self.fetcher = fetcher or self.FETCHER
+        self.rate_limiter = rate_limiter or HOST_RATE_LIMITER
+        # Detail pages are paced separately; see DetailCrawler
+        self.detail_rate_limiter = detail_rate_limiter
+        # Stops retrying a retailer that keeps failing, across categories and brands
+        self.breaker = breaker or HOST_CIRCUIT_BREAKER
+        # Optional fingerprint cache; lets unchanged products skip detail pages
+        self.cache = cache
+        # With `stream`, every scraped category is appended to an NDJSON file
+        # right away and save_products() compacts it, instead of holding the
+        # whole brand in memory until the end of the run.
+        self.stream = stream
+        # Mock data never lands in the streams a real --resume appends to
+        self.data_dir = TEST_DATA_DIR if test_mode else DATA_DIR
+        self.stream_path = self.data_dir / f"{brand_name.lower()}_products.ndjson"
+        self._stream_writer: Optional[NdjsonWriter] = None
+        self.streamed_count = 0
+        # Resuming an interrupted run appends to the stream it left behind
+        self.resume = resume
+        if stream and resume:
+            self.streamed_count = sum(1 for _ in iter_ndjson([self.stream_path]))
+        self.products: List[Product] = []
+        # Phase timings; orchestrators share one RunMetrics and write it out
+        self.metrics = metrics or RunMetrics()
+        # Offline harness: save listing snapshots while scraping, or scrape
+        # previously saved snapshots instead of the live site
+        self.record_to = record_to
+        self.replay_from = replay_from
 
-    async def scrape(self, category: str = "women-tops") -> List[Dict[str, Any]]:
+    @property
+    def selector_spec(self) -> Dict[str, Any]:
+        """Product card selectors for this brand from config.BRAND_SELECTORS"""
+        return BRAND_SELECTORS[self.brand_name.upper()]
+
+    async def scrape(self, category: str = "women-tops") -> List[Product]:
         """Main scraping method"""
         print(f"🛍️  Scraping {self.brand_name}: {category}")
 
+        self.products = []
+        with self.metrics.unit(self.brand_name, category) as unit:
+            await self._scrape_category(category)
+            unit.products += len(self.products)
+
+        # One timestamp string per category, shared by all of its products
+        scraped_at = datetime.now().isoformat()
+        for product in self.products:
+            product.scraped_at = scraped_at
+
+        self._emit(self.products)
+        return self.products
+
+    async def _scrape_category(self, category: str):
         if self.test_mode:
             print("   ⚠️ TEST MODE - Using mock data")
             self.products = self.generate_mock_products(category, self.limit)
-            return self.products
+            return
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=HEADLESS)
-            context = await self._create_context(browser)
-            page = await context.new_page()
+        url = self.get_category_url(category)
+        if not url:
+            print(f"   ❌ URL not found for category: {category}")
+            return
 
-            try:
-                url = self.get_category_url(category)
-                if not url:
-                    print(f"   ❌ URL not found for category: {category}")
-                    return []
+        print(f"   URL: {url}")
+        try:
+            if not self.breaker.allow(url):
+                raise CircuitOpenError(f"{url} is failing repeatedly, skipping")
+            if self.fetcher == "http":
+                await self._scrape_http(url, category)
+                if self.products:
+                    return
+                print("   ⚠️ No products in the static HTML, falling back to the browser")
+            if self.pool is not None:
+                await self._scrape_url(self.pool, url, category)
+            else:
+                async with BrowserPool(max_contexts=1) as pool:
+                    await self._scrape_url(pool, url, category)
+                    self.metrics.browser_launch_seconds += pool.launch_seconds
+        except CircuitOpenError as e:
+            print(f"   ⛔ {e}")
+
+    def circuit_open(self, category: str) -> bool:
+        """Whether the category's host is currently being skipped by the circuit breaker"""
+        url = None if self.test_mode else self.get_category_url(category)
+        return bool(url) and self.breaker.is_open(url)
+
+    def _emit(self, products: List[Product]):
+        """Append a finished category to this brand's NDJSON stream"""
+        if not self.stream:
+            return
+        if self._stream_writer is None:
+            self._stream_writer = NdjsonWriter(self.stream_path, reset=not self.resume)
+        self.streamed_count += self._stream_writer.write(p.to_dict() for p in products)
 
-                print(f"   URL: {url}")
-                await self._navigate(page, url)
-                await self._scroll_page(page)
-                await self._extract_products(page, category)
+    def close_stream(self):
+        if self._stream_writer is not None:
+            self._stream_writer.close()
+            self._stream_writer = None
 
+    async def _scrape_url(self, pool: BrowserPool, url: str, category: str):
+        """Scrape a single listing page using a context leased from the pool"""
+        phase = lambda name: self.metrics.phase(name, self.brand_name, category)
+
+        # Waiting for a pool slot, launching the browser and opening the page
+        leased_at = time.perf_counter()
+        async with pool.page() as page:
+            self.metrics.add_phase("launch", time.perf_counter() - leased_at, self.brand_name, category)
+            snapshot = None
+            if self.replay_from is not None:
+                snapshot = self.replay_from.load(self.brand_name, category)
+                url = snapshot.url
+                await serve_snapshot(page, snapshot)
+                capture = StaticCapture(snapshot.payloads) if self.API_PATTERNS else None
+            else:
+                capture = ApiCapture(page, self.API_PATTERNS) if self.API_PATTERNS else None
+            transfer = TransferCounter(page.context)
+            try:
+                with phase("navigation"):
+                    await self._navigate(page, url)
+                if snapshot is None:
+                    # Snapshots are recorded after scrolling
+                    with phase("scroll"):
+                        await self._scroll_page(page)
+                with phase("extraction"):
+                    if capture is None or not await self._extract_from_api(capture, category):
+                        await self._extract_products(page, category)
+                if self.record_to is not None:
+                    await self._record_snapshot(page, url, category, capture)
+                # Detail pages are not part of snapshots
+                if self.DETAIL_COMPOSITION and self.products and snapshot is None:
+                    with phase("details"):
+                        await self._enrich_compositions(context=page.context)
+
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 print(f"   ❌ Scraping error: {e}")
                 # Fallback to mock data in case of failure if needed,
                 # but for now we just return what we have or empty list.
-
             finally:
-                await browser.close()
+                self.metrics.unit_for(self.brand_name, category).bytes += await transfer.total()
 
-        return self.products
+    async def _scrape_http(self, url: str, category: str):
+        """Scrape a server-rendered listing without a browser"""
+        phase = lambda name: self.metrics.phase(name, self.brand_name, category)
+        unit = self.metrics.unit_for(self.brand_name, category)
+        fetcher = self.http or HttpFetcher()
+        try:
+            with phase("navigation"):
+                if self.replay_from is not None:
+                    snapshot = self.replay_from.load(self.brand_name, category)
+                    url, html = snapshot.url, snapshot.html
+                else:
+                    html = await self._fetch_listing(fetcher, url, unit.add_bytes)
+            with phase("extraction"):
+                cards = extract_cards_html(html, self.selector_spec, self.limit)
+                print(f"   Found {len(cards)} products in static HTML.")
+                self._parse_cards(cards, category)
+            if self.record_to is not None:
+                path = self.record_to.save(Snapshot(
+                    self.brand_name, category, url, html, expected=[p.to_dict() for p in self.products]
+                ))
+                print(f"   📸 Snapshot saved to {path}")
+            if self.DETAIL_COMPOSITION and self.products and self.replay_from is None:
+                with phase("details"):
+                    await self._enrich_compositions(
+                        fetch_text=lambda detail_url: fetcher.fetch_text(detail_url, unit.add_bytes)
+                    )
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"   ❌ Scraping error: {e}")
+        finally:
+            if self.http is None:
+                await fetcher.close()
+
+    async def _fetch_listing(self, fetcher: HttpFetcher, url: str, on_bytes) -> str:
+        """GET a listing page with the same retry, backoff and breaker rules as _navigate"""
+        for attempt in range(RETRY_COUNT):
+            try:
+                await self.rate_limiter.wait(url)
+                html = await fetcher.fetch(url, on_bytes)
+            except Exception as e:
+                print(f"   ⚠️ Connection attempt {attempt + 1} failed: {e}")
+                self._record_failure(url, e)
+                if attempt + 1 < RETRY_COUNT:
+                    await asyncio.sleep(backoff_delay(attempt))
+                continue
 
-    async def _create_context(self, browser: Browser) -> BrowserContext:
-        """Create browser context with randomized user agent"""
-        user_agent = self.ua.random
-        return await browser.new_context(
-            viewport=VIEWPORT,
-            user_agent=user_agent
+            self.breaker.record_success(url)
+            return html
+        raise Exception(f"Failed to connect to {url} after {RETRY_COUNT} attempts")
+
+    async def _record_snapshot(self, page: Page, url: str, category: str, capture: Optional[ApiCapture]):
+        snapshot = Snapshot(
+            brand=self.brand_name,
+            category=category,
+            url=url,
+            html=await page.content(),
+            payloads=await capture.payloads() if capture is not None else [],
+            expected=[p.to_dict() for p in self.products],
         )
+        path = self.record_to.save(snapshot)
+        print(f"   📸 Snapshot saved to {path}")
 
     async def _navigate(self, page: Page, url: str):
-        """Navigate to URL with retry logic"""
+        """Navigate to URL, retrying with jittered exponential backoff"""
         for attempt in range(RETRY_COUNT):
             try:
-                await page.goto(url, wait_until="networkidle", timeout=DEFAULT_TIMEOUT)
-                await self._random_delay()
-                return
+                # Politeness is enforced per host, so other retailers are not held up
+                await self.rate_limiter.wait(url)
+                await page.goto(url, wait_until=NAVIGATION_WAIT_UNTIL, timeout=DEFAULT_TIMEOUT)
             except Exception as e:
                 print(f"   ⚠️ Connection attempt {attempt + 1} failed: {e}")
-                await asyncio.sleep(RETRY_DELAY * (attempt + 1))
+                self._record_failure(url, e)
+                if attempt + 1 < RETRY_COUNT:
+                    await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            self.breaker.record_success(url)
+            await self._wait_for_grid(page)
+            return
         raise Exception(f"Failed to connect to {url} after {RETRY_COUNT} attempts")
 
+    def _record_failure(self, url: str, error: Exception):
+        """Count a failed listing request; raises CircuitOpenError once the host's circuit opens"""
+        # A host that lets a request run into its timeout is hung rather than
+        # flaky; retrying would cost another full timeout per attempt
+        timed_out = isinstance(error, (PlaywrightTimeoutError, asyncio.TimeoutError, TimeoutError))
+        if self.breaker.record_failure(url, trip=timed_out):
+            reason = "timed out" if timed_out else f"failed {self.breaker.threshold} times in a row"
+            raise CircuitOpenError(f"{url} {reason}, skipping")
+
+    async def _wait_for_grid(self, page: Page):
+        """Wait until the first product card is attached instead of for network idle"""
+        card_selector = ", ".join(card_selectors(self.selector_spec))
+        try:
+            await page.wait_for_selector(card_selector, state="attached", timeout=GRID_READY_TIMEOUT)
+        except Exception:
+            print("   ⚠️ Product grid not found yet, extracting what is there")
+
     async def _scroll_page(self, page: Page):
-        """Scroll page to trigger lazy loading"""
-        # Determine how many scrolls based on limit (rough estimate)
-        scrolls = max(3, self.limit // 10)
-        print(f"   Process: Scrolling {scrolls} times...")
+        """Scroll until `limit` product cards are loaded or new cards stop appearing"""
+        selectors = card_selectors(self.selector_spec)
+        count = await count_cards(page, selectors)
+        scrolls = 0
+        stalls = 0
 
-        for _ in range(scrolls):
+        while count < self.limit and scrolls < SCROLL_MAX_ROUNDS and stalls < SCROLL_STALL_ROUNDS:
             await page.keyboard.press("End")
-            await asyncio.sleep(1.5)
-            await self._random_delay()
+            scrolls += 1
+            try:
+                # Returns as soon as the grid grows, instead of sleeping a fixed time
+                await page.wait_for_function(CARDS_GREW_JS, arg=[selectors, count], timeout=SCROLL_GROWTH_TIMEOUT)
+            except Exception:
+                pass
+
+            new_count = await count_cards(page, selectors)
+            stalls = stalls + 1 if new_count <= count else 0
+            count = new_count
 
-    async def _random_delay(self):
-        """Sleep for random interval"""
-        delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
-        await asyncio.sleep(delay)
+        print(f"   Process: Scrolled {scrolls} times, {count} products loaded")
 
     @abstractmethod
     def get_category_url(self, category: str) -> Optional[str]:
         """Return URL for the given category"""
         pass
 
-    @abstractmethod
     async def _extract_products(self, page: Page, category: str):
-        """Extract products from the page"""
+        """Extract products from the page in a single in-page pass"""
+        cards = await extract_cards(page, self.selector_spec, self.limit)
+        print(f"   Found {len(cards)} products on page.")
+        self._parse_cards(cards, category)
+
+    def _parse_cards(self, cards: List[Dict[str, Optional[str]]], category: str):
+        for i, card in enumerate(cards):
+            try:
+                product = self._parse_card(card, category, i)
+            except Exception as e:
+                print(f"   ❌ Error scraping product {i+1}: {e}")
+                continue
+            if product:
+                self.products.append(product)
+
+        print(f"   ✅ Extracted {len(self.products)} products")
+
+    async def _enrich_compositions(self, context=None, fetch_text=None):
+        """Read composition for every product from its detail page"""
+        pending = self.products
+        if self.cache is not None:
+            pending = self.cache.apply_cached_details(self.products)
+            print(f"   ♻️  Reusing cached composition for {len(self.products) - len(pending)} products")
+
+        if pending:
+            print(f"   Analyzing material for {len(pending)} products...")
+            crawler = DetailCrawler(
+                context,
+                translate=self.translate_composition,
+                fetch_text=fetch_text,
+                composition_selector=DETAIL_COMPOSITION_SELECTORS.get(self.brand_name.upper()),
+                rate_limiter=self.detail_rate_limiter,
+                breaker=self.breaker,
+            )
+            found = await crawler.enrich(pending)
+            print(f"   ✅ Composition found for {found}/{len(pending)} products")
+            if self.cache is not None:
+                # Only successful reads are cached; misses are retried next run
+                self.cache.remember_details([p for p in pending if p.composition])
+
+    def translate_composition(self, text: str) -> str:
+        """Normalize detail page text before composition parsing (e.g. translation)"""
+        return text
+
+    async def _extract_from_api(self, capture: ApiCapture, category: str) -> bool:
+        """Build products from captured JSON responses; False means fall back to the DOM"""
+        seen = set()
+        for payload in await capture.payloads():
+            try:
+                products = self.parse_api_payload(payload, category)
+            except Exception as e:
+                print(f"   ⚠️ Could not parse API payload: {e}")
+                continue
+            for product in products:
+                if len(self.products) >= self.limit:
+                    break
+                if product.id not in seen:
+                    seen.add(product.id)
+                    self.products.append(product)
+
+        if self.products:
+            print(f"   ✅ Extracted {len(self.products)} products from JSON API")
+            return True
+
+        print("   ⚠️ No API products captured, falling back to DOM extraction")
+        return False
+
+    def parse_api_payload(self, payload: Any, category: str) -> List[Product]:
+        """Map one captured JSON payload to products (used with API_PATTERNS)"""
+        return []
+
+    @abstractmethod
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        """Map one extracted product card (field name -> text/attribute) to a product"""
         pass
 
     @abstractmethod
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         """Generate mock products for testing"""
         pass
 
     def save_products(self, filename: Optional[str] = None):
-        """Save extracted products to JSON"""
+        """Save extracted products to JSON (compacting the NDJSON stream when streaming)"""
         if not filename:
             filename = f"{self.brand_name.lower()}_products.json"
 
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        output_path = DATA_DIR / filename
+        output_path = self.data_dir / filename
+        header = {
+            "brand": self.brand_name,
+            "scrapedAt": datetime.now().isoformat(),
+        }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump({
-                "brand": self.brand_name,
-                "scrapedAt": datetime.now().isoformat(),
-                "count": len(self.products),
-                "products": self.products
-            }, f, ensure_ascii=False, indent=2)
+        with self.metrics.phase("save", self.brand_name):
+            if self.stream:
+                self.close_stream()
+                count = compact_ndjson([self.stream_path], output_path, header)
+            else:
+                count = len(self.products)
+                write_products_document(output_path, header, (p.to_dict() for p in self.products), count)
 
-        print(f"\n💾 Saved {len(self.products)} products to {output_path}")
+        print(f"\n💾 Saved {count} products to {output_path}")
 
     def normalize_price(self, price_text: str, currency: str = "KRW") -> float:
         """Extract numeric price and convert to USD"""
@@ -0,0 +1,97 @@
+"""
+Throughput benchmark: compiled Korean material translator vs. the original
+sequential str.replace version.
+
+Usage:
+  python3 bench_korean_translation.py [--rounds 20]
+  python3 bench_korean_translation.py --dump musinsa_pages.txt --dump wconcept_pages.txt
+
+A dump is a text file of detail-page bodies separated by blank lines. Without
+one, synthetic Musinsa/W Concept-like pages are generated.
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import List
+
+from k_fashion_scrapers import translate_korean_material
+from material_mapper import MaterialMapper
+
+LEGACY_REPLACEMENTS = {
+    "면": "Cotton", "코튼": "Cotton", "울": "Wool", "모": "Wool", "캐시미어": "Cashmere",
+    "폴리에스터": "Polyester", "폴리": "Polyester", "나일론": "Nylon", "레이온": "Rayon",
+    "아크릴": "Acrylic", "마": "Linen", "린넨": "Linen", "리넨": "Linen", "가죽": "Leather",
+    "실크": "Silk", "견": "Silk", "스판": "Spandex", "우레탄": "Polyurethane",
+}
+
+
+def legacy_translate(text: str) -> str:
+    translated = text
+    for kr, en in LEGACY_REPLACEMENTS.items():
+        translated = translated.replace(kr, en)
+    return translated
+
+
+PAGE_LINES = [
+    "모델 정보: 키 180cm, 몸무게 70kg, 착용 사이즈 L", "겨울 시즌 한정 상품입니다",
+    "마감 처리가 꼼꼼한 제품", "세탁 시 단독 손세탁을 권장합니다", "배송 기간: 2~3일 소요",
+    "무신사 스토어 단독 발매", "상품 문의는 고객센터로 연락 바랍니다", "표면 보풀이 발생할 수 있습니다",
+    "제조국: 대한민국", "브랜드 정품 보증", "사이즈 상세 정보 확인",
+]
+COMPOSITIONS = [
+    "면 100%", "겉감: 모 90%, 캐시미어 10%", "폴리에스터 95%, 폴리우레탄 5%", "나일론 80%, 스판 20%",
+    "울 50%, 폴리에스테르 50%", "견 100%", "린넨 55%, 코튼 45%", "가죽 100%", "레이온 70%, 마 30%",
+]
+
+
+def synthetic_pages(count: int, seed: int = 5) -> List[str]:
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(count):
+        lines = [rng.choice(PAGE_LINES) for _ in range(rng.randint(30, 90))]
+        lines.insert(rng.randrange(len(lines)), "소재 " + rng.choice(COMPOSITIONS))
+        pages.append("\n".join(lines))
+    return pages
+
+
+def load_dumps(paths: List[Path]) -> List[str]:
+    pages = []
+    for path in paths:
+        pages.extend(p for p in path.read_text(encoding="utf-8").split("\n\n") if p.strip())
+    return pages
+
+
+def throughput(translate, pages: List[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            translate(page)
+    elapsed = time.perf_counter() - start
+    return sum(len(p.encode("utf-8")) for p in pages) * rounds / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Korean material translation")
+    parser.add_argument("--dump", type=Path, action="append", default=[], help="Page dump file (repeatable)")
+    parser.add_argument("--pages", type=int, default=500, help="Synthetic pages when no dump is given")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_dumps(args.dump) if args.dump else synthetic_pages(args.pages)
+    size_mb = sum(len(p.encode("utf-8")) for p in pages) / 1e6
+    print(f"📄 {len(pages)} pages, {size_mb:.1f} MB")
+
+    legacy = throughput(legacy_translate, pages, args.rounds)
+    compiled = throughput(translate_korean_material, pages, args.rounds)
+    print(f"📊 legacy {legacy:.1f} MB/s, compiled {compiled:.1f} MB/s ({compiled / legacy:.1f}x)")
+
+    differing = sum(
+        MaterialMapper.parse_composition(legacy_translate(p)) != MaterialMapper.parse_composition(translate_korean_material(p))
+        for p in pages
+    )
+    print(f"🔎 Parsed composition differs on {differing}/{len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
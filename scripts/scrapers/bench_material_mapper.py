@@ -0,0 +1,140 @@
+"""
+Micro-benchmark: compiled MaterialMapper vs. the original implementation.
+
+Usage: python3 bench_material_mapper.py [--rounds 200]
+"""
+import argparse
+import random
+import re
+import time
+
+from material_mapper import MaterialMapper
+
+
+class LegacyMaterialMapper:
+    """The pre-compilation mapper, kept verbatim as the reference for outputs."""
+
+    PRESETS = MaterialMapper.PRESETS
+
+    @staticmethod
+    def parse_composition(text: str) -> dict:
+        if not text:
+            return {}
+
+        text = text.lower()
+        matches_1 = re.findall(r'(\d+)\s*%\s*([a-z\s]+)', text)
+        matches_2 = re.findall(r'([a-z\s]+)\s*(\d+)\s*%', text)
+
+        composition = {}
+
+        valid_keywords = set()
+        for keywords in LegacyMaterialMapper.PRESETS.values():
+            valid_keywords.update(keywords)
+
+        for amount, material in matches_1:
+            clean_mat = material.strip()
+            if not clean_mat:
+                continue
+            if any(k in clean_mat for k in valid_keywords):
+                composition[clean_mat] = composition.get(clean_mat, 0) + int(amount)
+
+        for material, amount in matches_2:
+            clean_mat = material.strip()
+            if not clean_mat:
+                continue
+            if any(k in clean_mat for k in valid_keywords):
+                composition[clean_mat] = composition.get(clean_mat, 0) + int(amount)
+
+        return composition
+
+    @staticmethod
+    def get_preset(material_text: str) -> str:
+        if not material_text:
+            return "cotton"
+
+        text = material_text.lower()
+        composition = LegacyMaterialMapper.parse_composition(text)
+
+        dominant_material = "cotton"
+        max_percentage = 0
+
+        if composition:
+            for mat, percent in composition.items():
+                if percent > max_percentage:
+                    max_percentage = percent
+                    dominant_material = mat
+        else:
+            dominant_material = text
+
+        for preset, keywords in LegacyMaterialMapper.PRESETS.items():
+            for keyword in keywords:
+                if keyword in dominant_material:
+                    return preset
+
+        return "cotton"
+
+
+FILLER = [
+    "Free returns within 30 days", "Size 12", "Model is 180 cm and wears size M",
+    "Machine wash at 30°C", "Made in Italy", "Add to bag", "20% off today only",
+    "Outer:", "Lining:", "Care", "SKU 104392", "Ships in 2-3 days",
+]
+MATERIALS = [kw for keywords in MaterialMapper.PRESETS.values() for kw in keywords] + ["love", "metal"]
+
+
+def random_composition(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        mat = rng.choice(MATERIALS).title()
+        pct = rng.choice([5, 10, 20, 30, 45, 50, 70, 100])
+        parts.append(rng.choice([f"{pct}% {mat}", f"{mat} {pct}%", f"{pct} % {mat}", f"{mat}{pct}%"]))
+    return rng.choice([", ", " ", " / ", "\n"]).join(parts)
+
+
+def random_page(rng: random.Random) -> str:
+    # Stand-in for a product page body as DetailCrawler hands it over.
+    lines = [rng.choice(FILLER) for _ in range(rng.randint(40, 120))]
+    lines.insert(rng.randrange(len(lines)), random_composition(rng))
+    return "\n".join(lines)
+
+
+def corpus(seed: int = 7):
+    rng = random.Random(seed)
+    short = [random_composition(rng) for _ in range(500)]
+    pages = [random_page(rng) for _ in range(100)]
+    return short, pages
+
+
+def assert_same_outputs(texts):
+    for text in texts:
+        assert MaterialMapper.parse_composition(text) == LegacyMaterialMapper.parse_composition(text), text
+        assert list(MaterialMapper.parse_composition(text)) == list(LegacyMaterialMapper.parse_composition(text)), text
+        assert MaterialMapper.get_preset(text) == LegacyMaterialMapper.get_preset(text), text
+
+
+def time_mapper(mapper, texts, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            mapper.get_preset(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MaterialMapper")
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over each corpus")
+    args = parser.parse_args()
+
+    short, pages = corpus()
+    assert_same_outputs(short + pages)
+    print("✅ Compiled and legacy mappers agree on all inputs")
+
+    for label, texts, rounds in (("composition strings", short, args.rounds), ("page bodies", pages, max(1, args.rounds // 10))):
+        legacy = time_mapper(LegacyMaterialMapper, texts, rounds)
+        compiled = time_mapper(MaterialMapper, texts, rounds)
+        calls = len(texts) * rounds
+        print(f"📊 {label}: legacy {calls / legacy:,.0f}/s, compiled {calls / compiled:,.0f}/s ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+try:
+    from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+    from fake_useragent import UserAgent
+except ImportError:
+    print("Dependencies missing. Run: pip install -r scripts/scrapers/requirements.txt")
+    exit(1)
+
+from config import (
+    HEADLESS, VIEWPORT, POOL_MAX_CONTEXTS, POOL_CONTEXT_MAX_USES, ROTATE_USER_AGENT,
+    BLOCK_RESOURCES, BLOCKED_RESOURCE_TYPES, BLOCKED_URL_KEYWORDS
+)
+
+BLOCKED_URL_PATTERN = re.compile("|".join(re.escape(k) for k in BLOCKED_URL_KEYWORDS))
+
+def should_block_request(resource_type: str, url: str) -> bool:
+    """True for images/media/fonts and known analytics/ad endpoints"""
+    return resource_type in BLOCKED_RESOURCE_TYPES or bool(BLOCKED_URL_PATTERN.search(url))
+
+async def _block_heavy_resources(route):
+    request = route.request
+    if should_block_request(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+class BrowserPool:
+    """
+    Long-lived Chromium instance that lends browser contexts to scrapers.
+
+    The browser is launched lazily on the first lease and kept alive until the
+    pool is closed, so a full run pays for a single cold start instead of one
+    per category. Contexts are recycled between leases (cookies cleared, stray
+    pages closed) and retired after `max_context_uses` leases so that user
+    agents keep rotating. With `block_resources`, every context aborts images,
+    media, fonts and analytics requests at the network layer.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = POOL_MAX_CONTEXTS,
+        max_context_uses: int = POOL_CONTEXT_MAX_USES,
+        rotate_user_agent: bool = ROTATE_USER_AGENT,
+        block_resources: bool = BLOCK_RESOURCES,
+    ):
+        self.max_contexts = max_contexts
+        self.max_context_uses = max_context_uses
+        self.rotate_user_agent = rotate_user_agent
+        self.block_resources = block_resources
+        self.ua = UserAgent()
+        self.launches = 0
+        self.launch_seconds = 0.0
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._user_agent: Optional[str] = None
+        self._idle: List[BrowserContext] = []
+        self._uses: Dict[BrowserContext, int] = {}
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._launch_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_browser(self) -> Browser:
+        """Launch Chromium once, on first use"""
+        if self._browser is None:
+            async with self._launch_lock:
+                if self._browser is None:
+                    start = time.perf_counter()
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(headless=HEADLESS)
+                    self.launches += 1
+                    self.launch_seconds += time.perf_counter() - start
+                    print("   🌐 Browser launched (shared pool)")
+        return self._browser
+
+    def _next_user_agent(self) -> str:
+        if self.rotate_user_agent or self._user_agent is None:
+            self._user_agent = self.ua.random
+        return self._user_agent
+
+    async def _new_context(self) -> BrowserContext:
+        """Create browser context with randomized user agent"""
+        browser = await self._ensure_browser()
+        context = await browser.new_context(
+            viewport=VIEWPORT,
+            user_agent=self._next_user_agent()
+        )
+        if self.block_resources:
+            await context.route("**/*", _block_heavy_resources)
+        self._uses[context] = 0
+        return context
+
+    async def _acquire(self) -> BrowserContext:
+        if self._idle:
+            return self._idle.pop()
+        return await self._new_context()
+
+    async def _release(self, context: BrowserContext):
+        """Return a context to the pool, or retire it once it is used up"""
+        self._uses[context] += 1
+        if self._uses[context] >= self.max_context_uses or self._browser is None:
+            await self._retire(context)
+            return
+
+        try:
+            for page in list(context.pages):
+                await page.close()
+            await context.clear_cookies()
+        except Exception:
+            await self._retire(context)
+            return
+
+        self._idle.append(context)
+
+    async def _retire(self, context: BrowserContext):
+        self._uses.pop(context, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Lease a browser context for the duration of the block"""
+        async with self._slots:
+            context = await self._acquire()
+            try:
+                yield context
+            finally:
+                await self._release(context)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Lease a context and open a fresh page in it"""
+        async with self.context() as context:
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                if not page.is_closed():
+                    await page.close()
+
+    async def close(self):
+        """Close all pooled contexts and shut the browser down"""
+        for context in self._idle:
+            await self._retire(context)
+        self._idle.clear()
+
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
@@ -0,0 +1,67 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import CHECKPOINT_DIR
+from ndjson_store import NdjsonWriter, iter_ndjson
+
+class CheckpointJournal:
+    """
+    Append-only record of finished (brand, category) units of a scrape run.
+
+    A unit is journaled only after its products are in the brand's NDJSON
+    stream, so a rerun with resume=True can skip it and append the remaining
+    categories to the same stream. A unit that crashed between the two writes
+    is scraped again; compaction keeps one copy per product id.
+    """
+
+    def __init__(self, name: str, resume: bool = False, directory: Path = CHECKPOINT_DIR):
+        self.path = Path(directory) / f"{name}.jsonl"
+        if not resume and self.path.exists():
+            self.path.unlink()
+
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {
+            (entry["brand"], entry["category"]): entry for entry in iter_ndjson([self.path])
+        }
+        self._writer: Optional[NdjsonWriter] = None
+
+    @property
+    def resuming(self) -> bool:
+        return bool(self.entries)
+
+    def has_brand(self, brand: str) -> bool:
+        """Whether this run already wrote to the brand's stream"""
+        return any(b == brand and e["status"] == "done" for (b, _), e in self.entries.items())
+
+    def is_done(self, brand: str, category: str) -> bool:
+        entry = self.entries.get((brand, category))
+        return entry is not None and entry["status"] == "done"
+
+    @property
+    def skipped(self) -> List[Tuple[str, str]]:
+        return [unit for unit, entry in self.entries.items() if entry["status"] == "skipped"]
+
+    def mark_done(self, brand: str, category: str, count: int):
+        self._append({"brand": brand, "category": category, "status": "done", "count": count})
+
+    def mark_skipped(self, brand: str, category: str, reason: str):
+        """Record a unit deliberately not scraped; resume tries it again"""
+        self._append({"brand": brand, "category": category, "status": "skipped", "reason": reason})
+
+    def _append(self, entry: Dict[str, Any]):
+        entry["at"] = datetime.now().isoformat()
+        if self._writer is None:
+            self._writer = NdjsonWriter(self.path)
+        self._writer.write([entry])
+        self.entries[(entry["brand"], entry["category"])] = entry
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def finish(self):
+        """The run completed; nothing is left to resume"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -3,19 +3,71 @@ from pathlib import Path
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
 DATA_DIR = BASE_DIR / "data" / "brands"
+TEST_DATA_DIR = BASE_DIR / "data" / "test" / "brands"  # mock-data streams, kept apart from real runs
 OUTPUT_FILE = BASE_DIR / "data" / "scraped_products.json"
+CACHE_DB = BASE_DIR / "data" / "cache" / "products.sqlite"
+CHECKPOINT_DIR = BASE_DIR / "data" / "checkpoints"
+METRICS_DIR = BASE_DIR / "data" / "metrics"
+SNAPSHOT_DIR = BASE_DIR / "data" / "snapshots"
 
 # Browser Settings
 VIEWPORT = {"width": 1920, "height": 1080}
 DEFAULT_TIMEOUT = 60000
 HEADLESS = True
 
+# Network: abort heavy/irrelevant requests and use a cheaper load condition
+BLOCK_RESOURCES = True
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_URL_KEYWORDS = [
+    "google-analytics", "googletagmanager", "doubleclick", "facebook.net",
+    "connect.facebook", "hotjar", "criteo", "scorecardresearch", "newrelic",
+    "nr-data", "segment.io", "optimizely", "adservice", "analytics.tiktok",
+]
+NAVIGATION_WAIT_UNTIL = "domcontentloaded" if BLOCK_RESOURCES else "networkidle"
+GRID_READY_TIMEOUT = 15000  # ms to wait for the first product card
+
+# Detail pages (material composition)
+DETAIL_CONCURRENCY_PER_HOST = 4  # detail pages in flight per retailer host
+DETAIL_TIMEOUT = 30000  # ms cap for loading a detail page and waiting for its composition block
+# Composition blocks rendered client-side after DOMContentLoaded; the crawler
+# waits for them before reading the page (brands not listed wait for "load")
+DETAIL_COMPOSITION_SELECTORS = {
+    "FARFETCH": "[data-testid='product-information-accordion'], [data-component='ProductDetailsComposition']",
+    "SSENSE": "#pdpProductDescriptionContainerText, [data-test='product-description']",
+    "MUSINSA": "[class*='Composition'], .product_info_table",
+}
+
+# Plain HTTP fetching (brands with FETCHER = "http")
+HTTP_CONNECTIONS_PER_HOST = 4  # pooled keep-alive connections per retailer host
+HTTP_TIMEOUT = 30  # seconds per request
+
+# Browser Pool (shared across brands and categories)
+POOL_MAX_CONTEXTS = 4  # contexts leased concurrently (keep >= MAX_CONCURRENT_BRANDS)
+POOL_CONTEXT_MAX_USES = 8  # leases before a context is retired
+ROTATE_USER_AGENT = True  # fresh user agent for every new context
+
 # Scraper Settings
 DEFAULT_LIMIT = 50
 RETRY_COUNT = 3
-RETRY_DELAY = 5  # seconds
+RETRY_DELAY = 5  # seconds, base of the exponential backoff between attempts
+RETRY_BACKOFF_MAX = 60  # seconds, cap of a single backoff
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive navigation failures before a host is skipped (a timeout skips it at once)
+BREAKER_COOLDOWN = 300  # seconds before a tripped host gets one trial request again
 REQUEST_DELAY_MIN = 2
-REQUEST_DELAY_MAX = 5
+REQUEST_DELAY_MAX = 5  # per-host politeness window (seconds between requests to one host)
+MAX_CONCURRENT_BRANDS = 4  # brands scraped in parallel by the orchestrators
+
+# Infinite scroll: stop at `limit` cards or once new cards stop appearing
+SCROLL_MAX_ROUNDS = 30
+SCROLL_STALL_ROUNDS = 2  # consecutive scrolls without new cards
+SCROLL_GROWTH_TIMEOUT = 2500  # ms to wait for new cards after each scroll
+
+# Supabase Sync
+SYNC_BATCH_SIZE = 100
+SYNC_CONCURRENCY = 4  # batches in flight
+SYNC_TIMEOUT = 30  # seconds per request
+SYNC_RETRIES = 3  # retries of a whole batch after a timeout, 429 or 5xx
+SYNC_RETRY_DELAY = 2  # seconds, base of the exponential backoff between batch retries
 
 # Anti-Detection
 USE_PROXY = False  # Set to True if proxies are available
@@ -98,3 +150,132 @@ BRAND_URLS = {
         "women-bottoms": "https://www.wconcept.co.kr/Women/003003",
     }
 }
+
+# Product card selectors (see extraction.normalize_spec for the field format)
+BRAND_SELECTORS = {
+    "ZARA": {
+        "card": ".product-grid-product",
+        "fields": {
+            "name": ".product-grid-product-info__name",
+            "price": ".money-amount__main",
+            "link": {"selector": "a.product-link", "attr": "href"},
+            "image": {"selector": "img.media-image__image", "attr": ["src", "data-src"]},
+        },
+        "required": ["name"],
+    },
+    "HM": {
+        "card": ".product-item",
+        "fields": {
+            "name": ".item-heading",
+            "price": ".item-price",
+            "link": {"selector": "a.link", "attr": "href"},
+            "image": {"selector": ".item-image", "attr": ["src", "data-src"]},
+        },
+        "required": ["name"],
+    },
+    "UNIQLO": {
+        "card": "[data-test='product-tile']",
+        "fields": {
+            "name": "[data-test='product-tile-name']",
+            "price": "[data-test='product-tile-price']",
+            "link": {"selector": "a", "attr": "href"},
+            "image": {"selector": "img", "attr": "src"},
+        },
+        "required": ["name"],
+    },
+    "GAP": {
+        "card": ".product-card",
+        "fields": {
+            "name": ".product-card__name",
+            "price": ".product-card__price",
+            "link": {"selector": "a.product-card__link", "attr": "href"},
+            "image": {"selector": "img.product-card__image", "attr": "src"},
+        },
+        "required": ["name"],
+    },
+    "MASSIMO_DUTTI": {
+        "card": ["product-card", ".product-item"],
+        "fields": {
+            "name": {"selector": [".product-name", "h3"]},
+            "price": {"selector": [".product-price", ".price"]},
+            "link": {"selector": "a", "attr": "href"},
+            "image": {"selector": "img", "attr": "src"},
+        },
+        "required": ["name"],
+    },
+    "COS": {
+        "card": ".product-tile",
+        "fields": {
+            "name": {"selector": [".product-title", ".pdp-link"]},
+            "price": {"selector": [".product-price", ".price"]},
+            "link": {"selector": "a", "attr": "href"},
+            "image": {"selector": "img", "attr": "src"},
+        },
+        "required": ["name"],
+    },
+    "TOPTEN": {
+        "card": ".item_box",
+        "fields": {
+            "name": ".name",
+            "price": ".price",
+            "link": {"selector": "a", "attr": "href"},
+            "image": {"selector": ".thumb img", "attr": "src"},
+        },
+        "required": ["name"],
+    },
+    "GUCCI": {
+        "card": ".product-tiles-grid-item",
+        "fields": {
+            "name": ".product-tiles-grid-item-title",
+            "price": ".product-tiles-grid-item-price",
+            "link": {"selector": "a", "attr": "href"},
+            "image": {"selector": "img", "attr": "src"},
+        },
+        "required": ["name"],
+    },
+    "FARFETCH": {
+        "card": '[data-testid="productCard"]',
+        "fields": {
+            "link": {"selector": "a", "attr": "href"},
+            "name": '[data-testid="product-card-description"]',
+            "brand": '[data-testid="product-card-brand"]',
+            "price": '[data-testid="price"]',
+            "image": {"selector": "img", "attr": "src"},
+        },
+        "required": ["link"],
+    },
+    "SSENSE": {
+        "card": ".product-tile",
+        "fields": {
+            "link": {"selector": "a", "attr": "href"},
+            "brand": '[data-test="product-brand"]',
+            "name": '[data-test="product-name"]',
+            "price": '[data-test="product-price"]',
+            "image": {"selector": "img", "attr": ["data-srcset", "src"]},
+        },
+        "required": ["link"],
+    },
+    "MUSINSA": {
+        "card": [".li_box", "#searchList > li"],
+        "fields": {
+            "image": {"selector": "div.list_img img", "attr": ["data-original", "src"]},
+            "link": {"selector": "div.list_img a", "attr": "href"},
+            "brand": "div.article_info p.item_title a",
+            "name": {"selector": "div.article_info p.list_info a", "attr": "title", "text": True},
+            # The struck-out original price lives in a <del> inside p.price
+            "price": {"selector": "div.article_info p.price", "exclude": "del"},
+        },
+        "required": ["link", "name"],
+    },
+    "WCONCEPT": {
+        "card": ".thumbnail_list li",
+        "fields": {
+            "image": {"selector": ".img_area img", "attr": "src"},
+            "link": {"selector": ".img_area a", "attr": "href"},
+            "brand": ".brand",
+            "name": ".product",
+            "price": {"selector": [".discount_price", ".price"]},
+        },
+        "required": ["link"],
+    },
+}
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from config import DETAIL_CONCURRENCY_PER_HOST, DETAIL_TIMEOUT
+from material_mapper import MaterialMapper
+from product import Product
+from scheduler import HostRateLimiter, DETAIL_RATE_LIMITER, HostCircuitBreaker, HOST_CIRCUIT_BREAKER, CircuitOpenError
+
+class DetailCrawler:
+    """
+    Reads material composition from product detail pages.
+
+    Pages are opened in the listing page's browser context (or read with
+    `fetch_text` for HTTP-only brands) and fetched concurrently, with at most
+    `per_host` pages in flight per retailer host. Pacing uses a rate limiter
+    whose window admits `per_host` requests per delay, so the cap and the
+    politeness delay do not stack into one page at a time; failures go to
+    the same per-host circuit breaker as listing navigation.
+    On single-page apps the composition block renders after DOMContentLoaded,
+    so the page is read once `composition_selector` is attached (or once it
+    has fully loaded when no selector is known), within `timeout` ms.
+    """
+
+    def __init__(
+        self,
+        context,
+        per_host: int = DETAIL_CONCURRENCY_PER_HOST,
+        translate: Optional[Callable[[str], str]] = None,
+        timeout: int = DETAIL_TIMEOUT,
+        fetch_text: Optional[Callable[[str], Awaitable[str]]] = None,
+        composition_selector: Optional[str] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        breaker: Optional[HostCircuitBreaker] = None,
+    ):
+        self.context = context
+        self.fetch_text = fetch_text
+        self.per_host = per_host
+        self.translate = translate
+        self.timeout = timeout
+        self.composition_selector = composition_selector
+        if rate_limiter is None:
+            rate_limiter = DETAIL_RATE_LIMITER if per_host == DETAIL_RATE_LIMITER.burst else HostRateLimiter(burst=per_host)
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker or HOST_CIRCUIT_BREAKER
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def _read_page(self, url: str) -> str:
+        deadline = time.monotonic() + self.timeout / 1000
+        remaining = lambda: max(1, int((deadline - time.monotonic()) * 1000))
+        page = await self.context.new_page()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+            try:
+                if self.composition_selector:
+                    await page.wait_for_selector(self.composition_selector, state="attached", timeout=remaining())
+                else:
+                    await page.wait_for_load_state("load", timeout=remaining())
+            except Exception:
+                # Read what is there; the composition may live outside the usual block
+                pass
+            return await page.inner_text("body")
+        finally:
+            await page.close()
+
+    async def fetch_composition(self, url: str) -> Optional[str]:
+        """Composition string like "wool 90%, cashmere 10%", or None if not found"""
+        async with self._slot(url):
+            if not self.breaker.allow(url):
+                raise CircuitOpenError(f"{urlparse(url).netloc} is failing repeatedly, skipping")
+            await self.rate_limiter.wait(url)
+            try:
+                if self.fetch_text is not None:
+                    text = await self.fetch_text(url)
+                else:
+                    text = await self._read_page(url)
+            except Exception:
+                self.breaker.record_failure(url)
+                raise
+            self.breaker.record_success(url)
+
+        if self.translate:
+            text = self.translate(text)
+        found = MaterialMapper.parse_composition(text)
+        if not found:
+            return None
+        return ", ".join(f"{k} {v}%" for k, v in found.items())
+
+    async def _enrich_one(self, product: Product) -> bool:
+        url = product.product_url
+        if not url:
+            return False
+        try:
+            composition = await self.fetch_composition(url)
+        except Exception as e:
+            print(f"     Detail scrape failed for {url}: {e}")
+            return False
+        if not composition:
+            return False
+
+        product.apply_composition(composition)
+        return True
+
+    async def enrich(self, products: List[Product]) -> int:
+        """Fill composition/texture_type/material_blend in place; returns how many were found"""
+        results = await asyncio.gather(*(self._enrich_one(p) for p in products))
+        return sum(results)
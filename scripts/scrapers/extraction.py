@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional
+
+# Runs inside the page: walks every product card once and returns plain JSON,
+# so a whole listing costs a single CDP round-trip instead of ~8 per product.
+EXTRACT_CARDS_JS = """
+([spec, limit]) => {
+    const first = (root, selectors) => {
+        if (!selectors) return root;
+        for (const sel of selectors) {
+            const el = root.querySelector(sel);
+            if (el) return el;
+        }
+        return null;
+    };
+
+    const read = (el, field) => {
+        if (!el) return null;
+        for (const name of field.attr || []) {
+            const value = el.getAttribute(name);
+            if (value && !value.startsWith("data:")) return value.trim();
+        }
+        if (field.attr && !field.text) return null;
+        if (field.exclude) {
+            const clone = el.cloneNode(true);
+            clone.querySelectorAll(field.exclude).forEach((node) => node.remove());
+            return clone.textContent.trim();
+        }
+        return (el.innerText || el.textContent || "").trim();
+    };
+
+    let cards = [];
+    for (const sel of spec.card) {
+        cards = document.querySelectorAll(sel);
+        if (cards.length) break;
+    }
+
+    const out = [];
+    for (const card of cards) {
+        if (out.length >= limit) break;
+        const record = {};
+        for (const [key, field] of Object.entries(spec.fields)) {
+            record[key] = read(first(card, field.selector), field);
+        }
+        if (spec.required.every((key) => record[key])) out.push(record);
+    }
+    return out;
+}
+"""
+
+# Number of cards matched by the first card selector that matches anything
+COUNT_CARDS_JS = """
+(selectors) => {
+    for (const sel of selectors) {
+        const count = document.querySelectorAll(sel).length;
+        if (count) return count;
+    }
+    return 0;
+}
+"""
+
+# Resolves as soon as the card count exceeds the previous count
+CARDS_GREW_JS = f"([selectors, previous]) => ({COUNT_CARDS_JS.strip()})(selectors) > previous"
+
+def _as_list(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+def normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand the shorthand used in config.BRAND_SELECTORS.
+
+    A field is either a CSS selector string (read its text) or a dict with:
+      selector: selector or list of fallbacks (omit to read the card itself)
+      attr:     attribute or list of attributes, first non-empty wins
+      text:     fall back to the element text when no attribute is set
+      exclude:  child selector whose text is dropped (e.g. struck-out prices)
+    """
+    fields = {}
+    for key, field in spec["fields"].items():
+        if isinstance(field, str):
+            field = {"selector": field}
+        fields[key] = {
+            "selector": _as_list(field.get("selector")),
+            "attr": _as_list(field.get("attr")),
+            "text": bool(field.get("text", False)),
+            "exclude": field.get("exclude"),
+        }
+
+    return {
+        "card": _as_list(spec["card"]),
+        "fields": fields,
+        "required": list(spec.get("required", [])),
+    }
+
+def card_selectors(spec: Dict[str, Any]) -> List[str]:
+    """Card selector fallbacks for a spec, in priority order"""
+    return _as_list(spec["card"])
+
+async def count_cards(page, selectors: List[str]) -> int:
+    return await page.evaluate(COUNT_CARDS_JS, selectors)
+
+async def extract_cards(page, spec: Dict[str, Any], limit: int) -> List[Dict[str, Optional[str]]]:
+    """Return up to `limit` product cards as dicts keyed by the spec's field names"""
+    return await page.evaluate(EXTRACT_CARDS_JS, [normalize_spec(spec), limit])
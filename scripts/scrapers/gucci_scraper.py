@@ -5,15 +5,15 @@ Gucci Product Scraper
 
 import asyncio
 import argparse
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional
 from playwright.async_api import Page
 from base_scraper import BaseScraper
 from config import BRAND_URLS
+from product import Product
 
 class GucciScraper(BaseScraper):
-    def __init__(self, limit: int = 20, test_mode: bool = False):
-        super().__init__("Gucci", limit, test_mode)
+    def __init__(self, limit: int = 20, test_mode: bool = False, **kwargs):
+        super().__init__("Gucci", limit, test_mode, **kwargs)
 
     def get_category_url(self, category: str) -> Optional[str]:
         return BRAND_URLS["GUCCI"].get(category, BRAND_URLS["GUCCI"].get("women-ready-to-wear"))
@@ -28,44 +28,23 @@ class GucciScraper(BaseScraper):
         except:
             pass
 
-        product_elements = await page.query_selector_all(".product-tiles-grid-item")
-        
-        for i, element in enumerate(product_elements[:self.limit]):
-            try:
-                name_el = await element.query_selector(".product-tiles-grid-item-title")
-                price_el = await element.query_selector(".product-tiles-grid-item-price")
-                link_el = await element.query_selector("a")
-                img_el = await element.query_selector("img")
+        await super()._extract_products(page, category)
 
-                if not name_el: continue
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        link = card["link"] or ""
+        return Product(
+            id=f"gucci-{category}-{index+1}",
+            name=card["name"].strip(),
+            brand="Gucci",
+            category=self.map_category(category),
+            price=self.normalize_price(card["price"] or "0", "KRW"),
+            image_url=card["image"] or "",
+            product_url=link if link.startswith("http") else f"https://www.gucci.com{link}",
+            sizes=["IT 36", "IT 38", "IT 40", "IT 42", "IT 44"],
+            is_luxury=True,
+        )
 
-                name = await name_el.inner_text()
-                price_text = await price_el.inner_text() if price_el else "0"
-                link = await link_el.get_attribute("href") if link_el else ""
-                image_url = await img_el.get_attribute("src") if img_el else ""
-
-                self.products.append({
-                    "id": f"gucci-{category}-{i+1}",
-                    "name": name.strip(),
-                    "brand": "Gucci",
-                    "category": self.map_category(category),
-                    "price": self.normalize_price(price_text, "KRW"),
-                    "currency": "USD",
-                    "imageUrl": image_url,
-                    "productUrl": link if link.startswith("http") else f"https://www.gucci.com{link}",
-                    "sizes": ["IT 36", "IT 38", "IT 40", "IT 42", "IT 44"],
-                    "colors": [],
-                    "isLuxury": True,
-                    "scrapedAt": datetime.now().isoformat(),
-                })
-
-                print(f"   ✅ {i+1}. {name[:30]}...")
-
-            except Exception as e:
-                print(f"   ❌ Error scraping product {i+1}: {e}")
-                continue
-
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         cat = self.map_category(category)
         mock_names = {
             "tops": ["GG Jacquard Silk Blouse", "Flora Print Crepe Top", "Interlocking G Knit Top", "Lace Trim Silk Shirt", "GG Monogram Cashmere Sweater"],
@@ -78,20 +57,18 @@ class GucciScraper(BaseScraper):
 
         for i in range(limit):
             idx = i % len(names)
-            products.append({
-                "id": f"gucci-{category}-{i+1}",
-                "name": f"{names[idx]}",
-                "brand": "Gucci",
-                "category": cat,
-                "price": round(1500 + (i * 300), 2),
-                "currency": "USD",
-                "imageUrl": f"https://placehold.co/600x800?text=GUCCI+{cat}+{i+1}",
-                "productUrl": f"https://www.gucci.com/mock-{i+1}",
-                "sizes": ["IT 36", "IT 38", "IT 40", "IT 42"],
-                "colors": ["Black", "Ivory", "Multi"],
-                "isLuxury": True,
-                "scrapedAt": datetime.now().isoformat(),
-            })
+            products.append(Product(
+                id=f"gucci-{category}-{i+1}",
+                name=f"{names[idx]}",
+                brand="Gucci",
+                category=cat,
+                price=round(1500 + (i * 300), 2),
+                image_url=f"https://placehold.co/600x800?text=GUCCI+{cat}+{i+1}",
+                product_url=f"https://www.gucci.com/mock-{i+1}",
+                sizes=["IT 36", "IT 38", "IT 40", "IT 42"],
+                colors=["Black", "Ivory", "Multi"],
+                is_luxury=True,
+            ))
         return products
 
 async def main():
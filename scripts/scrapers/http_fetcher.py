@@ -0,0 +1,113 @@
+import copy
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import aiohttp
+    from bs4 import BeautifulSoup
+    from fake_useragent import UserAgent
+except ImportError:
+    print("Dependencies missing. Run: pip install -r scripts/scrapers/requirements.txt")
+    exit(1)
+
+from config import HTTP_CONNECTIONS_PER_HOST, HTTP_TIMEOUT
+from extraction import normalize_spec
+
+class HttpFetcher:
+    """
+    Pooled aiohttp session for listing pages whose product grid is rendered
+    server-side. One session (and its keep-alive connections) is shared by
+    every brand of a run, in place of a browser tab per page.
+    """
+
+    def __init__(self, per_host: int = HTTP_CONNECTIONS_PER_HOST, timeout: float = HTTP_TIMEOUT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ua = UserAgent()
+        self.bytes_received = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.ua.random, "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8"},
+            )
+        return self._session
+
+    async def fetch(self, url: str, on_bytes: Optional[Callable[[int], None]] = None) -> str:
+        """GET a page and return its HTML; HTTP errors raise"""
+        async with self._ensure_session().get(url) as response:
+            response.raise_for_status()
+            body = await response.read()
+            self.bytes_received += len(body)
+            if on_bytes is not None:
+                on_bytes(len(body))
+            return body.decode(response.get_encoding(), errors="replace")
+
+    async def fetch_text(self, url: str, on_bytes: Optional[Callable[[int], None]] = None) -> str:
+        """Visible text of a page, as a browser's body.innerText would roughly give"""
+        soup = BeautifulSoup(await self.fetch(url, on_bytes), "html.parser")
+        for node in soup(["script", "style", "noscript"]):
+            node.decompose()
+        return soup.get_text("\n")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "HttpFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+def _first(root, selectors: Optional[List[str]]):
+    if not selectors:
+        return root
+    for selector in selectors:
+        el = root.select_one(selector)
+        if el is not None:
+            return el
+    return None
+
+def _read(el, field: Dict[str, Any]) -> Optional[str]:
+    if el is None:
+        return None
+    for name in field["attr"] or []:
+        value = el.get(name)
+        if isinstance(value, list):
+            value = " ".join(value)
+        if value and not value.startswith("data:"):
+            return value.strip()
+    if field["attr"] and not field["text"]:
+        return None
+    if field["exclude"]:
+        el = copy.copy(el)
+        for node in el.select(field["exclude"]):
+            node.decompose()
+    return el.get_text().strip()
+
+def extract_cards_html(html: str, spec: Dict[str, Any], limit: int) -> List[Dict[str, Optional[str]]]:
+    """
+    Server-side counterpart of extraction.extract_cards: the same selector
+    spec and card dicts, read from raw HTML with BeautifulSoup.
+    """
+    spec = normalize_spec(spec)
+    soup = BeautifulSoup(html, "html.parser")
+
+    cards = []
+    for selector in spec["card"]:
+        cards = soup.select(selector)
+        if cards:
+            break
+
+    out = []
+    for card in cards:
+        if len(out) >= limit:
+            break
+        record = {key: _read(_first(card, field["selector"]), field) for key, field in spec["fields"].items()}
+        if all(record[key] for key in spec["required"]):
+            out.append(record)
+    return out
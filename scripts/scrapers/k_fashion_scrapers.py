@@ -1,114 +1,88 @@
-import asyncio
 import random
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Optional
 from base_scraper import BaseScraper
 from config import BRAND_URLS
-from material_mapper import MaterialMapper
+from product import Product
+
+KOREAN_MATERIALS = {
+    "면": "Cotton",
+    "코튼": "Cotton",
+    "울": "Wool",
+    "모": "Wool",
+    "캐시미어": "Cashmere",
+    "폴리에스터": "Polyester",
+    "폴리에스테르": "Polyester",
+    "폴리": "Polyester",
+    "폴리우레탄": "Polyurethane",
+    "나일론": "Nylon",
+    "레이온": "Rayon",
+    "비스코스": "Viscose",
+    "아크릴": "Acrylic",
+    "마": "Linen",
+    "린넨": "Linen",
+    "리넨": "Linen",
+    "가죽": "Leather",
+    "실크": "Silk",
+    "견": "Silk",
+    "스판": "Spandex",
+    "스판덱스": "Spandex",
+    "우레탄": "Polyurethane"
+}
+
+_HANGUL = "\uac00-\ud7a3"
+
+def _compile_korean_materials(terms: Dict[str, str]):
+    # Longest term first, so "폴리에스터" wins over "폴리". Single syllables
+    # ("면", "모", "마", ...) only count as standalone words, otherwise they
+    # would rewrite "겨울", "모델" or "마감" in page text. Every branch starts
+    # with a literal so the regex engine can skip ahead on the first character.
+    words = sorted((t for t in terms if len(t) > 1), key=len, reverse=True)
+    syllables = [f"{re.escape(t)}(?<![{_HANGUL}].)(?![{_HANGUL}])" for t in terms if len(t) == 1]
+    return re.compile("|".join([re.escape(t) for t in words] + syllables))
+
+_KOREAN_MATERIAL_RE = _compile_korean_materials(KOREAN_MATERIALS)
 
 def translate_korean_material(text: str) -> str:
     """
-    Simple translator for common Korean material terms to English
+    Translates common Korean material terms to English in one pass
     so MaterialMapper can process them.
     """
-    replacements = {
-        "면": "Cotton",
-        "코튼": "Cotton",
-        "울": "Wool",
-        "모": "Wool",
-        "캐시미어": "Cashmere",
-        "폴리에스터": "Polyester",
-        "폴리": "Polyester",
-        "나일론": "Nylon",
-        "레이온": "Rayon",
-        "아크릴": "Acrylic",
-        "마": "Linen",
-        "린넨": "Linen",
-        "리넨": "Linen",
-        "가죽": "Leather",
-        "실크": "Silk",
-        "견": "Silk",
-        "스판": "Spandex",
-        "우레탄": "Polyurethane"
-    }
-
-    translated = text
-    for kr, en in replacements.items():
-        translated = translated.replace(kr, en)
-    return translated
+    return _KOREAN_MATERIAL_RE.sub(lambda m: KOREAN_MATERIALS[m[0]], text)
 
 class MusinsaScraper(BaseScraper):
-    def __init__(self, limit: int = 50, test_mode: bool = False):
-        super().__init__("MUSINSA", limit, test_mode)
+    DETAIL_COMPOSITION = True
+
+    def __init__(self, limit: int = 50, test_mode: bool = False, **kwargs):
+        super().__init__("MUSINSA", limit, test_mode, **kwargs)
 
     def get_category_url(self, category: str) -> Optional[str]:
         return BRAND_URLS["MUSINSA"].get(category)
 
-    async def _extract_products(self, page, category: str):
-        # Musinsa list items
-        # Selector might be #searchList > li or similar
-        product_cards = await page.locator('.li_box').all()
-        if not product_cards:
-             product_cards = await page.locator('#searchList > li').all()
-
-        print(f"   Found {len(product_cards)} products on page.")
-
-        count = 0
-        for card in product_cards:
-            if count >= self.limit:
-                break
-            try:
-                img_el = card.locator('div.list_img img')
-                image_url = await img_el.get_attribute('data-original')
-                if not image_url:
-                    image_url = await img_el.get_attribute('src')
-
-                link_el = card.locator('div.list_img a')
-                url = await link_el.get_attribute('href')
-                if url and not url.startswith('http'):
-                    url = "https:" + url if url.startswith('//') else "https://www.musinsa.com" + url
-
-                info_el = card.locator('div.article_info')
-                brand_el = info_el.locator('p.item_title a')
-                brand = await brand_el.inner_text() if await brand_el.count() > 0 else "Unknown"
-
-                name_el = info_el.locator('p.list_info a')
-                name = await name_el.get_attribute('title')
-                if not name:
-                    name = await name_el.inner_text()
-
-                name = name.strip()
-
-                price_el = info_el.locator('p.price')
-                price_text = await price_el.inner_text()
-                # Remove del tag content if exists (original price)
-                if await price_el.locator('del').count() > 0:
-                    del_text = await price_el.locator('del').inner_text()
-                    price_text = price_text.replace(del_text, '').strip()
-
-                # Composition is hard to get from list. Defaulting.
-                composition = "Cotton 100%"
-                texture_type = "cotton"
-
-                self.products.append({
-                    "id": url,
-                    "name": f"{brand} {name}",
-                    "brand": "Musinsa",
-                    "original_brand": brand,
-                    "url": url,
-                    "image": image_url,
-                    "price": self.normalize_price(price_text),
-                    "currency": "USD",
-                    "category": category,
-                    "composition": composition,
-                    "texture_type": texture_type,
-                    "source": "MUSINSA"
-                })
-                count += 1
-            except Exception as e:
-                print(f"   Error extracting product: {e}")
-
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def translate_composition(self, text: str) -> str:
+        return translate_korean_material(text)
+
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        url = card["link"]
+        if not url.startswith('http'):
+            url = "https:" + url if url.startswith('//') else "https://www.musinsa.com" + url
+
+        brand = card["brand"] or "Unknown"
+        name = card["name"].strip()
+
+        return Product(
+            id=url,
+            name=f"{brand} {name}",
+            brand="Musinsa",
+            original_brand=brand,
+            product_url=url,
+            image_url=card["image"] or "",
+            price=self.normalize_price(card["price"] or ""),
+            category=category,
+            source="MUSINSA",
+        )
+
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         mock_items = []
         for i in range(limit):
             # Mock Korean text translation
@@ -117,79 +91,61 @@ class MusinsaScraper(BaseScraper):
             ])
             translated_mat = translate_korean_material(korean_mat)
 
-            mock_items.append({
-                "id": f"mus-{category}-{i}",
-                "name": f"K-Fashion Item {i}",
-                "brand": "Thisisneverthat",
-                "original_brand": "Thisisneverthat",
-                "url": "https://musinsa.com/example",
-                "image": "https://via.placeholder.com/300x400",
-                "price": random.randint(30, 150),
-                "currency": "USD",
-                "category": category,
-                "composition": translated_mat,
-                "texture_type": MaterialMapper.get_preset(translated_mat),
-                "source": "MUSINSA"
-            })
+            product = Product(
+                id=f"mus-{category}-{i}",
+                name=f"K-Fashion Item {i}",
+                brand="Thisisneverthat",
+                original_brand="Thisisneverthat",
+                product_url="https://musinsa.com/example",
+                image_url="https://via.placeholder.com/300x400",
+                price=random.randint(30, 150),
+                category=category,
+                source="MUSINSA",
+            )
+            product.apply_composition(translated_mat)
+            mock_items.append(product)
         return mock_items
 
 
 class WConceptScraper(BaseScraper):
-    def __init__(self, limit: int = 50, test_mode: bool = False):
-        super().__init__("WCONCEPT", limit, test_mode)
+    DETAIL_COMPOSITION = True
+    # List pages are rendered server-side
+    FETCHER = "http"
+
+    def __init__(self, limit: int = 50, test_mode: bool = False, **kwargs):
+        super().__init__("WCONCEPT", limit, test_mode, **kwargs)
 
     def get_category_url(self, category: str) -> Optional[str]:
         return BRAND_URLS["WCONCEPT"].get(category)
 
-    async def _extract_products(self, page, category: str):
-        product_cards = await page.locator('.thumbnail_list li').all()
-        print(f"   Found {len(product_cards)} products on page.")
-
-        count = 0
-        for card in product_cards:
-            if count >= self.limit:
-                break
-            try:
-                img_el = card.locator('.img_area img')
-                image_url = await img_el.get_attribute('src')
-                if image_url and image_url.startswith('//'):
-                    image_url = "https:" + image_url
-
-                link_el = card.locator('.img_area a')
-                url = await link_el.get_attribute('href')
-                if url and not url.startswith('http'):
-                    url = "https://www.wconcept.co.kr" + url
-
-                brand_el = card.locator('.brand')
-                brand = await brand_el.inner_text() if await brand_el.count() > 0 else "Unknown"
-
-                name_el = card.locator('.product')
-                name = await name_el.inner_text() if await name_el.count() > 0 else "Unknown"
-
-                price_el = card.locator('.discount_price')
-                if await price_el.count() == 0:
-                    price_el = card.locator('.price')
-                price_text = await price_el.inner_text() if await price_el.count() > 0 else "0"
-
-                self.products.append({
-                    "id": url,
-                    "name": f"{brand} {name}",
-                    "brand": "W Concept",
-                    "original_brand": brand,
-                    "url": url,
-                    "image": image_url,
-                    "price": self.normalize_price(price_text),
-                    "currency": "USD",
-                    "category": category,
-                    "composition": "Cotton 100%", # Placeholder
-                    "texture_type": "cotton",
-                    "source": "WCONCEPT"
-                })
-                count += 1
-            except Exception as e:
-                print(f"   Error extracting product: {e}")
-
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def translate_composition(self, text: str) -> str:
+        return translate_korean_material(text)
+
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        image_url = card["image"]
+        if image_url and image_url.startswith('//'):
+            image_url = "https:" + image_url
+
+        url = card["link"]
+        if not url.startswith('http'):
+            url = "https://www.wconcept.co.kr" + url
+
+        brand = card["brand"] or "Unknown"
+        name = card["name"] or "Unknown"
+
+        return Product(
+            id=url,
+            name=f"{brand} {name}",
+            brand="W Concept",
+            original_brand=brand,
+            product_url=url,
+            image_url=image_url or "",
+            price=self.normalize_price(card["price"] or "0"),
+            category=category,
+            source="WCONCEPT",
+        )
+
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         mock_items = []
         for i in range(limit):
             korean_mat = random.choice([
@@ -197,18 +153,17 @@ class WConceptScraper(BaseScraper):
             ])
             translated_mat = translate_korean_material(korean_mat)
 
-            mock_items.append({
-                "id": f"wc-{category}-{i}",
-                "name": f"Concept Item {i}",
-                "brand": "Andersson Bell",
-                "original_brand": "Andersson Bell",
-                "url": "https://wconcept.co.kr/example",
-                "image": "https://via.placeholder.com/300x400",
-                "price": random.randint(80, 400),
-                "currency": "USD",
-                "category": category,
-                "composition": translated_mat,
-                "texture_type": MaterialMapper.get_preset(translated_mat),
-                "source": "WCONCEPT"
-            })
+            product = Product(
+                id=f"wc-{category}-{i}",
+                name=f"Concept Item {i}",
+                brand="Andersson Bell",
+                original_brand="Andersson Bell",
+                product_url="https://wconcept.co.kr/example",
+                image_url="https://via.placeholder.com/300x400",
+                price=random.randint(80, 400),
+                category=category,
+                source="WCONCEPT",
+            )
+            product.apply_composition(translated_mat)
+            mock_items.append(product)
         return mock_items
@@ -5,62 +5,33 @@ Massimo Dutti Product Scraper
 
 import asyncio
 import argparse
-from datetime import datetime
-from typing import List, Dict, Optional, Any
-from playwright.async_api import Page
+from typing import List, Dict, Optional
 from base_scraper import BaseScraper
 from config import BRAND_URLS
+from product import Product
 
 class MassimoDuttiScraper(BaseScraper):
-    def __init__(self, limit: int = 50, test_mode: bool = False):
-        super().__init__("Massimo_Dutti", limit, test_mode)
+    def __init__(self, limit: int = 50, test_mode: bool = False, **kwargs):
+        super().__init__("Massimo_Dutti", limit, test_mode, **kwargs)
 
     def get_category_url(self, category: str) -> Optional[str]:
         return BRAND_URLS["MASSIMO_DUTTI"].get(category)
 
-    async def _extract_products(self, page: Page, category: str):
-        product_elements = await page.query_selector_all("product-card") # Simplified selector assumption
-        # If web components are used, might need different selection strategy
-        if not product_elements:
-            product_elements = await page.query_selector_all(".product-item")
-
-        for i, element in enumerate(product_elements[:self.limit]):
-            try:
-                # Selectors depend on actual site structure which can be complex for Inditex brands
-                name_el = await element.query_selector(".product-name") or await element.query_selector("h3")
-                price_el = await element.query_selector(".product-price") or await element.query_selector(".price")
-                link_el = await element.query_selector("a")
-                img_el = await element.query_selector("img")
-
-                if not name_el: continue
-
-                name = await name_el.inner_text()
-                price_text = await price_el.inner_text() if price_el else "0"
-                link = await link_el.get_attribute("href") if link_el else ""
-                image_url = await img_el.get_attribute("src") if img_el else ""
-
-                self.products.append({
-                    "id": f"md-{category}-{i+1}",
-                    "name": name.strip(),
-                    "brand": "Massimo Dutti",
-                    "category": self.map_category(category),
-                    "price": self.normalize_price(price_text, "KRW"),
-                    "currency": "USD",
-                    "imageUrl": image_url,
-                    "productUrl": link if link.startswith("http") else f"https://www.massimodutti.com{link}",
-                    "sizes": ["XS", "S", "M", "L"],
-                    "colors": [],
-                    "isLuxury": True,
-                    "scrapedAt": datetime.now().isoformat(),
-                })
-
-                print(f"   ✅ {i+1}. {name[:30]}...")
-
-            except Exception as e:
-                print(f"   ❌ Error scraping product {i+1}: {e}")
-                continue
-
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        link = card["link"] or ""
+        return Product(
+            id=f"md-{category}-{index+1}",
+            name=card["name"].strip(),
+            brand="Massimo Dutti",
+            category=self.map_category(category),
+            price=self.normalize_price(card["price"] or "0", "KRW"),
+            image_url=card["image"] or "",
+            product_url=link if link.startswith("http") else f"https://www.massimodutti.com{link}",
+            sizes=["XS", "S", "M", "L"],
+            is_luxury=True,
+        )
+
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         cat = self.map_category(category)
         mock_names = {
             "tops": ["100% Linen Shirt", "Silk Shirt", "Cotton Poplin Shirt", "Knit Polo", "Cashmere Sweater"],
@@ -74,20 +45,18 @@ class MassimoDuttiScraper(BaseScraper):
 
         for i in range(limit):
             idx = i % len(names)
-            products.append({
-                "id": f"md-{category}-{i+1}",
-                "name": f"{names[idx]}",
-                "brand": "Massimo Dutti",
-                "category": cat,
-                "price": round(89.90 + (i * 20), 2),
-                "currency": "USD",
-                "imageUrl": f"https://placehold.co/600x800?text=MD+{cat}+{i+1}",
-                "productUrl": f"https://www.massimodutti.com/mock-{i+1}",
-                "sizes": ["XS", "S", "M", "L"],
-                "colors": ["Beige", "White", "Navy"],
-                "isLuxury": True,
-                "scrapedAt": datetime.now().isoformat(),
-            })
+            products.append(Product(
+                id=f"md-{category}-{i+1}",
+                name=f"{names[idx]}",
+                brand="Massimo Dutti",
+                category=cat,
+                price=round(89.90 + (i * 20), 2),
+                image_url=f"https://placehold.co/600x800?text=MD+{cat}+{i+1}",
+                product_url=f"https://www.massimodutti.com/mock-{i+1}",
+                sizes=["XS", "S", "M", "L"],
+                colors=["Beige", "White", "Navy"],
+                is_luxury=True,
+            ))
         return products
 
 async def main():
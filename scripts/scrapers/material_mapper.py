@@ -1,4 +1,16 @@
+import os
 import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# Percent tokens ("90%", "90 %") and the letter/space runs around them.
+# A run ending right at a token is "Material 90%"; a run starting right
+# after one is "90% Material". Matching both in one alternation lets
+# parse_composition walk the text once.
+_TOKEN_RE = re.compile(r'(?P<run>[a-z\s]+)|(?P<amount>\d+)\s*%')
+
 
 class MaterialMapper:
     """
@@ -15,6 +27,9 @@ class MaterialMapper:
         "heavy": ["tweed", "velvet", "corduroy"]
     }
 
+    # Slot order of get_blend vectors; append new presets, never reorder
+    PRESET_ORDER = tuple(PRESETS)
+
     @staticmethod
     def parse_composition(text: str) -> dict:
         """
@@ -24,34 +39,32 @@ class MaterialMapper:
         if not text:
             return {}
 
-        text = text.lower()
-        # Regex to match patterns like "90% wool" or "wool 90%"
-        # Pattern 1: Number% Material
-        matches_1 = re.findall(r'(\d+)\s*%\s*([a-z\s]+)', text)
+        # "90% wool" matches are counted before "wool 90%" ones, so ties in
+        # get_preset resolve the same way regardless of the phrasing mix.
+        leading, trailing = [], []
+        previous_run = None
+        pending_amount = None
+
+        for match in _TOKEN_RE.finditer(text.lower()):
+            run = match.group("run")
+            if run is not None:
+                if pending_amount is not None and pending_amount[1] == match.start():
+                    leading.append((run, pending_amount[0]))
+                pending_amount = None
+                previous_run = (run, match.end())
+                continue
 
-        # Pattern 2: Material Number%
-        matches_2 = re.findall(r'([a-z\s]+)\s*(\d+)\s*%', text)
+            amount = match.group("amount")
+            if previous_run is not None and previous_run[1] == match.start():
+                trailing.append((previous_run[0], amount))
+            previous_run = None
+            pending_amount = (amount, match.end())
 
         composition = {}
-
-        # validation set
-        valid_keywords = set()
-        for keywords in MaterialMapper.PRESETS.values():
-            valid_keywords.update(keywords)
-
-        for amount, material in matches_1:
+        for material, amount in leading + trailing:
             clean_mat = material.strip()
-            if not clean_mat:
-                continue
             # Basic validation: must contain at least one known material keyword
-            if any(k in clean_mat for k in valid_keywords):
-                composition[clean_mat] = composition.get(clean_mat, 0) + int(amount)
-
-        for material, amount in matches_2:
-            clean_mat = material.strip()
-            if not clean_mat:
-                continue
-            if any(k in clean_mat for k in valid_keywords):
+            if clean_mat and _KEYWORDS.search(clean_mat):
                 composition[clean_mat] = composition.get(clean_mat, 0) + int(amount)
 
         return composition
@@ -64,28 +77,139 @@ class MaterialMapper:
         if not material_text:
             return "cotton" # Default
 
-        text = material_text.lower()
-
-        # Check for composition percentages first
-        composition = MaterialMapper.parse_composition(text)
+        composition = MaterialMapper.parse_composition(material_text)
+        if not composition:
+            # Fallback to simple keyword search if no percentages found
+            return _match_preset(material_text.lower())
 
         dominant_material = "cotton"
         max_percentage = 0
+        for mat, percent in composition.items():
+            if percent > max_percentage:
+                max_percentage = percent
+                dominant_material = mat
 
-        if composition:
-            # Find dominant material
-            for mat, percent in composition.items():
-                if percent > max_percentage:
-                    max_percentage = percent
-                    dominant_material = mat
-        else:
-            # Fallback to simple keyword search if no percentages found
-            dominant_material = text
+        return _cached_preset(dominant_material)
+
+    @staticmethod
+    def get_blend(material_text: str) -> Tuple[float, ...]:
+        """
+        Weights of every preset in the material, in PRESET_ORDER, rounded to
+        4 decimals and summing to 1. The tuple is shared by every caller
+        asking for the same text.
+        Example: "Wool 50%, Polyester 50%" -> (0, 0.5, 0, 0, 0, 0.5, 0)
+        """
+        return _cached_blend(material_text or "")
+
+    @staticmethod
+    def classify_many(texts: Iterable[str], workers: Optional[int] = None) -> List[str]:
+        """
+        Maps many material texts to presets, in input order.
+        Identical strings are classified once and remembered across calls;
+        large batches of new strings are spread over a process pool
+        (workers=1 keeps everything in-process).
+        """
+        return _map_unique(MaterialMapper.get_preset, _PRESET_MEMO, texts, workers)
+
+    @staticmethod
+    def blend_many(texts: Iterable[str], workers: Optional[int] = None) -> List[Tuple[float, ...]]:
+        """
+        get_blend() for many material texts, in input order, with the same
+        dedupe, memory and process pool as classify_many(). Products with the
+        same composition share one tuple.
+        """
+        return _map_unique(MaterialMapper.get_blend, _BLEND_MEMO, texts, workers)
+
+
+# Below this many new strings a process pool costs more than it saves
+PARALLEL_MIN_TEXTS = 20000
+MEMO_SIZE = 100000
+
+# Shared by classify_many/blend_many calls; most-recently-used entries at the end
+_PRESET_MEMO: "OrderedDict[str, str]" = OrderedDict()
+_BLEND_MEMO: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+
+
+def _recall(memo: OrderedDict, text: str):
+    memo.move_to_end(text)
+    return memo[text]
+
+
+def _remember(memo: OrderedDict, text: str, value):
+    memo[text] = value
+    memo.move_to_end(text)
+    while len(memo) > MEMO_SIZE:
+        memo.popitem(last=False)
+
+
+def _map_unique(fn: Callable[[str], object], memo: OrderedDict, texts: Iterable[str],
+                workers: Optional[int]) -> list:
+    texts = [text or "" for text in texts]
+    unique = dict.fromkeys(texts)
+    resolved = {text: _recall(memo, text) for text in unique if text in memo}
+    pending = [text for text in unique if text not in resolved]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(pending) >= PARALLEL_MIN_TEXTS:
+        chunksize = max(1, len(pending) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            values = list(pool.map(fn, pending, chunksize=chunksize))
+    else:
+        values = [fn(text) for text in pending]
+
+    for text, value in zip(pending, values):
+        resolved[text] = value
+        _remember(memo, text, value)
+    return [resolved[text] for text in texts]
+
+
+def _keyword_pattern(keywords):
+    # Longest first so overlapping keywords ("faux leather"/"leather") resolve
+    # to the longer one; only presence matters for the callers.
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered))
+
+
+# Keyword index, built once from PRESETS. One alternation answers "contains any
+# known material"; the per-preset patterns keep PRESETS order for get_preset.
+_KEYWORDS = _keyword_pattern(k for keywords in MaterialMapper.PRESETS.values() for k in keywords)
+_PRESET_PATTERNS = [
+    (preset, _keyword_pattern(keywords)) for preset, keywords in MaterialMapper.PRESETS.items()
+]
+
+
+def _match_preset(text: str) -> str:
+    for preset, pattern in _PRESET_PATTERNS:
+        if pattern.search(text):
+            return preset
+    return "cotton" # Default fallback
+
+
+@lru_cache(maxsize=1024)
+def _cached_blend(material_text: str) -> tuple:
+    order = MaterialMapper.PRESET_ORDER
+    weights = [0.0] * len(order)
+
+    composition = MaterialMapper.parse_composition(material_text)
+    if not composition:
+        weights[order.index(MaterialMapper.get_preset(material_text))] = 1.0
+        return tuple(weights)
+
+    # Layered garments ("Shell: 100% wool, Lining: 100% polyester") sum past
+    # 100, so weights are relative to the total rather than to 100%.
+    for mat, percent in composition.items():
+        weights[order.index(_cached_preset(mat))] += percent
+    total = sum(weights)
+    rounded = [round(w / total, 4) for w in weights]
+    # Rounding can leave the sum a few 1e-4 off; the largest weight absorbs it
+    largest = max(range(len(rounded)), key=rounded.__getitem__)
+    rounded[largest] = round(1.0 - sum(w for i, w in enumerate(rounded) if i != largest), 4)
+    return tuple(rounded)
 
-        # Map dominant material to preset
-        for preset, keywords in MaterialMapper.PRESETS.items():
-            for keyword in keywords:
-                if keyword in dominant_material:
-                    return preset
 
-        return "cotton" # Default fallback
+@lru_cache(maxsize=1024)
+def _cached_preset(material: str) -> str:
+    # Dominant materials are short, repeated names ("cotton", "wool blend"),
+    # unlike the fallback path which may see a whole page body.
+    return _match_preset(material)
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from config import METRICS_DIR
+
+# Phases in report order; unknown phase names are appended after these
+PHASES = ["launch", "navigation", "scroll", "extraction", "details", "save", "sync"]
+
+@dataclass
+class UnitMetrics:
+    """Timings of one (brand, category) unit; "*" stands for brand- or run-level work"""
+    brand: str
+    category: str
+    phases: Dict[str, float] = field(default_factory=dict)  # seconds
+    seconds: float = 0.0  # wall time of the whole unit
+    products: int = 0
+    bytes: int = 0
+
+    def add_bytes(self, count: int):
+        self.bytes += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.phases, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES))
+        return {
+            "brand": self.brand,
+            "category": self.category,
+            "seconds": round(self.seconds, 3),
+            "products": self.products,
+            "bytes": self.bytes,
+            "productsPerSecond": round(self.products / self.seconds, 2) if self.seconds else None,
+            "phases": {p: round(self.phases[p], 3) for p in ordered},
+        }
+
+class RunMetrics:
+    """
+    Per-phase timings, transfer sizes and throughput for one scrape run.
+
+    Scrapers time their phases with `phase()`; the orchestrator writes the
+    collected numbers to one JSON file per run with `write()`.
+    """
+
+    def __init__(self, run: str = "scrape"):
+        self.run = run
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.browser_launch_seconds = 0.0
+        self._units: Dict[Tuple[str, str], UnitMetrics] = {}
+
+    def unit_for(self, brand: str, category: str = "*") -> UnitMetrics:
+        key = (brand, category)
+        if key not in self._units:
+            self._units[key] = UnitMetrics(brand, category)
+        return self._units[key]
+
+    @contextmanager
+    def phase(self, name: str, brand: str = "*", category: str = "*") -> Iterator[UnitMetrics]:
+        """Add the time spent in the block to the unit's `name` phase"""
+        unit = self.unit_for(brand, category)
+        start = time.perf_counter()
+        try:
+            yield unit
+        finally:
+            self.add_phase(name, time.perf_counter() - start, brand, category)
+
+    def add_phase(self, name: str, seconds: float, brand: str = "*", category: str = "*"):
+        unit = self.unit_for(brand, category)
+        unit.phases[name] = unit.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def unit(self, brand: str, category: str) -> Iterator[UnitMetrics]:
+        """Time a whole unit; phases inside it are recorded separately"""
+        unit = self.unit_for(brand, category)
+        start = time.perf_counter()
+        try:
+            yield unit
+        finally:
+            unit.seconds += time.perf_counter() - start
+
+    def summary(self) -> Dict[str, Any]:
+        units = list(self._units.values())
+        phases: Dict[str, float] = {}
+        for unit in units:
+            for name, seconds in unit.phases.items():
+                phases[name] = phases.get(name, 0.0) + seconds
+        seconds = time.perf_counter() - self._start
+        products = sum(u.products for u in units)
+
+        return {
+            "run": self.run,
+            "startedAt": self.started_at.isoformat(),
+            "finishedAt": datetime.now().isoformat(),
+            "seconds": round(seconds, 3),
+            "browserLaunchSeconds": round(self.browser_launch_seconds, 3),
+            "products": products,
+            "bytes": sum(u.bytes for u in units),
+            "productsPerSecond": round(products / seconds, 2) if seconds else None,
+            # Summed over units; concurrent brands make this exceed wall time
+            "phaseSeconds": {name: round(phases[name], 3) for name in sorted(
+                phases, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES))},
+            "units": [u.to_dict() for u in units],
+        }
+
+    def write(self, directory: Path = METRICS_DIR) -> Path:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.run}-{self.started_at.strftime('%Y%m%dT%H%M%S')}.json"
+        summary = self.summary()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        slowest = sorted(summary["phaseSeconds"].items(), key=lambda kv: kv[1], reverse=True)[:3]
+        print(f"📊 Metrics: {summary['products']} products in {summary['seconds']:.1f}s, "
+              f"{summary['bytes'] / 1e6:.1f} MB; top phases: "
+              + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in slowest))
+        print(f"   Written to {path}")
+        return path
+
+class TransferCounter:
+    """
+    Sums response sizes (headers + body) of every request finished in a
+    browser context while attached, detail pages included.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self._pending: List[asyncio.Task] = []
+        context.on("requestfinished", self._on_finished)
+
+    def _on_finished(self, request):
+        self._pending.append(asyncio.ensure_future(self._size(request)))
+
+    @staticmethod
+    async def _size(request) -> int:
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return 0
+        return max(0, sizes.get("responseBodySize", 0)) + max(0, sizes.get("responseHeadersSize", 0))
+
+    async def total(self) -> int:
+        """Detach from the context and return the bytes counted"""
+        self.context.remove_listener("requestfinished", self._on_finished)
+        return sum(await asyncio.gather(*self._pending))
@@ -0,0 +1,117 @@
+import json
+import os
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+PathLike = Union[str, Path]
+
+class NdjsonWriter:
+    """
+    Append-only product stream, one JSON object per line.
+
+    Every write is flushed, so a crashed run keeps everything extracted up to
+    that point and memory use does not grow with the catalog.
+    """
+
+    def __init__(self, path: PathLike, reset: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = not reset and self._ends_mid_line(self.path)
+        self._file = open(self.path, "w" if reset else "a", encoding="utf-8")
+        if partial:
+            # Terminate a line cut off by a crash, so it does not swallow the next product
+            self._file.write("\n")
+
+    @staticmethod
+    def _ends_mid_line(path: Path) -> bool:
+        if not path.exists() or path.stat().st_size == 0:
+            return False
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def write(self, products: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for product in products:
+            self._file.write(json.dumps(product, ensure_ascii=False) + "\n")
+            count += 1
+        self._file.flush()
+        return count
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def iter_ndjson(paths: Iterable[PathLike]) -> Iterator[Dict[str, Any]]:
+    """Yield products from NDJSON files in order; a truncated last line is skipped"""
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial line from an interrupted write
+                    continue
+
+def write_products_document(
+    output: PathLike,
+    header: Dict[str, Any],
+    products: Iterable[Dict[str, Any]],
+    count: int,
+    count_key: str = "count",
+):
+    """
+    Write {**header, count_key: count, "products": [...]} one product at a time,
+    matching json.dump(indent=2) output. The file is replaced atomically.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in {**header, count_key: count}.items():
+            f.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+
+        f.write('  "products": [')
+        first = True
+        for product in products:
+            f.write("\n" if first else ",\n")
+            f.write(textwrap.indent(json.dumps(product, ensure_ascii=False, indent=2), "    "))
+            first = False
+        f.write("]\n}" if first else "\n  ]\n}")
+
+    os.replace(tmp_path, output)
+
+def compact_ndjson(
+    sources: List[PathLike],
+    output: PathLike,
+    header: Dict[str, Any],
+    count_key: str = "count",
+) -> int:
+    """
+    Produce the aggregate JSON document from NDJSON streams.
+    Products are deduplicated by id (the last occurrence wins) using two
+    streaming passes, so only the ids are held in memory.
+    """
+    last_index: Dict[Any, int] = {}
+    for index, product in enumerate(iter_ndjson(sources)):
+        last_index[product.get("id", index)] = index
+    keep = set(last_index.values())
+
+    products = (p for i, p in enumerate(iter_ndjson(sources)) if i in keep)
+    write_products_document(output, header, products, len(keep), count_key)
+    return len(keep)
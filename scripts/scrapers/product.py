@@ -0,0 +1,130 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from material_mapper import MaterialMapper
+from ndjson_store import PathLike, iter_ndjson
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if value else ""
+
+@dataclass(slots=True)
+class Product:
+    """
+    One scraped product, shared by every scraper and both orchestrators.
+
+    Brand, category, currency, source and texture type repeat across the
+    whole catalog, so they are interned and every record points at the same
+    string, and products with the same composition share one blend tuple.
+    Serialized with to_dict() (the JSON/NDJSON shape) and read back with
+    from_dict(), which also accepts rows written in the older url/image
+    shape. to_row() is the Supabase products row, which keeps that older
+    shape's column names.
+    """
+    id: str
+    name: str
+    brand: str
+    category: str
+    price: float
+    currency: str = "USD"
+    image_url: str = ""
+    product_url: str = ""
+    sizes: List[str] = field(default_factory=list)
+    colors: List[str] = field(default_factory=list)
+    is_luxury: bool = False
+    # Designer of a product sold on a multi-brand platform (Farfetch, Musinsa, ...)
+    original_brand: str = ""
+    composition: str = ""
+    texture_type: str = "cotton"  # MaterialMapper's default until the composition is known
+    # Preset weights in MaterialMapper.PRESET_ORDER, shared per composition
+    material_blend: Tuple[float, ...] = MaterialMapper.get_blend("")
+    # Site the product was scraped from; defaults to the brand
+    source: str = ""
+    # Stamped once per scraped category by BaseScraper.scrape()
+    scraped_at: str = ""
+
+    def __post_init__(self):
+        self.brand = _intern(self.brand)
+        self.category = _intern(self.category)
+        self.currency = _intern(self.currency)
+        self.original_brand = _intern(self.original_brand)
+        self.texture_type = _intern(self.texture_type)
+        self.source = _intern(self.source or self.brand.upper())
+
+    def apply_composition(self, composition: str):
+        """Set composition and the texture type and blend derived from it"""
+        self.composition = composition
+        self.texture_type = _intern(MaterialMapper.get_preset(composition))
+        self.material_blend = MaterialMapper.get_blend(composition)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "brand": self.brand,
+            "category": self.category,
+            "price": self.price,
+            "currency": self.currency,
+            "imageUrl": self.image_url,
+            "productUrl": self.product_url,
+            "sizes": self.sizes,
+            "colors": self.colors,
+            "isLuxury": self.is_luxury,
+            "original_brand": self.original_brand,
+            "composition": self.composition,
+            "texture_type": self.texture_type,
+            "material_blend": list(self.material_blend),
+            "source": self.source,
+            "scrapedAt": self.scraped_at,
+        }
+
+    def to_row(self) -> Dict[str, Any]:
+        """Row for the Supabase products table; PostgREST rejects columns it does not have"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "brand": self.brand,
+            "category": self.category,
+            "price": self.price,
+            "currency": self.currency,
+            "url": self.product_url,
+            "image": self.image_url,
+            "original_brand": self.original_brand,
+            "composition": self.composition,
+            "texture_type": self.texture_type,
+            "source": self.source,
+        }
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> "Product":
+        get = row.get
+        product = cls(
+            id=row["id"],
+            name=get("name", ""),
+            brand=get("brand", ""),
+            category=get("category", ""),
+            price=get("price", 0.0),
+            currency=get("currency", "USD"),
+            image_url=get("imageUrl") or get("image") or "",
+            product_url=get("productUrl") or get("url") or "",
+            sizes=get("sizes") or [],
+            colors=get("colors") or [],
+            is_luxury=get("isLuxury", False),
+            original_brand=get("original_brand", ""),
+            composition=get("composition", ""),
+            texture_type=get("texture_type") or "cotton",
+            source=get("source", ""),
+            scraped_at=get("scrapedAt", ""),
+        )
+        if get("material_blend") is not None:
+            blend = tuple(row["material_blend"])
+            # Share the cached tuple unless the stored vector predates a PRESETS change
+            cached = MaterialMapper.get_blend(product.composition)
+            product.material_blend = cached if cached == blend else blend
+        elif product.composition:
+            product.material_blend = MaterialMapper.get_blend(product.composition)
+        return product
+
+def iter_products(paths: Iterable[PathLike]) -> Iterator[Product]:
+    """Read products back from NDJSON streams"""
+    return map(Product.from_dict, iter_ndjson(paths))
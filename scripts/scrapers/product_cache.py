@@ -0,0 +1,118 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import CACHE_DB
+from product import Product
+
+# Fields that change on every scrape or are filled from the detail page
+LISTING_VOLATILE_FIELDS = {"scrapedAt", "composition", "texture_type", "material_blend"}
+
+class ProductCache:
+    """
+    On-disk product fingerprint cache (SQLite).
+
+    `details` remembers the composition read from each product's detail page
+    together with the listing fingerprint it was read for, so unchanged
+    products skip the detail fetch. Texture type and blend are derived from
+    the composition again, so they follow MaterialMapper changes. `products` holds the fingerprint of the
+    last emitted version of each product, so the sync only emits new or
+    changed rows.
+    """
+
+    def __init__(self, path: Path = CACHE_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS details (
+                key TEXT PRIMARY KEY,
+                listing_hash TEXT NOT NULL,
+                composition TEXT NOT NULL,
+                fetched_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS products (
+                key TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+        """)
+        # Caches written before texture types were derived on read
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(details)")}
+        if "texture_type" in columns:
+            self.conn.execute("ALTER TABLE details DROP COLUMN texture_type")
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def key_of(product: Product) -> str:
+        return product.product_url or product.id
+
+    @staticmethod
+    def _hash(fields: Dict[str, Any]) -> str:
+        blob = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def listing_hash(cls, product: Product) -> str:
+        """Fingerprint of what the listing page shows (no detail-page fields)"""
+        return cls._hash({k: v for k, v in product.to_dict().items() if k not in LISTING_VOLATILE_FIELDS})
+
+    @classmethod
+    def content_hash(cls, product: Product) -> str:
+        """Fingerprint of the full product as emitted"""
+        return cls._hash({k: v for k, v in product.to_dict().items() if k != "scrapedAt"})
+
+    # Detail pages
+
+    def apply_cached_details(self, products: List[Product]) -> List[Product]:
+        """
+        Fill composition for products whose listing is unchanged since their
+        detail page was read. Returns the products that still need a fetch.
+        """
+        pending = []
+        for product in products:
+            row = self.conn.execute(
+                "SELECT listing_hash, composition FROM details WHERE key = ?",
+                (self.key_of(product),),
+            ).fetchone()
+            if row and row[0] == self.listing_hash(product):
+                product.apply_composition(row[1])
+            else:
+                pending.append(product)
+        return pending
+
+    def remember_details(self, products: List[Product]):
+        now = datetime.now().isoformat()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)",
+            [(self.key_of(p), self.listing_hash(p), p.composition, now) for p in products],
+        )
+        self.conn.commit()
+
+    # Emitted products
+
+    def changed(self, products: Iterable[Product]) -> List[Product]:
+        """Products that are new or differ from their last recorded version"""
+        delta = []
+        for product in products:
+            row = self.conn.execute(
+                "SELECT content_hash FROM products WHERE key = ?", (self.key_of(product),)
+            ).fetchone()
+            if row is None or row[0] != self.content_hash(product):
+                delta.append(product)
+        return delta
+
+    def record(self, products: Iterable[Product], seen_at: Optional[str] = None):
+        """Store the current fingerprint and last-seen time of each product"""
+        seen_at = seen_at or datetime.now().isoformat()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO products VALUES (?, ?, ?)",
+            [(self.key_of(p), self.content_hash(p), seen_at) for p in products],
+        )
+        self.conn.commit()
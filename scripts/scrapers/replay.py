@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Offline record/replay harness for the listing scrapers.
+
+  python3 replay.py record --brands ZARA,HM --limit 50   # live: save snapshots
+  python3 replay.py check                                # replay: compare with recorded products
+  python3 replay.py bench --rounds 20                    # replay: time extraction per snapshot
+
+Snapshots live in data/snapshots/{brand}/{category}.html|json. Replay serves
+them through Playwright routing, so nothing reaches the retailer.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from typing import Dict, List, Tuple, Type
+
+from config import BRAND_URLS
+from base_scraper import BaseScraper
+from browser_pool import BrowserPool
+from scheduler import HostCircuitBreaker, HostRateLimiter
+from snapshots import SnapshotStore, comparable, serve_snapshot
+from run_all import SCRAPERS as BRAND_SCRAPERS
+from luxury_scrapers import FarfetchScraper, SsenseScraper
+from k_fashion_scrapers import MusinsaScraper, WConceptScraper
+
+SCRAPERS: Dict[str, Type[BaseScraper]] = {
+    **BRAND_SCRAPERS,
+    "FARFETCH": FarfetchScraper,
+    "SSENSE": SsenseScraper,
+    "MUSINSA": MusinsaScraper,
+    "WCONCEPT": WConceptScraper,
+}
+
+# Replay never touches the network, so politeness delays and the breaker are off
+OFFLINE = {
+    "rate_limiter": HostRateLimiter(0, 0),
+    "detail_rate_limiter": HostRateLimiter(0, 0),
+    "breaker": HostCircuitBreaker(threshold=10 ** 9),
+}
+
+def selected(store: SnapshotStore, brands: List[str]) -> List[Tuple[str, str]]:
+    units = [(b.upper(), c) for b, c in store.available()]
+    units = [(b, c) for b, c in units if b in SCRAPERS and (not brands or b in brands)]
+    if not units:
+        print(f"⚠️  No snapshots in {store.root}; record some with: python3 replay.py record")
+    return units
+
+async def record(store: SnapshotStore, brands: List[str], limit: int):
+    async with BrowserPool(max_contexts=1) as pool:
+        for name in brands:
+            scraper = SCRAPERS[name](limit=limit, pool=pool, record_to=store)
+            for category in BRAND_URLS.get(name, {}):
+                await scraper.scrape(category)
+
+async def check(store: SnapshotStore, brands: List[str]) -> bool:
+    ok = True
+    async with BrowserPool(max_contexts=1, block_resources=False) as pool:
+        for name, category in selected(store, brands):
+            snapshot = store.load(name, category)
+            scraper = SCRAPERS[name](limit=max(1, len(snapshot.expected)), pool=pool, replay_from=store, **OFFLINE)
+            with contextlib.redirect_stdout(io.StringIO()):
+                products = await scraper.scrape(category)
+
+            expected, actual = comparable(snapshot.expected), comparable([p.to_dict() for p in products])
+            if actual == expected:
+                print(f"✅ {name}/{category}: {len(actual)} products match")
+                continue
+            ok = False
+            missing = [p for p in expected if p not in actual]
+            extra = [p for p in actual if p not in expected]
+            print(f"❌ {name}/{category}: {len(actual)} products, {len(missing)} missing, {len(extra)} unexpected")
+            for product in (missing + extra)[:3]:
+                print(f"     {product}")
+    return ok
+
+async def bench(store: SnapshotStore, brands: List[str], rounds: int):
+    async with BrowserPool(max_contexts=1, block_resources=False) as pool:
+        for name, category in selected(store, brands):
+            snapshot = store.load(name, category)
+            scraper = SCRAPERS[name](limit=max(1, len(snapshot.expected)), pool=pool, **OFFLINE)
+            async with pool.page() as page:
+                await serve_snapshot(page, snapshot)
+                await page.goto(snapshot.url, wait_until="domcontentloaded")
+
+                timings = []
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for _ in range(rounds):
+                        scraper.products = []
+                        start = time.perf_counter()
+                        await scraper._extract_products(page, category)
+                        timings.append(time.perf_counter() - start)
+
+            timings.sort()
+            median = timings[len(timings) // 2]
+            count = len(scraper.products)
+            rate = count / median if median else 0
+            print(f"📊 {name}/{category}: {count} products, median {median * 1000:.1f} ms "
+                  f"(min {timings[0] * 1000:.1f} ms), {rate:,.0f} products/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay listing snapshots")
+    parser.add_argument("mode", choices=["record", "check", "bench"])
+    parser.add_argument("--brands", type=str, help="Comma separated list of brands")
+    parser.add_argument("--limit", type=int, default=50, help="Products per category when recording")
+    parser.add_argument("--rounds", type=int, default=20, help="Extraction runs per snapshot when benchmarking")
+    args = parser.parse_args()
+
+    brands = [b.strip().upper() for b in args.brands.split(",")] if args.brands else []
+    brands = [b for b in brands if b in SCRAPERS]
+    store = SnapshotStore()
+
+    if args.mode == "record":
+        asyncio.run(record(store, brands or list(SCRAPERS), args.limit))
+    elif args.mode == "check":
+        if not asyncio.run(check(store, brands)):
+            raise SystemExit(1)
+    else:
+        asyncio.run(bench(store, brands, args.rounds))
+
+if __name__ == "__main__":
+    main()
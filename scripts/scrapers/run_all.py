@@ -5,10 +5,16 @@ Orchestrator script to run all brand scrapers
 
 import asyncio
 import argparse
-import json
+import sys
 from datetime import datetime
 from pathlib import Path
-from config import OUTPUT_FILE
+from config import OUTPUT_FILE, MAX_CONCURRENT_BRANDS
+from browser_pool import BrowserPool
+from http_fetcher import HttpFetcher
+from scheduler import run_bounded
+from ndjson_store import compact_ndjson
+from checkpoint import CheckpointJournal
+from metrics import RunMetrics
 
 # Import all scrapers
 from zara_scraper import ZaraScraper
@@ -31,16 +37,14 @@ SCRAPERS = {
     "GUCCI": GucciScraper
 }
 
-async def run_scraper(name, scraper_cls, limit, test_mode):
+async def run_scraper(name, scraper, test_mode, journal):
     print(f"\n🚀 Starting {name}...")
-    scraper = scraper_cls(limit=limit, test_mode=test_mode)
 
     # Scrape multiple categories if needed, for now just scraping tops as default or iterates
     # But BaseScraper.scrape takes one category.
     # We will scrape a default set of categories for each brand.
 
     categories = ["women-tops", "women-dresses", "women-outerwear", "women-bottoms"]
-    all_products = []
 
     for cat in categories:
         # Check if category exists for brand
@@ -51,44 +55,85 @@ async def run_scraper(name, scraper_cls, limit, test_mode):
                  if cat == "women-tops": cat = "women-ready-to-wear"
                  elif cat == "women-bottoms": continue # skip for now
 
+             if journal.is_done(name, cat):
+                 print(f"⏭️  {name}: {cat} already scraped, skipping")
+                 continue
+             if scraper.circuit_open(cat):
+                 print(f"⛔ {name}: site keeps failing, skipping {cat}")
+                 journal.mark_skipped(name, cat, "circuit open")
+                 continue
+
+             # Per-host politeness is handled by the scraper's rate limiter.
+             # Each category is streamed to the brand's NDJSON file as it finishes.
              products = await scraper.scrape(cat)
-             all_products.extend(products)
-             # Small delay between categories
-             await asyncio.sleep(2)
+             if products:
+                 journal.mark_done(name, cat, len(products))
+             elif scraper.circuit_open(cat):
+                 journal.mark_skipped(name, cat, "circuit open")
 
-    scraper.products = all_products # Update total products
     scraper.save_products()
-    return all_products
+    return scraper.streamed_count
 
 async def main():
     parser = argparse.ArgumentParser(description="Run All Scrapers")
     parser.add_argument("--limit", type=int, default=10, help="Products per category per brand")
     parser.add_argument("--test", action="store_true", help="Run in test mode")
     parser.add_argument("--brands", type=str, help="Comma separated list of brands to run")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_BRANDS, help="Brands scraped in parallel")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run instead of starting over")
     args = parser.parse_args()
 
     brands_to_run = args.brands.split(",") if args.brands else SCRAPERS.keys()
-    final_results = []
-
-    for brand_name in brands_to_run:
-        brand_name = brand_name.strip()
-        if brand_name in SCRAPERS:
-            try:
-                products = await run_scraper(brand_name, SCRAPERS[brand_name], args.limit, args.test)
-                final_results.extend(products)
-            except Exception as e:
-                print(f"❌ Failed to run {brand_name}: {e}")
-
-    # Save aggregated results
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump({
-            "generatedAt": datetime.now().isoformat(),
-            "totalCount": len(final_results),
-            "products": final_results
-        }, f, ensure_ascii=False, indent=2)
-
-    print(f"\n✨ ALL DONE! Aggregated {len(final_results)} products to {OUTPUT_FILE}")
+    brands_to_run = [b.strip() for b in brands_to_run if b.strip() in SCRAPERS]
+
+    journal = CheckpointJournal("run_all-test" if args.test else "run_all", resume=args.resume)
+    if journal.resuming:
+        print(f"⏯️  Resuming: {len(journal.entries)} brand categories already scraped")
+
+    metrics = RunMetrics("run_all")
+
+    # One browser and one HTTP session for the whole run; both are opened lazily,
+    # so test mode never starts them
+    async with BrowserPool(max_contexts=max(1, args.concurrency)) as pool, HttpFetcher() as http:
+        scrapers = {
+            name: SCRAPERS[name](
+                limit=args.limit, test_mode=args.test, pool=pool, http=http, stream=True, resume=journal.has_brand(name),
+                metrics=metrics,
+            )
+            for name in brands_to_run
+        }
+        jobs = {
+            name: (lambda name=name: run_scraper(name, scrapers[name], args.test, journal))
+            for name in brands_to_run
+        }
+        results = await run_bounded(jobs, args.concurrency)
+        metrics.browser_launch_seconds = pool.launch_seconds
+
+    # Compact every brand stream written this run (including brands that failed
+    # midway), in the requested brand order regardless of completion order
+    for scraper in scrapers.values():
+        scraper.close_stream()
+    streams = [s.stream_path for s in scrapers.values() if s.streamed_count]
+    with metrics.phase("save"):
+        total = compact_ndjson(streams, OUTPUT_FILE, {"generatedAt": datetime.now().isoformat()}, count_key="totalCount")
+
+    print(f"\n✨ ALL DONE! Aggregated {total} products to {OUTPUT_FILE}")
+    metrics.write()
+
+    failed = [name for name, result in results.items() if isinstance(result, Exception)]
+    if failed:
+        print(f"❌ Did not finish: {', '.join(failed)}")
+    if journal.skipped:
+        units = ", ".join(f"{brand}/{cat}" for brand, cat in journal.skipped)
+        print(f"⛔ Skipped by circuit breaker: {units}")
+    if failed or journal.skipped:
+        journal.close()
+        print("⚠️  Run incomplete; rerun with --resume to retry what is missing")
+        return False
+    journal.finish()
+    return True
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Non-zero when the journal is left for --resume, so CI keeps the checkpoint
+    if not asyncio.run(main()):
+        sys.exit(1)
@@ -0,0 +1,150 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict
+from urllib.parse import urlparse
+
+from config import (
+    REQUEST_DELAY_MIN, REQUEST_DELAY_MAX, MAX_CONCURRENT_BRANDS, DETAIL_CONCURRENCY_PER_HOST,
+    RETRY_DELAY, RETRY_BACKOFF_MAX, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN
+)
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+class HostRateLimiter:
+    """
+    Per-host politeness floor.
+
+    Requests to the same host are spaced at least REQUEST_DELAY_MIN..MAX
+    seconds apart (randomized), while different hosts never wait on each
+    other. With `burst` > 1 the floor becomes a sliding window: up to `burst`
+    requests may start within one delay of each other, so a caller allowing
+    several requests in flight per host is not serialized by the spacing.
+    Slots are reserved synchronously, so the limiter is safe to share
+    between concurrent tasks without a lock.
+    """
+
+    def __init__(self, min_delay: float = REQUEST_DELAY_MIN, max_delay: float = REQUEST_DELAY_MAX, burst: int = 1):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.burst = max(1, burst)
+        # Start times of the last `burst` requests booked per host
+        self._slots: Dict[str, Deque[float]] = {}
+
+    def reserve(self, url: str) -> float:
+        """Book the next free slot for the URL's host and return seconds to wait"""
+        host = host_of(url)
+        now = time.monotonic()
+        window = self._slots.setdefault(host, deque(maxlen=self.burst))
+        slot = now
+        if window:
+            slot = max(slot, window[-1])
+        if len(window) == self.burst:
+            slot = max(slot, window[0] + random.uniform(self.min_delay, self.max_delay))
+        window.append(slot)
+        return slot - now
+
+    async def wait(self, url: str):
+        """Sleep until this host may be requested again"""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# Process-wide limiter shared by every scraper unless one is injected
+HOST_RATE_LIMITER = HostRateLimiter()
+# Detail pages allow DETAIL_CONCURRENCY_PER_HOST in flight, so they are paced
+# by their own window instead of queueing behind the listing limiter
+DETAIL_RATE_LIMITER = HostRateLimiter(burst=DETAIL_CONCURRENCY_PER_HOST)
+
+class CircuitOpenError(Exception):
+    """Raised instead of requesting a host whose circuit breaker is open"""
+
+class HostCircuitBreaker:
+    """
+    Per-host circuit breaker for listing navigation and detail pages.
+
+    After `threshold` consecutive failures (or one failure recorded with
+    `trip=True`, e.g. a timeout) a host is skipped for `cooldown` seconds.
+    Then the circuit is half-open: allow() admits a single trial request and
+    keeps every other caller out until the trial records a success, which
+    closes the circuit, or a failure, which opens it for another cooldown.
+    A trial that never reports back is given up after one more cooldown.
+    """
+
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        # Half-open hosts whose trial request is in flight, with its start time
+        self._trial_at: Dict[str, float] = {}
+
+    def _trial_running(self, host: str) -> bool:
+        started = self._trial_at.get(host)
+        return started is not None and self.clock() - started < self.cooldown
+
+    def is_open(self, url: str) -> bool:
+        """Whether requests to the URL's host are being refused (cooling down or trial in flight)"""
+        host = host_of(url)
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return False
+        return self.clock() - opened_at < self.cooldown or self._trial_running(host)
+
+    def allow(self, url: str) -> bool:
+        """Whether the caller may request the URL's host; claims the trial of a half-open circuit"""
+        host = host_of(url)
+        if self._opened_at.get(host) is None:
+            return True
+        if self.is_open(url):
+            return False
+        self._trial_at[host] = self.clock()
+        return True
+
+    def record_success(self, url: str):
+        host = host_of(url)
+        self._failures.pop(host, None)
+        self._opened_at.pop(host, None)
+        self._trial_at.pop(host, None)
+
+    def record_failure(self, url: str, trip: bool = False) -> bool:
+        """Count a failure; returns True if the circuit is now open"""
+        host = host_of(url)
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if trip or host in self._trial_at or self._failures[host] >= self.threshold:
+            self._opened_at[host] = self.clock()
+            self._trial_at.pop(host, None)
+            return True
+        return False
+
+# Process-wide breaker shared by every scraper unless one is injected
+HOST_CIRCUIT_BREAKER = HostCircuitBreaker()
+
+def backoff_delay(attempt: int, base: float = RETRY_DELAY, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+async def run_bounded(
+    jobs: Dict[str, Callable[[], Awaitable[Any]]],
+    concurrency: int = MAX_CONCURRENT_BRANDS,
+) -> Dict[str, Any]:
+    """
+    Run named jobs concurrently with a global cap.
+    Returns {name: result}, with the exception as result for failed jobs.
+    """
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(name: str, job: Callable[[], Awaitable[Any]]):
+        async with slots:
+            try:
+                return await job()
+            except Exception as e:
+                print(f"❌ Failed to run {name}: {e}")
+                return e
+
+    results = await asyncio.gather(*(run(name, job) for name, job in jobs.items()))
+    return dict(zip(jobs.keys(), results))
@@ -5,8 +5,15 @@ Unit and Integration Tests for Scrapers
 
 import unittest
 import asyncio
+import re
+import time
 from base_scraper import BaseScraper
+from browser_pool import BrowserPool, should_block_request
 from config import BRAND_URLS
+from scheduler import HostRateLimiter, run_bounded
+from extraction import normalize_spec
+from product import Product
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 # Mock subclass for testing BaseScraper
 class TestScraper(BaseScraper):
@@ -14,10 +21,13 @@ class TestScraper(BaseScraper):
         return "http://example.com"
 
     async def _extract_products(self, page, category):
-        self.products.append({"id": "test-1", "name": "Test Product"})
+        self.products.append(Product("test-1", "Test Product", "TestBrand", "tops", 10.0))
+
+    def _parse_card(self, card, category, index):
+        return Product(f"test-{index+1}", card["name"], "TestBrand", category, 10.0)
 
     def generate_mock_products(self, category, limit):
-        return [{"id": "mock-1", "name": "Mock Product"}]
+        return [Product("mock-1", "Mock Product", "TestBrand", category, 10.0)]
 
 class TestBaseScraper(unittest.TestCase):
     def setUp(self):
@@ -34,7 +44,39 @@ class TestBaseScraper(unittest.TestCase):
 
         products = asyncio.run(run_scrape())
         self.assertEqual(len(products), 1)
-        self.assertEqual(products[0]["name"], "Mock Product")
+        self.assertEqual(products[0].name, "Mock Product")
+
+    def test_shared_pool_not_launched_in_test_mode(self):
+        async def run_scrape():
+            async with BrowserPool() as pool:
+                scraper = TestScraper("TestBrand", limit=1, test_mode=True, pool=pool)
+                await scraper.scrape("tops")
+                await scraper.scrape("dresses")
+                return pool, scraper
+
+        pool, scraper = asyncio.run(run_scrape())
+        self.assertIs(scraper.pool, pool)
+        self.assertEqual(pool.launches, 0)
+        # Each scrape() returns only its own category
+        self.assertEqual(len(scraper.products), 1)
+
+    def test_streaming_appends_each_category(self):
+        import tempfile
+        from pathlib import Path
+        from ndjson_store import iter_ndjson
+
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = TestScraper("TestBrand", limit=1, test_mode=True, stream=True)
+            scraper.stream_path = Path(tmp) / "testbrand_products.ndjson"
+
+            async def run_scrape():
+                await scraper.scrape("tops")
+                await scraper.scrape("dresses")
+
+            asyncio.run(run_scrape())
+            scraper.close_stream()
+            self.assertEqual(scraper.streamed_count, 2)
+            self.assertEqual(len(list(iter_ndjson([scraper.stream_path]))), 2)
 
     def test_price_normalization(self):
         self.assertEqual(self.scraper.normalize_price("₩13,500", "KRW"), 10.0)
@@ -47,6 +89,405 @@ class TestBaseScraper(unittest.TestCase):
         self.assertEqual(self.scraper.map_category("Coats & Jackets"), "outerwear")
         self.assertEqual(self.scraper.map_category("Trousers"), "bottoms")
 
+class FakeGridPage:
+    """Stands in for a Playwright page whose grid grows by `step` cards per scroll"""
+
+    def __init__(self, step, total):
+        self.step = step
+        self.total = total
+        self.cards = step
+        self.scrolls = 0
+        self.keyboard = self
+
+    async def press(self, key):
+        self.scrolls += 1
+        self.cards = min(self.total, self.cards + self.step)
+
+    async def evaluate(self, script, arg=None):
+        return self.cards
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        if self.cards <= arg[1]:
+            raise TimeoutError()
+
+class GridScraper(TestScraper):
+    selector_spec = {"card": ".tile", "fields": {}}
+
+class TestAdaptiveScroll(unittest.TestCase):
+    def test_stops_once_limit_is_loaded(self):
+        page = FakeGridPage(step=12, total=500)
+        scraper = GridScraper("TestBrand", limit=50)
+        asyncio.run(scraper._scroll_page(page))
+        self.assertEqual(page.scrolls, 4)
+
+    def test_stops_when_growth_stalls(self):
+        page = FakeGridPage(step=12, total=30)
+        scraper = GridScraper("TestBrand", limit=50)
+        asyncio.run(scraper._scroll_page(page))
+        # Two scrolls to reach 30, then SCROLL_STALL_ROUNDS scrolls without growth
+        self.assertEqual(page.scrolls, 4)
+
+class TestResourceBlocking(unittest.TestCase):
+    def test_blocks_heavy_resources(self):
+        self.assertTrue(should_block_request("image", "https://static.zara.net/photos/a.jpg"))
+        self.assertTrue(should_block_request("font", "https://www.zara.com/font.woff2"))
+        self.assertTrue(should_block_request("script", "https://www.googletagmanager.com/gtm.js"))
+
+    def test_allows_documents_and_data(self):
+        self.assertFalse(should_block_request("document", "https://www.zara.com/kr/ko/woman-shirts-l1217.html"))
+        self.assertFalse(should_block_request("xhr", "https://www.zara.com/kr/ko/category/1217/products?ajax=true"))
+
+class TestScheduler(unittest.TestCase):
+    def test_rate_limit_is_per_host(self):
+        limiter = HostRateLimiter(min_delay=2, max_delay=2)
+        self.assertEqual(limiter.reserve("https://www.zara.com/a"), 0)
+        self.assertAlmostEqual(limiter.reserve("https://www.zara.com/b"), 2, places=1)
+        # A different retailer does not wait for ZARA
+        self.assertEqual(limiter.reserve("https://www.gucci.com/a"), 0)
+
+    def test_rate_limit_burst_window(self):
+        limiter = HostRateLimiter(min_delay=2, max_delay=2, burst=3)
+        self.assertEqual([limiter.reserve(f"https://www.ssense.com/{i}") for i in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(limiter.reserve("https://www.ssense.com/3"), 2, places=1)
+
+    def test_run_bounded_caps_concurrency(self):
+        running = {"now": 0, "peak": 0}
+
+        async def job(value):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            if value == 3:
+                raise ValueError("boom")
+            return value
+
+        jobs = {f"brand-{i}": (lambda i=i: job(i)) for i in range(6)}
+        results = asyncio.run(run_bounded(jobs, concurrency=2))
+
+        self.assertEqual(running["peak"], 2)
+        self.assertEqual(results["brand-0"], 0)
+        self.assertIsInstance(results["brand-3"], ValueError)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FailingPage:
+    def __init__(self):
+        self.gotos = 0
+
+    async def goto(self, url, **kwargs):
+        self.gotos += 1
+        raise Exception("net::ERR_CONNECTION_REFUSED")
+
+class HangingPage(FailingPage):
+    async def goto(self, url, **kwargs):
+        self.gotos += 1
+        raise PlaywrightTimeoutError(f"Timeout {kwargs.get('timeout')}ms exceeded")
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_trips_and_half_opens_per_host(self):
+        from scheduler import HostCircuitBreaker
+        clock = FakeClock()
+        breaker = HostCircuitBreaker(threshold=2, cooldown=60, clock=clock)
+
+        self.assertFalse(breaker.record_failure("https://down.test/a"))
+        self.assertTrue(breaker.record_failure("https://down.test/b"))
+        self.assertTrue(breaker.is_open("https://down.test/c"))
+        self.assertFalse(breaker.is_open("https://up.test/"))
+
+        # After the cooldown one trial goes through; another failure re-opens
+        clock.now = 61
+        self.assertFalse(breaker.is_open("https://down.test/"))
+        self.assertTrue(breaker.record_failure("https://down.test/"))
+        breaker.record_success("https://down.test/")
+        self.assertFalse(breaker.is_open("https://down.test/"))
+
+    def test_half_open_admits_a_single_trial(self):
+        from scheduler import HostCircuitBreaker
+        clock = FakeClock()
+        breaker = HostCircuitBreaker(threshold=1, cooldown=60, clock=clock)
+        breaker.record_failure("https://down.test/")
+        self.assertFalse(breaker.allow("https://down.test/a"))
+
+        clock.now = 61
+        self.assertTrue(breaker.allow("https://down.test/a"))
+        # Every other category/brand on the host waits for the trial's outcome
+        self.assertFalse(breaker.allow("https://down.test/b"))
+        self.assertTrue(breaker.is_open("https://down.test/b"))
+        self.assertTrue(breaker.allow("https://up.test/"))
+
+        # A failed trial re-opens for a full cooldown
+        self.assertTrue(breaker.record_failure("https://down.test/a"))
+        clock.now = 100
+        self.assertFalse(breaker.allow("https://down.test/b"))
+
+        clock.now = 122
+        self.assertTrue(breaker.allow("https://down.test/a"))
+        breaker.record_success("https://down.test/a")
+        self.assertTrue(breaker.allow("https://down.test/b"))
+        self.assertTrue(breaker.allow("https://down.test/c"))
+
+        # A trial that never reports back is given up after another cooldown
+        breaker.record_failure("https://down.test/", trip=True)
+        clock.now = 183
+        self.assertTrue(breaker.allow("https://down.test/a"))
+        clock.now = 244
+        self.assertTrue(breaker.allow("https://down.test/b"))
+
+    def test_backoff_is_exponential_and_capped(self):
+        from scheduler import backoff_delay
+        for attempt in range(8):
+            delay = backoff_delay(attempt, base=1, cap=10)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(10, 2 ** attempt))
+
+    def test_timeout_trips_at_once(self):
+        import base_scraper
+        from scheduler import HostCircuitBreaker
+
+        scraper = TestScraper("TestBrand", breaker=HostCircuitBreaker(threshold=3), rate_limiter=HostRateLimiter(0, 0))
+        page = HangingPage()
+        with self.assertRaises(base_scraper.CircuitOpenError):
+            asyncio.run(scraper._navigate(page, "http://example.com/tops"))
+        self.assertEqual(page.gotos, 1)
+        self.assertTrue(scraper.circuit_open("dresses"))
+
+    def test_dead_site_skips_remaining_categories(self):
+        import base_scraper
+        from scheduler import HostCircuitBreaker, HostRateLimiter
+
+        breaker = HostCircuitBreaker(threshold=2)
+        scraper = TestScraper("TestBrand", breaker=breaker, rate_limiter=HostRateLimiter(0, 0))
+        page = FailingPage()
+
+        original = base_scraper.backoff_delay
+        base_scraper.backoff_delay = lambda attempt: 0
+        try:
+            with self.assertRaises(base_scraper.CircuitOpenError):
+                asyncio.run(scraper._navigate(page, "http://example.com/tops"))
+        finally:
+            base_scraper.backoff_delay = original
+
+        self.assertEqual(page.gotos, 2)
+        self.assertTrue(scraper.circuit_open("dresses"))
+        # Later categories return without touching the browser
+        self.assertEqual(asyncio.run(scraper.scrape("dresses")), [])
+
+class TestSelectorSpecs(unittest.TestCase):
+    def test_normalize_shorthand(self):
+        spec = normalize_spec({
+            "card": ".tile",
+            "fields": {
+                "name": ".title",
+                "price": {"selector": [".sale", ".price"], "exclude": "del"},
+                "image": {"selector": "img", "attr": ["data-src", "src"]},
+            },
+            "required": ["name"],
+        })
+        self.assertEqual(spec["card"], [".tile"])
+        self.assertEqual(spec["fields"]["name"]["selector"], [".title"])
+        self.assertIsNone(spec["fields"]["name"]["attr"])
+        self.assertEqual(spec["fields"]["price"]["exclude"], "del")
+        self.assertEqual(spec["fields"]["image"]["attr"], ["data-src", "src"])
+
+    def test_every_brand_has_selectors(self):
+        from config import BRAND_SELECTORS
+        for brand, spec in BRAND_SELECTORS.items():
+            normalized = normalize_spec(spec)
+            self.assertTrue(normalized["card"], brand)
+            for key in normalized["required"]:
+                self.assertIn(key, normalized["fields"], brand)
+
+class TestApiPayloads(unittest.TestCase):
+    def test_zara_category_payload(self):
+        from zara_scraper import ZaraScraper
+        scraper = ZaraScraper()
+        api_url = "https://www.zara.com/kr/ko/category/1217/products?ajax=true"
+        self.assertTrue(any(re.search(p, api_url) for p in scraper.API_PATTERNS))
+        payload = {"productGroups": [{"elements": [{"commercialComponents": [{
+            "id": 42, "name": "Linen Shirt ", "price": 5990000,
+            "seo": {"keyword": "linen-shirt", "seoProductId": "0123"},
+            "detail": {"colors": [{"name": "Ecru", "xmedia": [{"url": "https://static.zara.net/a.jpg?w={width}"}]}]},
+        }, {"id": 43, "name": "No price"}]}]}]}
+
+        products = scraper.parse_api_payload(payload, "women-tops")
+        self.assertEqual(len(products), 1)
+        self.assertEqual(products[0].id, "zara-42")
+        self.assertEqual(products[0].price, round(59900 / 1350, 2))
+        self.assertEqual(products[0].product_url, "https://www.zara.com/kr/ko/linen-shirt-p0123.html")
+        self.assertEqual(products[0].image_url, "https://static.zara.net/a.jpg?w=750")
+        self.assertEqual(products[0].colors, ["Ecru"])
+
+    def test_uniqlo_products_payload(self):
+        from uniqlo_scraper import UniqloScraper
+        payload = {"result": {"items": [{
+            "productId": "E455123-000", "name": "Supima Cotton T-Shirt",
+            "prices": {"base": {"value": 19900}, "promo": None},
+            "images": {"main": {"09": {"image": "https://image.uniqlo.com/a.jpg"}}},
+        }]}}
+
+        products = UniqloScraper().parse_api_payload(payload, "women-tops")
+        self.assertEqual(products[0].id, "uniqlo-E455123-000")
+        self.assertEqual(products[0].category, "tops")
+        self.assertEqual(products[0].image_url, "https://image.uniqlo.com/a.jpg")
+
+    def test_capture_collects_matching_json(self):
+        from api_capture import ApiCapture
+
+        class FakeResponse:
+            def __init__(self, url, body):
+                self.url = url
+                self.body = body
+
+            async def json(self):
+                if self.body is None:
+                    raise ValueError("not json")
+                return self.body
+
+        class FakePage:
+            def on(self, event, handler):
+                self.handler = handler
+
+        async def run():
+            page = FakePage()
+            capture = ApiCapture(page, [r"/api/products"])
+            page.handler(FakeResponse("https://shop.test/api/products?page=1", {"page": 1}))
+            page.handler(FakeResponse("https://shop.test/style.css", {"ignored": True}))
+            page.handler(FakeResponse("https://shop.test/api/products?page=2", None))
+            return await capture.payloads()
+
+        self.assertEqual(asyncio.run(run()), [{"page": 1}])
+
+class FakeDetailContext:
+    """
+    Browser context whose pages return canned body text and track concurrency.
+    `rendered` bodies only appear once the page has waited for its composition block.
+    """
+
+    def __init__(self, bodies, rendered=None):
+        self.bodies = bodies
+        self.rendered = rendered or {}
+        self.open_pages = 0
+        self.peak = 0
+        self.waits = []
+
+    async def new_page(self):
+        return FakeDetailPage(self)
+
+class FakeDetailPage:
+    def __init__(self, context):
+        self.context = context
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        self.context.open_pages += 1
+        self.context.peak = max(self.context.peak, self.context.open_pages)
+        await asyncio.sleep(0.01)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        self.context.waits.append(selector)
+        self.context.bodies.update(self.context.rendered)
+
+    async def wait_for_load_state(self, state, **kwargs):
+        self.context.waits.append(state)
+
+    async def inner_text(self, selector):
+        return self.context.bodies[self.url]
+
+    async def close(self):
+        self.context.open_pages -= 1
+
+class TestDetailCrawler(unittest.TestCase):
+    def test_enriches_with_per_host_cap(self):
+        from detail_crawler import DetailCrawler
+
+        bodies = {f"https://shop.test/p/{i}": "Free returns. Composition: Wool 80%, Nylon 20%" for i in range(10)}
+        bodies["https://shop.test/p/9"] = "No material information"
+        products = [Product(url, "Coat", "SHOP", "outerwear", 100.0, product_url=url) for url in bodies]
+        context = FakeDetailContext(bodies)
+
+        found = asyncio.run(DetailCrawler(context, per_host=3, rate_limiter=HostRateLimiter(0, 0)).enrich(products))
+
+        self.assertEqual(found, 9)
+        self.assertLessEqual(context.peak, 3)
+        self.assertEqual(products[0].composition, "wool 80%, nylon 20%")
+        self.assertEqual(products[0].texture_type, "wool")
+        self.assertEqual(products[9].composition, "")
+
+    def test_paced_fetches_overlap(self):
+        from detail_crawler import DetailCrawler
+
+        bodies = {f"https://shop.test/p/{i}": "Composition: Cotton 100%" for i in range(6)}
+        products = [Product(url, "Tee", "SHOP", "tops", 20.0, product_url=url) for url in bodies]
+        context = FakeDetailContext(bodies)
+        crawler = DetailCrawler(context, per_host=3, rate_limiter=HostRateLimiter(0.05, 0.05, burst=3))
+
+        started = time.monotonic()
+        found = asyncio.run(crawler.enrich(products))
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(found, 6)
+        # Three pages per delay window in flight, not one page per delay
+        self.assertEqual(context.peak, 3)
+        self.assertLess(elapsed, 0.2)
+
+    def test_translates_korean_detail_text(self):
+        from detail_crawler import DetailCrawler
+        from k_fashion_scrapers import translate_korean_material
+
+        context = FakeDetailContext({"https://musinsa.test/1": "소재 면 100%"})
+        crawler = DetailCrawler(context, translate=translate_korean_material, rate_limiter=HostRateLimiter(0, 0))
+        self.assertEqual(asyncio.run(crawler.fetch_composition("https://musinsa.test/1")), "cotton 100%")
+        self.assertEqual(context.waits, ["load"])
+
+    def test_waits_for_client_rendered_composition(self):
+        from detail_crawler import DetailCrawler
+
+        url = "https://musinsa.test/2"
+        context = FakeDetailContext({url: "Loading..."}, rendered={url: "Loading... Polyester 100%"})
+        crawler = DetailCrawler(context, composition_selector=".product_info_table", rate_limiter=HostRateLimiter(0, 0))
+        self.assertEqual(asyncio.run(crawler.fetch_composition(url)), "polyester 100%")
+        self.assertEqual(context.waits, [".product_info_table"])
+
+    def test_goes_through_rate_limiter_and_breaker(self):
+        from detail_crawler import DetailCrawler
+        from scheduler import CircuitOpenError, HostCircuitBreaker
+
+        class FailingContext:
+            async def new_page(self):
+                raise TimeoutError("detail page timed out")
+
+        limiter = HostRateLimiter(0, 0)
+        breaker = HostCircuitBreaker(threshold=2, cooldown=60)
+        crawler = DetailCrawler(FailingContext(), rate_limiter=limiter, breaker=breaker)
+        products = [Product(str(i), "Coat", "SHOP", "outerwear", 100.0, product_url=f"https://shop.test/p/{i}")
+                    for i in range(2)]
+
+        self.assertEqual(asyncio.run(crawler.enrich(products)), 0)
+        self.assertIn("shop.test", limiter._slots)
+        self.assertTrue(breaker.is_open("https://shop.test/p/3"))
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(crawler.fetch_composition("https://shop.test/p/3"))
+
+class TestKoreanTranslation(unittest.TestCase):
+    def test_longest_match_wins(self):
+        from k_fashion_scrapers import translate_korean_material
+        self.assertEqual(translate_korean_material("폴리에스테르 95%, 폴리우레탄 5%"), "Polyester 95%, Polyurethane 5%")
+        self.assertEqual(translate_korean_material("폴리 100%"), "Polyester 100%")
+        self.assertEqual(translate_korean_material("스판덱스 3%"), "Spandex 3%")
+
+    def test_single_syllables_only_as_words(self):
+        from k_fashion_scrapers import translate_korean_material
+        self.assertEqual(translate_korean_material("겉감: 모 90%, 견10%"), "겉감: Wool 90%, Silk10%")
+        self.assertEqual(translate_korean_material("(면)100%"), "(Cotton)100%")
+        text = "겨울 모델 착용, 마감 처리, 표면 발견"
+        self.assertEqual(translate_korean_material(text), text)
+
 class TestBrandIntegrations(unittest.TestCase):
     """Test that each brand scraper can be instantiated and has URL configs"""
 
@@ -0,0 +1,103 @@
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from config import SNAPSHOT_DIR
+
+# Snapshots are the rendered DOM; replaying their scripts would re-hydrate
+# (and usually clear) the grid, so they are dropped at serve time.
+SCRIPT_TAG = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+# Fields that differ between a recording and any later replay of it
+VOLATILE_FIELDS = {"scrapedAt"}
+
+@dataclass
+class Snapshot:
+    brand: str
+    category: str
+    url: str
+    html: str
+    payloads: List[Any] = field(default_factory=list)  # captured JSON API bodies
+    expected: List[Dict[str, Any]] = field(default_factory=list)  # listing products as recorded
+
+class SnapshotStore:
+    """
+    Listing page snapshots per brand/category, for offline replay.
+
+    Each snapshot is `{brand}/{category}.html` (the DOM after scrolling) plus
+    `{category}.json` with the URL, captured API payloads and the products
+    extracted live, before detail pages were read.
+    """
+
+    def __init__(self, root: Path = SNAPSHOT_DIR):
+        self.root = Path(root)
+
+    def _paths(self, brand: str, category: str) -> Tuple[Path, Path]:
+        directory = self.root / brand.lower()
+        return directory / f"{category}.html", directory / f"{category}.json"
+
+    def save(self, snapshot: Snapshot) -> Path:
+        html_path, meta_path = self._paths(snapshot.brand, snapshot.category)
+        html_path.parent.mkdir(parents=True, exist_ok=True)
+        html_path.write_text(snapshot.html, encoding="utf-8")
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "brand": snapshot.brand,
+                "category": snapshot.category,
+                "url": snapshot.url,
+                "recordedAt": datetime.now().isoformat(),
+                "payloads": snapshot.payloads,
+                "expected": snapshot.expected,
+            }, f, ensure_ascii=False, indent=2)
+        return html_path
+
+    def load(self, brand: str, category: str) -> Snapshot:
+        html_path, meta_path = self._paths(brand, category)
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        return Snapshot(
+            brand=meta["brand"],
+            category=meta["category"],
+            url=meta["url"],
+            html=html_path.read_text(encoding="utf-8"),
+            payloads=meta.get("payloads", []),
+            expected=meta.get("expected", []),
+        )
+
+    def has(self, brand: str, category: str) -> bool:
+        return all(p.exists() for p in self._paths(brand, category))
+
+    def available(self) -> List[Tuple[str, str]]:
+        """(brand directory, category) of every stored snapshot"""
+        return sorted(
+            (path.parent.name, path.stem)
+            for path in self.root.glob("*/*.json")
+            if path.with_suffix(".html").exists()
+        )
+
+class StaticCapture:
+    """Stands in for ApiCapture during replay, returning recorded payloads"""
+
+    def __init__(self, payloads: List[Any]):
+        self._payloads = payloads
+
+    async def payloads(self) -> List[Any]:
+        return list(self._payloads)
+
+async def serve_snapshot(page, snapshot: Snapshot):
+    """Route the page so navigation gets the snapshot and nothing reaches the network"""
+    html = SCRIPT_TAG.sub("", snapshot.html)
+
+    async def handle(route):
+        if route.request.resource_type == "document":
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        else:
+            await route.abort()
+
+    await page.route("**/*", handle)
+
+def comparable(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{k: v for k, v in p.items() if k not in VOLATILE_FIELDS} for p in products]
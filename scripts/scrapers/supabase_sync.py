@@ -0,0 +1,207 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    print("Dependencies missing. Run: pip install -r scripts/scrapers/requirements.txt")
+    exit(1)
+
+from config import SYNC_BATCH_SIZE, SYNC_CONCURRENCY, SYNC_TIMEOUT, SYNC_RETRIES, SYNC_RETRY_DELAY
+from scheduler import backoff_delay
+
+# Statuses worth retrying unchanged: the request may succeed once the backend recovers
+TRANSIENT_STATUSES = {408, 425, 429}
+# The key is missing, wrong or expired; no other request can succeed either
+AUTH_STATUSES = {401, 403}
+# Wrong key or wrong table: every row would be rejected the same way
+FATAL_STATUSES = AUTH_STATUSES | {404}
+# PostgREST schema errors: unknown column (PGRST204) or table (PGRST205)
+FATAL_CODES = {"PGRST204", "PGRST205"}
+
+def is_transient(status: Optional[int]) -> bool:
+    """Timeouts and connection errors (no status), 5xx and rate limiting"""
+    return status is None or status >= 500 or status in TRANSIENT_STATUSES
+
+def error_code(body: str) -> Optional[str]:
+    """PostgREST's error code (e.g. "PGRST204") from a JSON error body"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    return payload.get("code") if isinstance(payload, dict) else None
+
+@dataclass
+class SyncReport:
+    synced: List[Dict[str, Any]] = field(default_factory=list)
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    batch_latencies: List[float] = field(default_factory=list)  # seconds, in batch order
+    # Set when the sync was stopped early, e.g. because the key was rejected
+    aborted: Optional[str] = None
+
+    def summary(self) -> str:
+        if not self.batch_latencies:
+            text = f"{len(self.synced)} synced, {len(self.failed)} failed"
+        else:
+            avg = sum(self.batch_latencies) / len(self.batch_latencies)
+            text = (f"{len(self.synced)} synced, {len(self.failed)} failed in {len(self.batch_latencies)} batches "
+                    f"(avg {avg * 1000:.0f} ms, max {max(self.batch_latencies) * 1000:.0f} ms)")
+        return f"{text}, aborted: {self.aborted}" if self.aborted else text
+
+class SupabaseSyncer:
+    """
+    Upserts rows through Supabase's PostgREST endpoint with aiohttp.
+
+    Batches are sent concurrently (up to `concurrency` requests in flight).
+    A batch that times out or gets a 429/5xx is resent whole, up to `retries`
+    times with jittered exponential backoff. One rejected as bad data (other
+    4xx) is bisected until the offending rows are isolated, so a single bad
+    row does not sink the rest of its batch. Errors no row can get past stop
+    the sync, and the remaining batches are reported as failed without being
+    sent: 401/403/404, PostgREST schema errors (PGRST204/PGRST205), and a
+    batch whose two halves are both rejected with the batch's own error.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        table: str = "products",
+        batch_size: int = SYNC_BATCH_SIZE,
+        concurrency: int = SYNC_CONCURRENCY,
+        timeout: float = SYNC_TIMEOUT,
+        retries: int = SYNC_RETRIES,
+        retry_delay: float = SYNC_RETRY_DELAY,
+    ):
+        self.endpoint = f"{url.rstrip('/')}/rest/v1/{table}"
+        self.headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+            "Prefer": "resolution=merge-duplicates,return=minimal",
+        }
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._aborted: Optional[str] = None
+
+    @staticmethod
+    def dedupe(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the last row per id; PostgREST rejects a batch that upserts one key twice"""
+        by_id = {}
+        for row in rows:
+            by_id[row["id"]] = row
+        return list(by_id.values())
+
+    async def _post(self, session: "aiohttp.ClientSession",
+                    rows: List[Dict[str, Any]]) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+        """
+        Upsert rows once; returns (HTTP status or None if no response,
+        error message or None, PostgREST error code or None)
+        """
+        try:
+            async with session.post(self.endpoint, json=rows, headers=self.headers) as resp:
+                if resp.status < 300:
+                    return resp.status, None, None
+                body = await resp.text()
+                return resp.status, f"HTTP {resp.status}: {body[:200]}", error_code(body)
+        except Exception as e:
+            return None, str(e) or type(e).__name__, None
+
+    def _abort(self, error: str, reason: str):
+        self._aborted = error
+        print(f"   ❌ {reason} ({error}), stopping the sync")
+
+    async def _send(self, session, rows: List[Dict[str, Any]]) -> Tuple[Optional[int], Optional[str]]:
+        """_post() with bounded, backed-off retries of transient failures"""
+        for attempt in range(self.retries + 1):
+            if self._aborted:
+                return None, self._aborted
+            status, error, code = await self._post(session, rows)
+            if error is None:
+                return status, None
+            if status in AUTH_STATUSES:
+                self._abort(error, "Supabase rejected the key")
+                return status, error
+            if status in FATAL_STATUSES or code in FATAL_CODES:
+                self._abort(error, f"Supabase cannot store any row in {self.endpoint}")
+                return status, error
+            if not is_transient(status) or attempt == self.retries:
+                return status, error
+            delay = backoff_delay(attempt, base=self.retry_delay)
+            print(f"   ⚠️ {len(rows)} rows failed ({error}), retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _upsert(self, session, rows: List[Dict[str, Any]],
+                      sent: Optional[Tuple[Optional[int], Optional[str]]] = None,
+                      first_split: bool = True) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Returns (synced, failed); rows rejected as bad data are bisected down
+        to single rows. `sent` is the (status, error) of a request already made
+        for these rows.
+        """
+        status, error = sent or await self._send(session, rows)
+        if error is None:
+            return rows, []
+        if self._aborted or is_transient(status):
+            return [], rows
+        if len(rows) == 1:
+            print(f"   ❌ Row {rows[0].get('id')} rejected: {error}")
+            return [], rows
+
+        mid = len(rows) // 2
+        halves = [rows[:mid], rows[mid:]]
+        outcomes = [await self._send(session, half) for half in halves]
+        if first_split and all(half_error == error for _, half_error in outcomes):
+            # Not row-specific: splitting further would only repeat it ~2n times
+            self._abort(error, "Both halves of a batch were rejected the same way")
+            return [], rows
+
+        synced, failed = [], []
+        for half, outcome in zip(halves, outcomes):
+            half_synced, half_failed = await self._upsert(session, half, outcome, first_split=False)
+            synced += half_synced
+            failed += half_failed
+        return synced, failed
+
+    async def _sync_batch(self, session, slots: asyncio.Semaphore, index: int,
+                          rows: List[Dict[str, Any]]) -> Tuple[Optional[float], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        async with slots:
+            if self._aborted:
+                # Not sent, so no latency
+                return None, [], rows
+            start = time.perf_counter()
+            synced, failed = await self._upsert(session, rows)
+            latency = time.perf_counter() - start
+
+            if not failed:
+                print(f"   Upserted batch {index + 1} ({len(rows)} rows, {latency * 1000:.0f} ms)")
+            else:
+                print(f"   ⚠️ Batch {index + 1}: {len(synced)} rows upserted, {len(failed)} failed")
+            return latency, synced, failed
+
+    async def sync(self, rows: List[Dict[str, Any]]) -> SyncReport:
+        self._aborted = None
+        rows = self.dedupe(rows)
+        batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+        slots = asyncio.Semaphore(max(1, self.concurrency))
+        report = SyncReport()
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(self._sync_batch(session, slots, i, batch) for i, batch in enumerate(batches))
+            )
+
+        for latency, synced, failed in results:
+            if latency is not None:
+                report.batch_latencies.append(latency)
+            report.synced.extend(synced)
+            report.failed.extend(failed)
+        report.aborted = self._aborted
+        return report
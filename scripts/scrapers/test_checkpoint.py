@@ -0,0 +1,80 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from checkpoint import CheckpointJournal
+from ndjson_store import iter_ndjson
+from scraper_test import TestScraper as MockScraper
+
+class TestCheckpointJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_keeps_finished_units(self):
+        journal = CheckpointJournal("run", directory=self.dir)
+        journal.mark_done("ZARA", "women-tops", 10)
+        journal.close()
+
+        resumed = CheckpointJournal("run", resume=True, directory=self.dir)
+        self.assertTrue(resumed.resuming)
+        self.assertTrue(resumed.is_done("ZARA", "women-tops"))
+        self.assertFalse(resumed.is_done("ZARA", "women-dresses"))
+        self.assertTrue(resumed.has_brand("ZARA"))
+        self.assertFalse(resumed.has_brand("HM"))
+
+    def test_skipped_units_are_retried_on_resume(self):
+        journal = CheckpointJournal("run", directory=self.dir)
+        journal.mark_skipped("GAP", "women-tops", "circuit open")
+        journal.close()
+
+        resumed = CheckpointJournal("run", resume=True, directory=self.dir)
+        self.assertEqual(resumed.skipped, [("GAP", "women-tops")])
+        self.assertFalse(resumed.is_done("GAP", "women-tops"))
+        # Nothing was written to GAP's stream, so it is not resumed from it
+        self.assertFalse(resumed.has_brand("GAP"))
+
+    def test_fresh_run_and_finish_discard_journal(self):
+        journal = CheckpointJournal("run", directory=self.dir)
+        journal.mark_done("ZARA", "women-tops", 10)
+        journal.close()
+
+        self.assertFalse(CheckpointJournal("run", directory=self.dir).resuming)
+
+        journal = CheckpointJournal("run", directory=self.dir)
+        journal.mark_done("ZARA", "women-tops", 10)
+        journal.finish()
+        self.assertFalse(CheckpointJournal("run", resume=True, directory=self.dir).resuming)
+
+    def test_resumed_scraper_appends_to_stream(self):
+        stream = self.dir / "testbrand_products.ndjson"
+
+        first = MockScraper("TestBrand", limit=2, test_mode=True, stream=True)
+        first.stream_path = stream
+        asyncio.run(first.scrape("tops"))
+        first.close_stream()
+        # Simulate a crash in the middle of the next write
+        with open(stream, "a") as f:
+            f.write('{"id": "cut')
+
+        second = MockScraper("TestBrand", limit=2, test_mode=True, stream=True, resume=True)
+        second.stream_path = stream
+        # Normally counted in __init__ from the default stream path
+        second.streamed_count = sum(1 for _ in iter_ndjson([stream]))
+        asyncio.run(second.scrape("dresses"))
+        second.close_stream()
+
+        self.assertEqual(second.streamed_count, 2)
+        self.assertEqual(len(list(iter_ndjson([stream]))), 2)
+
+    def test_mock_streams_kept_apart_from_real_runs(self):
+        from config import DATA_DIR, TEST_DATA_DIR
+        self.assertEqual(MockScraper("TestBrand", test_mode=True, stream=True).stream_path.parent, TEST_DATA_DIR)
+        self.assertEqual(MockScraper("TestBrand", stream=True).stream_path.parent, DATA_DIR)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from aiohttp import web
+
+from config import BRAND_SELECTORS
+from http_fetcher import HttpFetcher, extract_cards_html
+from scheduler import HostRateLimiter
+
+TOPTEN_LISTING = """
+<html><body><ul>
+  <li class="item_box">
+    <a href="/product/1"><span class="thumb"><img src="https://img.test/1.jpg"></span></a>
+    <p class="name"> Cool Air T-Shirt </p><p class="price">19,900원</p>
+  </li>
+  <li class="item_box">
+    <a href="/product/2"><span class="thumb"><img src="data:image/gif;base64,R0l"></span></a>
+    <p class="name">Oxford Shirt</p><p class="price">39,900원</p>
+  </li>
+  <li class="item_box"><p class="price">9,900원</p></li>
+</ul><script>window.grid = []</script></body></html>
+"""
+
+class StandInShop:
+    """Local server standing in for a retailer with server-rendered listings"""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def listing(self, request):
+        self.requests += 1
+        return web.Response(text=TOPTEN_LISTING, content_type="text/html")
+
+    async def detail(self, request):
+        return web.Response(text="<html><body><h1>Shirt</h1><p>소재: 면 100%</p><script>x=1</script></body></html>",
+                            content_type="text/html")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/list", self.listing)
+        app.router.add_get("/product/{id}", self.detail)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+class TestHtmlExtraction(unittest.TestCase):
+    def test_same_card_shape_as_browser_extraction(self):
+        cards = extract_cards_html(TOPTEN_LISTING, BRAND_SELECTORS["TOPTEN"], limit=10)
+
+        # The card without a name is dropped (required), data: URIs are ignored
+        self.assertEqual(len(cards), 2)
+        self.assertEqual(cards[0], {
+            "name": "Cool Air T-Shirt", "price": "19,900원", "link": "/product/1", "image": "https://img.test/1.jpg",
+        })
+        self.assertIsNone(cards[1]["image"])
+
+    def test_limit_and_exclude(self):
+        html = '<div class="p"><b>A</b><span class="price"><del>10</del> 8</span></div>' * 3
+        spec = {"card": [".missing", ".p"], "fields": {"name": "b", "price": {"selector": ".price", "exclude": "del"}},
+                "required": ["name"]}
+        cards = extract_cards_html(html, spec, limit=2)
+        self.assertEqual(cards, [{"name": "A", "price": "8"}] * 2)
+
+class TestHttpScrape(unittest.TestCase):
+    def test_topten_scrapes_without_browser(self):
+        from topten_scraper import ToptenScraper
+        shop = StandInShop()
+
+        async def run():
+            base = await shop.start()
+            try:
+                async with HttpFetcher() as http:
+                    scraper = ToptenScraper(limit=10, http=http, rate_limiter=HostRateLimiter(0, 0))
+                    scraper.get_category_url = lambda category: f"{base}/list"
+                    products = await scraper.scrape("women-tops")
+                    return products, scraper.metrics.unit_for("TOPTEN", "women-tops"), http.bytes_received
+            finally:
+                await shop.stop()
+
+        products, unit, received = asyncio.run(run())
+        self.assertEqual([p.name for p in products], ["Cool Air T-Shirt", "Oxford Shirt"])
+        self.assertEqual(products[0].product_url, "https://topten.topten10mall.com/product/1")
+        self.assertEqual(unit.bytes, received)
+        self.assertIn("extraction", unit.phases)
+
+    def test_detail_text_for_composition(self):
+        from detail_crawler import DetailCrawler
+        from k_fashion_scrapers import translate_korean_material
+        shop = StandInShop()
+
+        async def run():
+            base = await shop.start()
+            try:
+                async with HttpFetcher() as http:
+                    crawler = DetailCrawler(None, translate=translate_korean_material, fetch_text=http.fetch_text,
+                                            rate_limiter=HostRateLimiter(0, 0))
+                    return await crawler.fetch_composition(f"{base}/product/1")
+            finally:
+                await shop.stop()
+
+        self.assertEqual(asyncio.run(run()), "cotton 100%")
+
+if __name__ == '__main__':
+    unittest.main()
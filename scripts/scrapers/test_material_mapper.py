@@ -27,5 +27,65 @@ class TestMaterialMapper(unittest.TestCase):
         # Mixed valid and invalid
         self.assertEqual(MaterialMapper.parse_composition("100% Cotton, 100% Love"), {"cotton": 100})
 
+    def test_get_blend(self):
+        order = MaterialMapper.PRESET_ORDER
+        blend = MaterialMapper.get_blend("Wool 50%, Polyester 50%")
+        self.assertEqual(len(blend), len(order))
+        self.assertEqual(blend[order.index("wool")], 0.5)
+        self.assertEqual(blend[order.index("synthetic")], 0.5)
+
+        # Same preset accumulates; layered totals are normalized
+        blend = MaterialMapper.get_blend("Shell: 70% Wool, 30% Cashmere. Lining: 100% Polyester")
+        self.assertEqual(blend[order.index("wool")], 0.5)
+        self.assertAlmostEqual(sum(blend), 1.0)
+
+        # No percentages falls back to a one-hot of get_preset
+        self.assertEqual(MaterialMapper.get_blend("Tweed Jacket")[order.index("heavy")], 1.0)
+        self.assertEqual(MaterialMapper.get_blend("")[order.index("cotton")], 1.0)
+
+        # Rounded weights still add up: the largest one absorbs the rounding error
+        blend = MaterialMapper.get_blend("Cotton 1%, Wool 1%, Silk 1%")
+        self.assertEqual(blend[:3], (0.3334, 0.3333, 0.3333))
+        self.assertEqual(round(sum(blend), 4), 1.0)
+
+    def test_blend_many_shares_tuples(self):
+        texts = ["Wool 50%, Polyester 50%", None, "Wool 50%, Polyester 50%"]
+        blends = MaterialMapper.blend_many(texts, workers=1)
+        self.assertEqual(blends, [MaterialMapper.get_blend(t) for t in texts])
+        self.assertIs(blends[0], blends[2])
+        self.assertIsInstance(blends[1], tuple)
+
+    def test_classify_many(self):
+        texts = ["100% Silk", "", None, "Nylon 90%, Wool 10%", "100% Silk", "Tweed Jacket"]
+        expected = [MaterialMapper.get_preset(t) for t in texts]
+        self.assertEqual(MaterialMapper.classify_many(texts, workers=1), expected)
+        # Second call is served from the memo
+        self.assertEqual(MaterialMapper.classify_many(iter(texts), workers=1), expected)
+
+    def test_classify_many_process_pool(self):
+        import material_mapper
+        texts = [f"{n}% Wool, {100 - n}% Nylon" for n in range(100)] * 2
+        original = material_mapper.PARALLEL_MIN_TEXTS
+        material_mapper.PARALLEL_MIN_TEXTS = 10
+        try:
+            result = MaterialMapper.classify_many(texts, workers=2)
+        finally:
+            material_mapper.PARALLEL_MIN_TEXTS = original
+        self.assertEqual(result, [MaterialMapper.get_preset(t) for t in texts])
+
+    def test_matches_legacy_mapper(self):
+        import random
+        from bench_material_mapper import LegacyMaterialMapper, corpus
+
+        rng = random.Random(11)
+        alphabet = list("wool silk 9010%% ,\n\t\u00a0Ka") + ["cotton", "faux leather", "1", "%"]
+        noise = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(2000)]
+        short, pages = corpus()
+
+        for text in noise + short + pages[:10]:
+            expected = LegacyMaterialMapper.parse_composition(text)
+            self.assertEqual(list(MaterialMapper.parse_composition(text).items()), list(expected.items()), repr(text))
+            self.assertEqual(MaterialMapper.get_preset(text), LegacyMaterialMapper.get_preset(text), repr(text))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from metrics import RunMetrics, TransferCounter
+
+class FakeRequest:
+    def __init__(self, body, headers):
+        self.body, self.headers = body, headers
+
+    async def sizes(self):
+        return {"responseBodySize": self.body, "responseHeadersSize": self.headers}
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def remove_listener(self, event, handler):
+        self.handlers.pop(event)
+
+class TestRunMetrics(unittest.TestCase):
+    def test_phases_accumulate_per_unit(self):
+        metrics = RunMetrics("test")
+        with metrics.unit("ZARA", "women-tops") as unit:
+            with metrics.phase("navigation", "ZARA", "women-tops"):
+                pass
+            with metrics.phase("navigation", "ZARA", "women-tops"):
+                pass
+            metrics.add_phase("scroll", 1.5, "ZARA", "women-tops")
+            unit.products = 30
+        metrics.add_phase("save", 0.5)
+
+        summary = metrics.summary()
+        zara = summary["units"][0]
+        self.assertEqual(list(zara["phases"]), ["navigation", "scroll"])
+        self.assertEqual(zara["phases"]["scroll"], 1.5)
+        self.assertEqual(zara["products"], 30)
+        self.assertEqual(summary["phaseSeconds"]["save"], 0.5)
+        self.assertEqual(summary["products"], 30)
+
+    def test_write_json_file(self):
+        metrics = RunMetrics("test")
+        metrics.add_phase("extraction", 0.25, "HM", "women-dresses")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = metrics.write(Path(tmp))
+            data = json.loads(path.read_text())
+        self.assertEqual(data["run"], "test")
+        self.assertEqual(data["units"][0]["brand"], "HM")
+
+    def test_transfer_counter_sums_responses(self):
+        async def run():
+            context = FakeContext()
+            counter = TransferCounter(context)
+            context.handlers["requestfinished"](FakeRequest(1000, 200))
+            context.handlers["requestfinished"](FakeRequest(-1, 100))  # body size unknown
+            total = await counter.total()
+            return total, context.handlers
+
+        total, handlers = asyncio.run(run())
+        self.assertEqual(total, 1300)
+        self.assertNotIn("requestfinished", handlers)
+
+if __name__ == '__main__':
+    unittest.main()
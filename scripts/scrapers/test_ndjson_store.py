@@ -0,0 +1,54 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from ndjson_store import NdjsonWriter, iter_ndjson, compact_ndjson, write_products_document
+
+class TestNdjsonStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_document_matches_json_dump(self):
+        products = [{"id": "a", "name": "Blouse", "sizes": ["S", "M"], "colors": []}, {"id": "b", "name": "Maßanzug"}]
+        output = self.dir / "out.json"
+        write_products_document(output, {"brand": "ZARA", "scrapedAt": "2026-01-01"}, products, len(products))
+
+        expected = json.dumps({"brand": "ZARA", "scrapedAt": "2026-01-01", "count": 2, "products": products},
+                              ensure_ascii=False, indent=2)
+        self.assertEqual(output.read_text(encoding="utf-8"), expected)
+
+    def test_empty_document_matches_json_dump(self):
+        output = self.dir / "out.json"
+        write_products_document(output, {"generatedAt": "now"}, [], 0, count_key="totalCount")
+        self.assertEqual(output.read_text(), json.dumps({"generatedAt": "now", "totalCount": 0, "products": []}, indent=2))
+
+    def test_truncated_line_is_skipped(self):
+        stream = self.dir / "brand.ndjson"
+        with NdjsonWriter(stream) as writer:
+            writer.write([{"id": "a"}, {"id": "b"}])
+        with open(stream, "a") as f:
+            f.write('{"id": "c", "na')
+
+        self.assertEqual([p["id"] for p in iter_ndjson([stream])], ["a", "b"])
+
+    def test_compact_dedupes_keeping_latest(self):
+        first, second = self.dir / "a.ndjson", self.dir / "b.ndjson"
+        with NdjsonWriter(first) as writer:
+            writer.write([{"id": "x", "price": 1}, {"id": "y", "price": 1}])
+        with NdjsonWriter(second) as writer:
+            writer.write([{"id": "x", "price": 2}])
+
+        output = self.dir / "all.json"
+        count = compact_ndjson([first, second, self.dir / "missing.ndjson"], output, {"generatedAt": "now"}, "totalCount")
+
+        doc = json.loads(output.read_text())
+        self.assertEqual(count, 2)
+        self.assertEqual(doc["totalCount"], 2)
+        self.assertEqual(doc["products"], [{"id": "y", "price": 1}, {"id": "x", "price": 2}])
+
+if __name__ == '__main__':
+    unittest.main()
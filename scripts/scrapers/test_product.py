@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from product import Product
+from material_mapper import MaterialMapper
+from luxury_scrapers import FarfetchScraper
+from zara_scraper import ZaraScraper
+
+class TestProduct(unittest.TestCase):
+    def test_round_trips_through_dict(self):
+        product = Product("zara-1", "Linen Shirt", "ZARA", "tops", 29.9, image_url="https://img.test/1.jpg",
+                          product_url="https://www.zara.com/p1", sizes=["S", "M"], colors=["Ecru"])
+        product.apply_composition("Linen 100%")
+        row = product.to_dict()
+
+        self.assertEqual(row["productUrl"], "https://www.zara.com/p1")
+        self.assertEqual(row["source"], "ZARA")
+        self.assertEqual(row["material_blend"], list(MaterialMapper.get_blend("Linen 100%")))
+        self.assertEqual(Product.from_dict(row), product)
+
+    def test_reads_the_old_url_image_shape(self):
+        product = Product.from_dict({
+            "id": "https://www.ssense.com/p/1", "name": "Prada Coat", "brand": "SSENSE", "category": "women-tops",
+            "price": 900, "url": "https://www.ssense.com/p/1", "image": "https://img.test/1.jpg",
+            "composition": "Wool 90%, Cashmere 10%", "source": "SSENSE",
+        })
+        self.assertEqual(product.product_url, "https://www.ssense.com/p/1")
+        self.assertEqual(product.image_url, "https://img.test/1.jpg")
+        self.assertEqual(product.material_blend, MaterialMapper.get_blend("Wool 90%, Cashmere 10%"))
+
+    def test_supabase_row_keeps_table_columns(self):
+        product = Product("zara-1", "Linen Shirt", "ZARA", "tops", 29.9, image_url="https://img.test/1.jpg",
+                          product_url="https://www.zara.com/p1", sizes=["S", "M"])
+        row = product.to_row()
+
+        self.assertEqual(set(row), {"id", "name", "brand", "category", "price", "currency", "url", "image",
+                                    "original_brand", "composition", "texture_type", "source"})
+        self.assertEqual(row["url"], "https://www.zara.com/p1")
+        self.assertEqual(Product.from_dict(row).image_url, "https://img.test/1.jpg")
+
+    def test_blend_shared_per_composition(self):
+        a, b = (Product(str(i), "Coat", "SHOP", "outerwear", 100.0) for i in range(2))
+        for product in (a, b):
+            product.apply_composition("Wool 80%, Nylon 20%")
+        self.assertIs(a.material_blend, b.material_blend)
+        self.assertIs(Product.from_dict(a.to_dict()).material_blend, a.material_blend)
+
+    def test_repeated_values_are_shared(self):
+        a, b = (Product(str(i), "Tee", "".join(["Uni", "qlo"]), "".join(["to", "ps"]), 10.0) for i in range(2))
+        self.assertIs(a.brand, b.brand)
+        self.assertIs(a.category, b.category)
+        self.assertFalse(hasattr(a, "__dict__"))
+
+    def test_scrapers_emit_the_same_shape(self):
+        zara = asyncio.run(ZaraScraper(limit=2, test_mode=True).scrape("women-tops"))
+        farfetch = asyncio.run(FarfetchScraper(limit=2, test_mode=True).scrape("women-tops"))
+
+        self.assertEqual(list(zara[0].to_dict()), list(farfetch[0].to_dict()))
+        self.assertTrue(farfetch[0].is_luxury)
+        # One timestamp per scraped category
+        self.assertTrue(zara[0].scraped_at)
+        self.assertIs(zara[0].scraped_at, zara[1].scraped_at)
+
+if __name__ == '__main__':
+    unittest.main()
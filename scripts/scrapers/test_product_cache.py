@@ -0,0 +1,83 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from product import Product
+from product_cache import ProductCache
+
+def make_product(price=100, composition=""):
+    product = Product(
+        id="https://shop.test/p/1",
+        name="Wool Coat",
+        brand="SHOP",
+        category="outerwear",
+        price=price,
+        product_url="https://shop.test/p/1",
+        scraped_at="2026-01-01T00:00:00",
+    )
+    if composition:
+        product.apply_composition(composition)
+    return product
+
+class TestProductCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ProductCache(Path(self.tmp.name) / "products.sqlite")
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_detail_cache_reused_while_listing_unchanged(self):
+        product = make_product(composition="wool 90%, nylon 10%")
+        self.cache.remember_details([product])
+
+        fresh = make_product()
+        fresh.scraped_at = "2026-01-02T00:00:00"
+        self.assertEqual(self.cache.apply_cached_details([fresh]), [])
+        self.assertEqual(fresh.composition, "wool 90%, nylon 10%")
+        self.assertEqual(fresh.texture_type, "wool")
+
+        # A price change invalidates the cached detail page
+        repriced = make_product(price=80)
+        self.assertEqual(self.cache.apply_cached_details([repriced]), [repriced])
+
+    def test_drops_texture_type_from_old_detail_cache(self):
+        self.cache.close()
+        path = Path(self.tmp.name) / "old.sqlite"
+        conn = sqlite3.connect(str(path))
+        conn.execute("CREATE TABLE details (key TEXT PRIMARY KEY, listing_hash TEXT NOT NULL, "
+                     "composition TEXT NOT NULL, texture_type TEXT NOT NULL, fetched_at TEXT NOT NULL)")
+        conn.execute("INSERT INTO details VALUES (?, ?, ?, ?, ?)", (
+            "https://shop.test/p/1", ProductCache.listing_hash(make_product()), "silk 100%", "cotton", "2026-01-01"
+        ))
+        conn.commit()
+        conn.close()
+
+        self.cache = ProductCache(path)
+        fresh = make_product()
+        self.assertEqual(self.cache.apply_cached_details([fresh]), [])
+        self.assertEqual(fresh.texture_type, "silk")
+        self.cache.remember_details([make_product(composition="wool 100%")])
+
+    def test_changed_only_reports_delta(self):
+        product = make_product()
+        self.assertEqual(self.cache.changed([product]), [product])
+
+        self.cache.record([product])
+        rescraped = make_product()
+        rescraped.scraped_at = "2026-01-02T00:00:00"
+        self.assertEqual(self.cache.changed([rescraped]), [])
+
+        repriced = make_product(price=80)
+        self.assertEqual(self.cache.changed([repriced]), [repriced])
+
+    def test_persists_across_instances(self):
+        self.cache.record([make_product()])
+        self.cache.close()
+
+        self.cache = ProductCache(Path(self.tmp.name) / "products.sqlite")
+        self.assertEqual(self.cache.changed([make_product()]), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import tempfile
+import unittest
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from scheduler import HostRateLimiter
+from snapshots import Snapshot, SnapshotStore, comparable, serve_snapshot
+
+ZARA_PAYLOAD = {"productGroups": [{"elements": [{"commercialComponents": [{
+    "id": 42, "name": "Linen Shirt", "price": 5990000,
+    "seo": {"keyword": "linen-shirt", "seoProductId": "0123"},
+}]}]}]}
+
+class FakeRequest:
+    def __init__(self, resource_type):
+        self.resource_type = resource_type
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = FakeRequest(resource_type)
+        self.fulfilled = None
+        self.aborted = False
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def abort(self):
+        self.aborted = True
+
+class FakeContext:
+    def on(self, event, handler):
+        pass
+
+    def remove_listener(self, event, handler):
+        pass
+
+class FakeReplayPage:
+    def __init__(self):
+        self.context = FakeContext()
+        self.handler = None
+        self.document = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    async def goto(self, url, **kwargs):
+        route = FakeRoute("document")
+        await self.handler(route)
+        self.document = route.fulfilled["body"]
+
+    async def wait_for_selector(self, selector, **kwargs):
+        pass
+
+class FakePool:
+    def __init__(self):
+        self.pages = []
+
+    @asynccontextmanager
+    async def page(self):
+        page = FakeReplayPage()
+        self.pages.append(page)
+        yield page
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(Path(self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        snapshot = Snapshot("ZARA", "women-tops", "https://www.zara.com/x", "<html></html>",
+                            payloads=[ZARA_PAYLOAD], expected=[{"id": "a", "scrapedAt": "now"}])
+        self.store.save(snapshot)
+
+        self.assertTrue(self.store.has("ZARA", "women-tops"))
+        self.assertEqual(self.store.available(), [("zara", "women-tops")])
+        loaded = self.store.load("ZARA", "women-tops")
+        self.assertEqual(loaded.payloads, [ZARA_PAYLOAD])
+        self.assertEqual(comparable(loaded.expected), [{"id": "a"}])
+
+    def test_serve_strips_scripts_and_blocks_network(self):
+        async def run():
+            page = FakeReplayPage()
+            await serve_snapshot(page, Snapshot("A", "b", "https://a.test", '<div class="tile"></div><script src="app.js"></script>'))
+            await page.goto("https://a.test")
+            image = FakeRoute("image")
+            await page.handler(image)
+            return page.document, image.aborted
+
+        document, aborted = asyncio.run(run())
+        self.assertEqual(document, '<div class="tile"></div>')
+        self.assertTrue(aborted)
+
+    def test_replay_reads_recorded_api_payloads(self):
+        from zara_scraper import ZaraScraper
+
+        recorded = ZaraScraper().parse_api_payload(ZARA_PAYLOAD, "women-tops")
+        self.store.save(Snapshot("ZARA", "women-tops", "https://www.zara.com/kr/ko/woman-shirts-l1217.html",
+                                 "<html></html>", payloads=[ZARA_PAYLOAD], expected=[p.to_dict() for p in recorded]))
+
+        pool = FakePool()
+        scraper = ZaraScraper(limit=5, pool=pool, replay_from=self.store, rate_limiter=HostRateLimiter(0, 0))
+        products = asyncio.run(scraper.scrape("women-tops"))
+
+        self.assertEqual(comparable([p.to_dict() for p in products]), comparable([p.to_dict() for p in recorded]))
+        self.assertEqual(pool.pages[0].document, "<html></html>")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+from aiohttp import web
+from supabase_sync import SupabaseSyncer
+
+class StandInPostgrest:
+    """
+    Local stand-in for the Supabase REST endpoint; rejects batches containing
+    a bad row, and answers the first `outages` requests with `outage_status`
+    (and PostgREST error `outage_code`, if given).
+    """
+
+    def __init__(self, outages=0, outage_status=503, outage_code=None):
+        self.rows = {}
+        self.requests = 0
+        self.headers = None
+        self.outages = outages
+        self.outage_status = outage_status
+        self.outage_code = outage_code
+
+    async def upsert(self, request):
+        self.requests += 1
+        self.headers = request.headers
+        rows = await request.json()
+        if self.requests <= self.outages:
+            return web.json_response({"code": self.outage_code, "message": "unavailable"}, status=self.outage_status)
+        if any(row.get("bad") for row in rows):
+            return web.json_response({"message": "invalid input"}, status=400)
+        for row in rows:
+            self.rows[row["id"]] = row
+        return web.Response(status=201)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/rest/v1/products", self.upsert)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+class TestSupabaseSyncer(unittest.TestCase):
+    def run_sync(self, rows, server=None, **kwargs):
+        server = server or StandInPostgrest()
+        kwargs.setdefault("retry_delay", 0)
+
+        async def run():
+            url = await server.start()
+            try:
+                return await SupabaseSyncer(url, "service-key", **kwargs).sync(rows)
+            finally:
+                await server.stop()
+
+        return server, asyncio.run(run())
+
+    def test_upserts_in_concurrent_batches(self):
+        rows = [{"id": f"p-{i}", "price": i} for i in range(25)]
+        server, report = self.run_sync(rows, batch_size=10, concurrency=3)
+
+        self.assertEqual(len(server.rows), 25)
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(len(report.batch_latencies), 3)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(server.headers["apikey"], "service-key")
+        self.assertIn("merge-duplicates", server.headers["Prefer"])
+
+    def test_rejected_batch_bisected_to_bad_row(self):
+        rows = [{"id": f"p-{i}", "bad": i == 3} for i in range(10)]
+        server, report = self.run_sync(rows, batch_size=5)
+
+        self.assertEqual([r["id"] for r in report.failed], ["p-3"])
+        self.assertEqual(len(report.synced), 9)
+        self.assertEqual(len(server.rows), 9)
+        # 2 batches, then [0 1] [2 3 4] [2] [3 4] [3] [4] for the rejected one
+        self.assertEqual(server.requests, 8)
+
+    def test_unavailable_backend_retried_whole_batch(self):
+        rows = [{"id": f"p-{i}"} for i in range(10)]
+        server, report = self.run_sync(rows, StandInPostgrest(outages=2), batch_size=10, retries=3)
+        self.assertEqual(len(report.synced), 10)
+        self.assertEqual(server.requests, 3)
+
+        # Still down after every retry: the batch fails without being split
+        server, report = self.run_sync(rows, StandInPostgrest(outages=100), batch_size=10, retries=2)
+        self.assertEqual(len(report.failed), 10)
+        self.assertEqual(server.requests, 3)
+        self.assertIsNone(report.aborted)
+
+    def test_rejected_key_stops_the_sync(self):
+        rows = [{"id": f"p-{i}"} for i in range(30)]
+        server, report = self.run_sync(rows, StandInPostgrest(outages=100, outage_status=401),
+                                       batch_size=10, concurrency=1)
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(len(report.failed), 30)
+        self.assertIn("HTTP 401", report.aborted)
+
+    def test_schema_error_costs_one_request(self):
+        rows = [{"id": f"p-{i}"} for i in range(30)]
+        server, report = self.run_sync(rows, StandInPostgrest(outages=100, outage_status=400, outage_code="PGRST204"),
+                                       batch_size=10, concurrency=1)
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(len(report.failed), 30)
+        self.assertIn("PGRST204", report.aborted)
+
+        server, report = self.run_sync(rows, StandInPostgrest(outages=100, outage_status=404, outage_code="PGRST205"),
+                                       batch_size=10, concurrency=1)
+        self.assertEqual(server.requests, 1)
+
+    def test_same_error_in_both_halves_stops_the_sync(self):
+        rows = [{"id": f"p-{i}"} for i in range(30)]
+        server, report = self.run_sync(rows, StandInPostgrest(outages=100, outage_status=400),
+                                       batch_size=10, concurrency=1)
+        # The batch and its two halves, instead of bisecting every batch to single rows
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(len(report.failed), 30)
+        self.assertIn("HTTP 400", report.aborted)
+
+    def test_duplicate_ids_collapsed(self):
+        rows = [{"id": "p-1", "price": 1}, {"id": "p-1", "price": 2}]
+        server, report = self.run_sync(rows)
+        self.assertEqual(len(report.synced), 1)
+        self.assertEqual(server.rows["p-1"]["price"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
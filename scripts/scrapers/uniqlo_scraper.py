@@ -5,58 +5,60 @@ Uniqlo Product Scraper
 
 import asyncio
 import argparse
-from datetime import datetime
 from typing import List, Dict, Optional, Any
-from playwright.async_api import Page
 from base_scraper import BaseScraper
 from config import BRAND_URLS
+from product import Product
 
 class UniqloScraper(BaseScraper):
-    def __init__(self, limit: int = 50, test_mode: bool = False):
-        super().__init__("Uniqlo", limit, test_mode)
+    # Product listings come from the commerce API, paged while scrolling
+    API_PATTERNS = [r"uniqlo\.com/kr/api/commerce/v\d+/\w+/products\?"]
+
+    def __init__(self, limit: int = 50, test_mode: bool = False, **kwargs):
+        super().__init__("Uniqlo", limit, test_mode, **kwargs)
 
     def get_category_url(self, category: str) -> Optional[str]:
         return BRAND_URLS["UNIQLO"].get(category)
 
-    async def _extract_products(self, page: Page, category: str):
-        product_elements = await page.query_selector_all("[data-test='product-tile']")
-        
-        for i, element in enumerate(product_elements[:self.limit]):
-            try:
-                name_el = await element.query_selector("[data-test='product-tile-name']")
-                price_el = await element.query_selector("[data-test='product-tile-price']")
-                link_el = await element.query_selector("a")
-                img_el = await element.query_selector("img")
-
-                if not name_el: continue
+    def parse_api_payload(self, payload: Any, category: str) -> List[Product]:
+        products = []
 
-                name = await name_el.inner_text()
-                price_text = await price_el.inner_text() if price_el else "0"
-                link = await link_el.get_attribute("href") if link_el else ""
-                image_url = await img_el.get_attribute("src") if img_el else ""
+        for item in payload.get("result", {}).get("items", []):
+            prices = item.get("prices", {})
+            price = (prices.get("promo") or prices.get("base") or {}).get("value")
+            if not item.get("productId") or not item.get("name") or price is None:
+                continue
 
-                self.products.append({
-                    "id": f"uniqlo-{category}-{i+1}",
-                    "name": name.strip(),
-                    "brand": "Uniqlo",
-                    "category": self.map_category(category),
-                    "price": self.normalize_price(price_text, "KRW"),
-                    "currency": "USD",
-                    "imageUrl": image_url,
-                    "productUrl": link if link.startswith("http") else f"https://www.uniqlo.com{link}",
-                    "sizes": ["XS", "S", "M", "L", "XL", "XXL"],
-                    "colors": [],
-                    "isLuxury": False,
-                    "scrapedAt": datetime.now().isoformat(),
-                })
+            main_images = item.get("images", {}).get("main", {})
+            image_url = next((img.get("image", "") for img in main_images.values()), "") if isinstance(main_images, dict) else ""
 
-                print(f"   ✅ {i+1}. {name[:30]}...")
+            products.append(Product(
+                id=f"uniqlo-{item['productId']}",
+                name=item["name"].strip(),
+                brand="Uniqlo",
+                category=self.map_category(category),
+                price=self.normalize_price(str(price), "KRW"),
+                image_url=image_url,
+                product_url=f"https://www.uniqlo.com/kr/ko/products/{item['productId']}",
+                sizes=[s["name"] for s in item.get("sizes", []) if s.get("name")] or ["XS", "S", "M", "L", "XL", "XXL"],
+                colors=[c["name"] for c in item.get("colors", []) if c.get("name")],
+            ))
+        return products
 
-            except Exception as e:
-                print(f"   ❌ Error scraping product {i+1}: {e}")
-                continue
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        link = card["link"] or ""
+        return Product(
+            id=f"uniqlo-{category}-{index+1}",
+            name=card["name"].strip(),
+            brand="Uniqlo",
+            category=self.map_category(category),
+            price=self.normalize_price(card["price"] or "0", "KRW"),
+            image_url=card["image"] or "",
+            product_url=link if link.startswith("http") else f"https://www.uniqlo.com{link}",
+            sizes=["XS", "S", "M", "L", "XL", "XXL"],
+        )
 
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         cat = self.map_category(category)
         mock_names = {
             "tops": ["Airism Cotton Tee", "Supima Cotton Shirt", "U Crew Neck Tee", "Linen Blend Shirt", "Heattech Crew Neck"],
@@ -70,20 +72,17 @@ class UniqloScraper(BaseScraper):
 
         for i in range(limit):
             idx = i % len(names)
-            products.append({
-                "id": f"uniqlo-{category}-{i+1}",
-                "name": f"{names[idx]}",
-                "brand": "Uniqlo",
-                "category": cat,
-                "price": round(19.9 + (i * 5), 2),
-                "currency": "USD",
-                "imageUrl": f"https://placehold.co/600x800?text=UNIQLO+{cat}+{i+1}",
-                "productUrl": f"https://www.uniqlo.com/mock-{i+1}",
-                "sizes": ["XS", "S", "M", "L", "XL"],
-                "colors": ["Black", "White", "Gray"],
-                "isLuxury": False,
-                "scrapedAt": datetime.now().isoformat(),
-            })
+            products.append(Product(
+                id=f"uniqlo-{category}-{i+1}",
+                name=f"{names[idx]}",
+                brand="Uniqlo",
+                category=cat,
+                price=round(19.9 + (i * 5), 2),
+                image_url=f"https://placehold.co/600x800?text=UNIQLO+{cat}+{i+1}",
+                product_url=f"https://www.uniqlo.com/mock-{i+1}",
+                sizes=["XS", "S", "M", "L", "XL"],
+                colors=["Black", "White", "Gray"],
+            ))
         return products
 
 async def main():
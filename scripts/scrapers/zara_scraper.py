@@ -5,65 +5,76 @@ ZARA Product Scraper
 
 import asyncio
 import argparse
-from datetime import datetime
 from typing import List, Dict, Optional, Any
-from playwright.async_api import Page
 from base_scraper import BaseScraper
 from config import BRAND_URLS
+from product import Product
 
 class ZaraScraper(BaseScraper):
-    def __init__(self, limit: int = 50, test_mode: bool = False):
-        super().__init__("ZARA", limit, test_mode)
+    # Category grids are filled from /category/<id>/products?ajax=true
+    API_PATTERNS = [r"zara\.com/.+/category/\d+/products"]
+
+    def __init__(self, limit: int = 50, test_mode: bool = False, **kwargs):
+        super().__init__("ZARA", limit, test_mode, **kwargs)
 
     def get_category_url(self, category: str) -> Optional[str]:
         return BRAND_URLS["ZARA"].get(category)
 
-    async def _extract_products(self, page: Page, category: str):
-        # Specific ZARA selectors
-        product_elements = await page.query_selector_all(".product-grid-product")
-        
-        for i, element in enumerate(product_elements[:self.limit]):
-            try:
-                name_el = await element.query_selector(".product-grid-product-info__name")
-                price_el = await element.query_selector(".money-amount__main")
-                link_el = await element.query_selector("a.product-link")
-                img_el = await element.query_selector("img.media-image__image")
-
-                if not name_el: continue
+    def parse_api_payload(self, payload: Any, category: str) -> List[Product]:
+        products = []
 
-                name = await name_el.inner_text()
-                price_text = await price_el.inner_text() if price_el else "0"
-                link = await link_el.get_attribute("href") if link_el else ""
-                image_url = await img_el.get_attribute("src") if img_el else ""
+        for group in payload.get("productGroups", []):
+            for element in group.get("elements", []):
+                for item in element.get("commercialComponents", []):
+                    if not item.get("name") or item.get("price") is None:
+                        continue
 
-                # ZARA image lazy loading handling
-                if not image_url or "data:image" in image_url:
-                    # try to get from srcset or other attributes if needed,
-                    # but usually scroll handles it. fallback:
-                    pass
+                    seo = item.get("seo", {})
+                    product_url = ""
+                    if seo.get("keyword") and seo.get("seoProductId"):
+                        product_url = f"https://www.zara.com/kr/ko/{seo['keyword']}-p{seo['seoProductId']}.html"
 
-                self.products.append({
-                    "id": f"zara-{category}-{i+1}",
-                    "name": name.strip(),
-                    "brand": "ZARA",
-                    "category": self.map_category(category),
-                    "price": self.normalize_price(price_text, "KRW"),
-                    "currency": "USD",
-                    "imageUrl": image_url,
-                    "productUrl": f"https://www.zara.com{link}" if link and not link.startswith("http") else link,
-                    "sizes": ["XS", "S", "M", "L", "XL"],
-                    "colors": [],
-                    "isLuxury": False,
-                    "scrapedAt": datetime.now().isoformat(),
-                })
+                    colors = item.get("detail", {}).get("colors", [])
+                    products.append(Product(
+                        id=f"zara-{item['id']}",
+                        name=item["name"].strip(),
+                        brand="ZARA",
+                        category=self.map_category(category),
+                        # API prices are in minor units (x100)
+                        price=self.normalize_price(str(item["price"] / 100), "KRW"),
+                        image_url=self._api_image_url(item, colors),
+                        product_url=product_url,
+                        sizes=["XS", "S", "M", "L", "XL"],
+                        colors=[c["name"] for c in colors if c.get("name")],
+                    ))
+        return products
 
-                print(f"   ✅ {i+1}. {name[:30]}...")
+    @staticmethod
+    def _api_image_url(item: Dict[str, Any], colors: List[Dict[str, Any]]) -> str:
+        media = item.get("xmedia") or (colors[0].get("xmedia") if colors else None) or []
+        if not media:
+            return ""
+        first = media[0]
+        if first.get("url"):
+            return first["url"].replace("{width}", "750")
+        if first.get("path") and first.get("name"):
+            return f"https://static.zara.net/photos//{first['path']}/w/750/{first['name']}.jpg?ts={first.get('timestamp', '')}"
+        return ""
 
-            except Exception as e:
-                print(f"   ❌ Error scraping product {i+1}: {e}")
-                continue
+    def _parse_card(self, card: Dict[str, Optional[str]], category: str, index: int) -> Optional[Product]:
+        link = card["link"] or ""
+        return Product(
+            id=f"zara-{category}-{index+1}",
+            name=card["name"].strip(),
+            brand="ZARA",
+            category=self.map_category(category),
+            price=self.normalize_price(card["price"] or "0", "KRW"),
+            image_url=card["image"] or "",
+            product_url=f"https://www.zara.com{link}" if link and not link.startswith("http") else link,
+            sizes=["XS", "S", "M", "L", "XL"],
+        )
 
-    def generate_mock_products(self, category: str, limit: int) -> List[Dict[str, Any]]:
+    def generate_mock_products(self, category: str, limit: int) -> List[Product]:
         cat = self.map_category(category)
         mock_names = {
             "tops": ["Oversized Shirt", "Cropped Blouse", "Knit Top", "Linen Shirt", "Satin Blouse"],
@@ -77,20 +88,17 @@ class ZaraScraper(BaseScraper):
 
         for i in range(limit):
             idx = i % len(names)
-            products.append({
-                "id": f"zara-{category}-{i+1}",
-                "name": f"{names[idx]}",
-                "brand": "ZARA",
-                "category": cat,
-                "price": round(29.9 + (i * 10), 2),
-                "currency": "USD",
-                "imageUrl": f"https://placehold.co/600x800?text=ZARA+{cat}+{i+1}",
-                "productUrl": f"https://www.zara.com/mock-{i+1}",
-                "sizes": ["XS", "S", "M", "L", "XL"],
-                "colors": ["Black", "White", "Navy"],
-                "isLuxury": False,
-                "scrapedAt": datetime.now().isoformat(),
-            })
+            products.append(Product(
+                id=f"zara-{category}-{i+1}",
+                name=f"{names[idx]}",
+                brand="ZARA",
+                category=cat,
+                price=round(29.9 + (i * 10), 2),
+                image_url=f"https://placehold.co/600x800?text=ZARA+{cat}+{i+1}",
+                product_url=f"https://www.zara.com/mock-{i+1}",
+                sizes=["XS", "S", "M", "L", "XL"],
+                colors=["Black", "White", "Navy"],
+            ))
         return products
 
 async def main():
@@ -0,0 +1,232 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+import texture_upscaler
+from bench_texture_upscaler import legacy_displacement_map, legacy_normal_map
+from texture_upscaler import (DENOISE_TIERS, TextureCache, TextureUpscaler, batch_process, collect_inputs,
+                              output_paths, process_image)
+
+def write_image(path, seed=0, size=(24, 32)):
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cv2.imwrite(path, rng.integers(0, 256, size=(*size, 3), dtype=np.uint8))
+    return path
+
+_process_image = texture_upscaler.process_image
+
+def die_on_poison(upscaler, image_path, *args, **kwargs):
+    """process_image stand-in whose worker process dies like an OOM kill on "poison" images"""
+    if "poison" in os.path.basename(image_path):
+        os._exit(137)
+    return _process_image(upscaler, image_path, *args, **kwargs)
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collects_directory_without_previous_outputs(self):
+        a = write_image(os.path.join(self.dir, "a.png"))
+        os.makedirs(os.path.join(self.dir, "sub"))
+        b = write_image(os.path.join(self.dir, "sub", "b.jpg"))
+        write_image(os.path.join(self.dir, "a_4k.png"))
+        with open(os.path.join(self.dir, "notes.txt"), "w") as f:
+            f.write("not an image")
+
+        self.assertEqual(collect_inputs(self.dir), sorted([a, b]))
+
+    def test_collects_manifest_relative_to_its_directory(self):
+        manifest = os.path.join(self.dir, "batch.txt")
+        with open(manifest, "w") as f:
+            f.write("# nightly\nimages/a.png\n\nimages/b.png\n")
+        self.assertEqual(collect_inputs(manifest),
+                         [os.path.join(self.dir, "images", "a.png"), os.path.join(self.dir, "images", "b.png")])
+
+    def test_processes_once_then_skips_up_to_date_outputs(self):
+        images = [write_image(os.path.join(self.dir, f"{i}.png"), seed=i) for i in range(3)]
+        out_dir = os.path.join(self.dir, "out")
+
+        report = batch_process(images, out_dir, workers=2)
+        self.assertEqual(sorted(report["processed"]), images)
+        self.assertEqual(report["failed"], {})
+        diffuse = cv2.imread(output_paths(images[0], out_dir)["diffuse"])
+        self.assertEqual(diffuse.shape, (96, 128, 3))
+        self.assertEqual(cv2.imread(output_paths(images[0], out_dir)["disp"], cv2.IMREAD_UNCHANGED).ndim, 2)
+
+        again = batch_process(images, out_dir, workers=2)
+        self.assertEqual(again["processed"], [])
+        self.assertEqual(again["skipped"], images)
+
+        # A source newer than its outputs is processed again
+        stamp = os.path.getmtime(images[1]) + 10
+        os.utime(images[1], (stamp, stamp))
+        self.assertEqual(batch_process(images, out_dir, workers=2)["processed"], [images[1]])
+
+    def test_same_name_in_different_folders(self):
+        images = [write_image(os.path.join(self.dir, "in", sub, "image.png"), seed=i)
+                  for i, sub in enumerate(("a", "b"))]
+        out_dir = os.path.join(self.dir, "out")
+
+        report = batch_process(images, out_dir, workers=2)
+        self.assertEqual(sorted(report["processed"]), images)
+        for image, sub in zip(images, ("a", "b")):
+            diffuse = os.path.join(out_dir, sub, "image_4k.png")
+            self.assertEqual(output_paths(image, out_dir, os.path.join(self.dir, "in"))["diffuse"], diffuse)
+            np.testing.assert_array_equal(cv2.imread(diffuse), TextureUpscaler().upscale(cv2.imread(image)))
+
+        # Listed twice in a manifest: processed once
+        self.assertEqual(batch_process(images + images[:1], out_dir, force=True, workers=1)["processed"], images)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "workers must inherit the patch")
+    def test_worker_death_fails_only_the_culprit(self):
+        images = [write_image(os.path.join(self.dir, f"{name}.png"), seed=i)
+                  for i, name in enumerate(("a", "b", "poison", "c", "d"))]
+        # Workers are forked, so they inherit the patched function
+        with mock.patch.object(texture_upscaler, "process_image", die_on_poison):
+            report = batch_process(images, os.path.join(self.dir, "out"), workers=2)
+
+        self.assertEqual(list(report["failed"]), [images[2]])
+        self.assertEqual(sorted(report["processed"]), sorted(images[:2] + images[3:]))
+
+    def test_reports_unreadable_images(self):
+        broken = os.path.join(self.dir, "broken.png")
+        with open(broken, "wb") as f:
+            f.write(b"not a png")
+        report = batch_process([broken], workers=1)
+        self.assertIn(broken, report["failed"])
+
+class TestDenoiseTiers(unittest.TestCase):
+    def test_tiers_keep_shape_and_differ(self):
+        img = cv2.GaussianBlur(np.random.default_rng(2).integers(0, 256, size=(40, 30, 3), dtype=np.uint8), (3, 3), 0)
+        outputs = {d: TextureUpscaler(denoise=d)._upscale_fallback(img, 4) for d in DENOISE_TIERS}
+        for denoise, out in outputs.items():
+            self.assertEqual(out.shape, (160, 120, 3), denoise)
+        self.assertFalse(np.array_equal(outputs["fast"], outputs["none"]))
+        self.assertFalse(np.array_equal(outputs["balanced"], outputs["fast"]))
+
+    def test_rejects_unknown_tier(self):
+        with self.assertRaises(ValueError):
+            TextureUpscaler(denoise="ultra")
+
+class TestTiledUpscale(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.img = cv2.GaussianBlur(rng.integers(0, 256, size=(70, 90, 3), dtype=np.uint8), (5, 5), 0)
+
+    def test_tiles_match_whole_image(self):
+        for denoise in DENOISE_TIERS:
+            whole = TextureUpscaler(tile_size=None, denoise=denoise)._upscale_fallback(self.img, 4)
+            for tile in (16, 25, 64):
+                tiled = TextureUpscaler(tile_size=tile, denoise=denoise)._upscale_fallback(self.img, 4)
+                np.testing.assert_array_equal(tiled, whole, err_msg=f"denoise={denoise}, tile_size={tile}")
+
+        gray = cv2.cvtColor(self.img, cv2.COLOR_BGR2GRAY)
+        np.testing.assert_array_equal(TextureUpscaler(tile_size=16)._upscale_fallback(gray, 2),
+                                      TextureUpscaler(tile_size=None)._upscale_fallback(gray, 2))
+
+    def test_memmap_output(self):
+        with tempfile.TemporaryDirectory() as scratch:
+            out = TextureUpscaler(tile_size=32, memmap_dir=scratch)._upscale_fallback(self.img, 4)
+            self.assertIsInstance(out, np.memmap)
+            self.assertEqual(os.listdir(scratch), [])
+            np.testing.assert_array_equal(out, TextureUpscaler(tile_size=None)._upscale_fallback(self.img, 4))
+
+class TestGenerateMaps(unittest.TestCase):
+    def test_matches_separate_map_functions(self):
+        rng = np.random.default_rng(3)
+        img = cv2.GaussianBlur(rng.integers(0, 256, size=(75, 61, 3), dtype=np.uint8), (3, 3), 0)
+        upscaler = TextureUpscaler()
+
+        for strip_rows in (256, 7, 1):
+            with mock.patch.object(texture_upscaler, "MAP_STRIP_ROWS", strip_rows):
+                maps = upscaler.generate_maps(img)
+            self.assertIs(maps["diffuse"], img)
+            np.testing.assert_array_equal(maps["normal"], legacy_normal_map(img), err_msg=f"strip_rows={strip_rows}")
+            np.testing.assert_array_equal(maps["disp"], legacy_displacement_map(img))
+
+    def test_memmap_backed_maps(self):
+        img = cv2.GaussianBlur(np.random.default_rng(5).integers(0, 256, size=(48, 40, 3), dtype=np.uint8), (3, 3), 0)
+        expected = TextureUpscaler().generate_maps(img)
+        with tempfile.TemporaryDirectory() as scratch:
+            maps = TextureUpscaler(memmap_dir=scratch).generate_maps(img)
+            for kind in ("normal", "disp"):
+                self.assertIsInstance(maps[kind], np.memmap, kind)
+                np.testing.assert_array_equal(maps[kind], expected[kind], err_msg=kind)
+            self.assertEqual(os.listdir(scratch), [])
+
+    def test_grayscale_and_alpha_inputs(self):
+        gray = np.random.default_rng(4).integers(0, 256, size=(20, 30), dtype=np.uint8)
+        maps = TextureUpscaler().generate_maps(gray)
+        np.testing.assert_array_equal(maps["normal"], legacy_normal_map(gray))
+
+        bgra = cv2.cvtColor(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), cv2.COLOR_BGR2BGRA)
+        np.testing.assert_array_equal(TextureUpscaler().generate_maps(bgra)["disp"], legacy_displacement_map(gray))
+
+class TestTextureCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.cache = TextureCache(os.path.join(self.dir, "cache"))
+        self.upscaler = TextureUpscaler()
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def read_outputs(self, image_path):
+        return {kind: cv2.imread(path, cv2.IMREAD_UNCHANGED) for kind, path in output_paths(image_path).items()}
+
+    def test_duplicate_image_is_restored_from_cache(self):
+        a = write_image(os.path.join(self.dir, "a.png"))
+        b = write_image(os.path.join(self.dir, "b.png"))
+
+        self.assertFalse(process_image(self.upscaler, a, verbose=False, cache=self.cache))
+        with mock.patch.object(TextureUpscaler, "upscale", side_effect=AssertionError("recomputed")):
+            self.assertTrue(process_image(self.upscaler, b, verbose=False, cache=self.cache))
+        for kind, img in self.read_outputs(a).items():
+            np.testing.assert_array_equal(self.read_outputs(b)[kind], img, err_msg=kind)
+
+    def test_key_covers_pixels_and_parameters(self):
+        img = np.random.default_rng(5).integers(0, 256, size=(24, 32, 3), dtype=np.uint8)
+        # Same pixels, different encoding
+        _, encoded = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, 0])
+        key = TextureCache.key(img, self.upscaler, 4, ".png")
+
+        self.assertEqual(TextureCache.key(cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED), self.upscaler, 4, ".png"), key)
+        self.assertNotEqual(TextureCache.key(img, TextureUpscaler(denoise="fast"), 4, ".png"), key)
+        self.assertNotEqual(TextureCache.key(img, self.upscaler, 2, ".png"), key)
+        self.assertNotEqual(TextureCache.key(img[::-1], self.upscaler, 4, ".png"), key)
+
+    def test_evicts_least_recently_used(self):
+        images = [write_image(os.path.join(self.dir, f"{i}.png"), seed=i) for i in range(3)]
+        process_image(self.upscaler, images[0], verbose=False, cache=self.cache)
+        entry_size = self.cache.size()
+        # Room for two entries (random images of one size compress about equally)
+        self.cache.max_bytes = int(entry_size * 2.5)
+
+        process_image(self.upscaler, images[1], verbose=False, cache=self.cache)
+        # Touch the first entry so the second one is now the oldest
+        self.assertTrue(process_image(self.upscaler, images[0], verbose=False, cache=self.cache))
+        process_image(self.upscaler, images[2], verbose=False, cache=self.cache)
+
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+        self.assertTrue(process_image(self.upscaler, images[0], verbose=False, cache=self.cache))
+        self.assertFalse(process_image(self.upscaler, images[1], verbose=False, cache=self.cache))
+
+    def test_batch_reports_cache_hits(self):
+        images = [write_image(os.path.join(self.dir, name)) for name in ("a.png", "b.png")]
+        report = batch_process(images, os.path.join(self.dir, "out"), workers=1,
+                               cache_options={"directory": self.cache.directory})
+        self.assertEqual(report["cached"], [images[1]])
+
+if __name__ == '__main__':
+    unittest.main()
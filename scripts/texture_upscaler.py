@@ -1,11 +1,72 @@
 import os
 import sys
+import time
 import cv2
 import numpy as np
 import argparse
+import tempfile
+import hashlib
+import shutil
+import sqlite3
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+# Suffixes of files written by this script; never treated as inputs
+OUTPUT_SUFFIXES = ("_4k", "_normal", "_disp")
+
+# Images larger than this (source pixels per side) are upscaled tile by tile,
+# so intermediates stay around tile_size * scale squared regardless of input size
+TILE_SIZE = 512
+
+SHARPEN_KERNEL = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
+# Source pixels the bicubic kernel reaches beyond a tile
+BICUBIC_REACH = 2
+# NL-means search window (21) plus template (7) radius
+NLM_REACH = 21 // 2 + 7 // 2
+
+# Denoise tiers, from slowest to fastest (see bench_texture_upscaler.py):
+#   best     - NL-means on the sharpened, upscaled image (hero items)
+#   balanced - bilateral filter at source resolution and again after sharpening
+#   fast     - bilateral filter at source resolution only (bulk catalog ingest)
+#   none     - bicubic + sharpen
+# Each maps to how far its filters reach: (source pixels before the resize,
+# output pixels after it, including the 3x3 sharpening kernel). Tile halos are
+# derived from it.
+DENOISE_TIERS = {
+    "best": (0, NLM_REACH + 1),
+    "balanced": (2, 2 + 1),
+    "fast": (2, 1),
+    "none": (0, 1),
+}
+DEFAULT_DENOISE = "best"
+
+# Z component of normal map vectors; lower = bumpier surface
+NORMAL_STRENGTH = 5.0
+# Rows per strip when building normal maps
+MAP_STRIP_ROWS = 256
+
+# Retries of an image that was running when a batch worker died
+POOL_CRASH_RETRIES = 1
+
+# Content-addressed cache of finished outputs, shared by every run
+TEXTURE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "cache", "textures")
+TEXTURE_CACHE_MAX_BYTES = 5 * 1024 ** 3
+# Bump when the upscaling or map algorithms change output, to invalidate old entries
+TEXTURE_CACHE_VERSION = 1
 
 class TextureUpscaler:
-    def __init__(self):
+    def __init__(self, tile_size=TILE_SIZE, memmap_dir=None, denoise=DEFAULT_DENOISE):
+        # tile_size=None upscales in one shot. With memmap_dir, the upscaled
+        # image and the full-size grayscale, normal and displacement maps are
+        # written through memory-mapped scratch files in that directory
+        # instead of being held in RAM.
+        if denoise not in DENOISE_TIERS:
+            raise ValueError(f"Unknown denoise tier {denoise!r}, expected one of {', '.join(DENOISE_TIERS)}")
+        self.denoise = denoise
+        self.tile_size = tile_size
+        self.memmap_dir = memmap_dir
         self.use_realesrgan = False
         try:
             # Attempt import to check if available, but for this sandbox env
@@ -23,7 +84,9 @@ class TextureUpscaler:
         img = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
         if img is None:
             raise FileNotFoundError(f"Image not found at {image_path}")
+        return self.upscale(img, scale)
 
+    def upscale(self, img, scale=4):
         if self.use_realesrgan:
             try:
                 # Placeholder for actual Real-ESRGAN implementation
@@ -37,119 +100,485 @@ class TextureUpscaler:
         else:
             return self._upscale_fallback(img, scale)
 
+    def _allocate_output(self, shape, dtype):
+        if not self.memmap_dir:
+            return np.empty(shape, dtype)
+        os.makedirs(self.memmap_dir, exist_ok=True)
+        # The scratch file is unlinked right away; the mapping keeps it alive
+        with tempfile.TemporaryFile(dir=self.memmap_dir) as scratch:
+            return np.memmap(scratch, dtype=dtype, mode="w+", shape=shape)
+
     def _upscale_fallback(self, img, scale):
         h, w = img.shape[:2]
+        out = self._allocate_output((h * scale, w * scale) + img.shape[2:], img.dtype)
+
+        tile = self.tile_size
+        if not tile or (h <= tile and w <= tile):
+            out[...] = self._upscale_tile(img, scale)
+            return out
+
+        # Each tile is processed with a halo of neighbouring source pixels so
+        # the filters see the same context as on the whole image; only the
+        # tile's own region is copied out, so seams are not visible.
+        source_reach, output_reach = DENOISE_TIERS[self.denoise]
+        halo = source_reach + BICUBIC_REACH + -(-output_reach // scale)
+        for y in range(0, h, tile):
+            for x in range(0, w, tile):
+                y0, x0 = max(0, y - halo), max(0, x - halo)
+                y1, x1 = min(h, y + tile + halo), min(w, x + tile + halo)
+                upscaled = self._upscale_tile(img[y0:y1, x0:x1], scale)
+
+                th, tw = (min(h, y + tile) - y) * scale, (min(w, x + tile) - x) * scale
+                oy, ox = (y - y0) * scale, (x - x0) * scale
+                out[y * scale:y * scale + th, x * scale:x * scale + tw] = upscaled[oy:oy + th, ox:ox + tw]
+        return out
+
+    def _upscale_tile(self, img, scale):
+        h, w = img.shape[:2]
+        color = img.ndim == 3 and img.shape[2] == 3
+
+        # Edge-preserving pass at source resolution, mostly against JPEG
+        # artifacts, at 1/scale^2 of the cost of filtering the output
+        if color and self.denoise in ("balanced", "fast"):
+            img = cv2.bilateralFilter(img, 5, 30, 3)
+
         # High quality bicubic resize
         upscaled = cv2.resize(img, (w * scale, h * scale), interpolation=cv2.INTER_CUBIC)
 
         # Sharpen to simulate "super-resolution" detail restoration
         # Using an unsharp mask approach or a simple convolution kernel
-        kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-        sharpened = cv2.filter2D(upscaled, -1, kernel)
+        sharpened = cv2.filter2D(upscaled, -1, SHARPEN_KERNEL)
 
         # Slight denoising to clean up artifacts from sharpening
-        if len(sharpened.shape) == 3:
+        if color and self.denoise == "best":
             sharpened = cv2.fastNlMeansDenoisingColored(sharpened, None, 10, 10, 7, 21)
+        elif color and self.denoise == "balanced":
+            sharpened = cv2.bilateralFilter(sharpened, 5, 75, 5)
 
         return sharpened
 
-    def generate_normal_map(self, img):
-        # Ensure image is valid
+    def generate_maps(self, img):
+        """
+        Diffuse, normal and displacement maps of an upscaled image in one pass.
+
+        Grayscale is computed once and shared. The normal map is built in row
+        strips in preallocated float32 buffers, so its intermediates stay the
+        size of one strip rather than several full-size float arrays. The
+        full-size outputs come from _allocate_output, so with memmap_dir
+        none of them is held in RAM.
+        """
         if img is None: return None
+        h, w = img.shape[:2]
+        gray = self._grayscale(img, None if img.ndim == 2 else self._allocate_output((h, w), np.uint8))
+        return {
+            "diffuse": img,
+            "normal": self._normal_map(gray, self._allocate_output((h, w, 3), np.uint8)),
+            "disp": self._displacement_map(gray, self._allocate_output((h, w), np.uint8)),
+        }
 
-        # Convert to grayscale for gradient calculation
-        if len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = img
-
-        # Sobel gradients to find slope in X and Y
-        scale = 1
-        delta = 0
-        ddepth = cv2.CV_32F
-
-        gx = cv2.Sobel(gray, ddepth, 1, 0, ksize=3, scale=scale, delta=delta, borderType=cv2.BORDER_DEFAULT)
-        gy = cv2.Sobel(gray, ddepth, 0, 1, ksize=3, scale=scale, delta=delta, borderType=cv2.BORDER_DEFAULT)
-
-        # Normal map construction
-        # Z component is a constant strength factor (strength of the normal)
-        # Lower z = bumpier surface
-        strength = 5.0
-        z = np.ones_like(gx) * strength
-
-        # Stack into (x, y, z) vector
-        normal = np.dstack((-gx, -gy, z))
-
-        # Normalize vectors
-        norm = np.linalg.norm(normal, axis=2, keepdims=True)
-        normal = normal / (norm + 1e-5)
-
-        # Map to 0-255 range ( [-1,1] -> [0,255] )
-        # 0.5 * normal + 0.5 maps [-1, 1] to [0, 1]
-        normal_rgb = ((normal + 1) * 0.5 * 255).astype(np.uint8)
-
-        # OpenCV uses BGR, but normal maps are spatial vectors RGB=(X,Y,Z).
-        # Most 3D engines expect RGB maps.
-        # If we save using cv2.imwrite, it treats array as BGR.
-        # So we need to construct an array that when written as BGR, results in the correct RGB file.
-        # File R channel = Array[2] (because imwrite writes Array[0] to B, Array[1] to G, Array[2] to R) - WAIT.
-        # cv2.imwrite saves the 0th channel to Blue, 1st to Green, 2nd to Red.
-        # We want the FILE to have Red=X, Green=Y, Blue=Z.
-        # So we need to put X in the 2nd channel of the array? No.
-        # We want the file's first byte (or standard RGB ordering) to be X.
-        # Standard image files are RGB or BGR depending on format, but let's assume standard PNG view.
-        # If I open the image, R should be X.
-        # OpenCV 'img' is BGR. imwrite writes 'img' B->FileB, G->FileG, R->FileR.
-        # So we want img.R (channel 2) to be X. img.G (channel 1) to be Y. img.B (channel 0) to be Z.
-
-        # So we need to construct (Z, Y, X) for the BGR array.
-        normal_bgr = cv2.cvtColor(normal_rgb, cv2.COLOR_RGB2BGR)
-
-        return normal_bgr
+    def generate_normal_map(self, img):
+        if img is None: return None
+        return self._normal_map(self._grayscale(img))
 
     def generate_displacement_map(self, img):
         if img is None: return None
-        if len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = img
+        return self._displacement_map(self._grayscale(img))
+
+    @staticmethod
+    def _grayscale(img, out=None):
+        if img.ndim == 2:
+            return img
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY, dst=out)
+
+    @staticmethod
+    def _normal_map(gray, out=None):
+        h, w = gray.shape
+        normal = np.empty((h, w, 3), np.uint8) if out is None else out
+
+        rows = min(MAP_STRIP_ROWS, h)
+        # Sobel buffers hold the strip plus one halo row above and below
+        gx = np.empty((rows + 2, w), np.float32)
+        gy = np.empty((rows + 2, w), np.float32)
+        length = np.empty((rows, w), np.float32)
+        channel = np.empty((rows, w), np.float32)
+
+        for y in range(0, h, rows):
+            y0, y1 = max(0, y - 1), min(h, y + rows + 1)
+            count = min(rows, h - y)
+
+            # Sobel gradients to find slope in X and Y. Halo rows come from the
+            # neighbouring strips, so only real image edges use the border rule.
+            strip = gray[y0:y1]
+            cv2.Sobel(strip, cv2.CV_32F, 1, 0, dst=gx[:y1 - y0], ksize=3, borderType=cv2.BORDER_DEFAULT)
+            cv2.Sobel(strip, cv2.CV_32F, 0, 1, dst=gy[:y1 - y0], ksize=3, borderType=cv2.BORDER_DEFAULT)
+            sx, sy = gx[y - y0:y - y0 + count], gy[y - y0:y - y0 + count]
+            norm, tmp = length[:count], channel[:count]
+
+            # Length of (-gx, -gy, strength); lower strength = bumpier surface
+            np.multiply(sx, sx, out=norm)
+            np.multiply(sy, sy, out=tmp)
+            norm += tmp
+            norm += NORMAL_STRENGTH * NORMAL_STRENGTH
+            np.sqrt(norm, out=norm)
+            norm += 1e-5
+
+            # Unit vector mapped from [-1, 1] to [0, 255]. Normal map files are
+            # RGB = (X, Y, Z) and cv2.imwrite takes BGR, so the array holds (Z, Y, X).
+            rows_out = normal[y:y + count]
+            for index, component in ((0, None), (1, sy), (2, sx)):
+                if component is None:
+                    np.divide(NORMAL_STRENGTH, norm, out=tmp)
+                else:
+                    np.divide(component, norm, out=tmp)
+                    np.negative(tmp, out=tmp)
+                tmp += 1
+                tmp *= 0.5
+                tmp *= 255
+                rows_out[..., index] = tmp
 
+        return normal
+
+    @staticmethod
+    def _displacement_map(gray, out=None):
         # Enhance contrast to maximize displacement effect using CLAHE
         clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        disp = clahe.apply(gray)
 
         # Invert if lighter colors should be "closer" (height map conventions vary, usually white=high)
         # Assuming input image shading: darker is usually shadow/deep. So standard is fine.
-        return disp
+        return clahe.apply(gray, out)
 
-def main():
-    parser = argparse.ArgumentParser(description="Texture Upscaler & Map Generator")
-    parser.add_argument("image_path", help="Path to input image")
-    args = parser.parse_args()
+def output_paths(image_path, output_dir=None, root=None):
+    """
+    Diffuse, normal and displacement map paths for an input image. In
+    `output_dir`, the image's path relative to `root` is mirrored, so images
+    with the same name in different folders do not overwrite each other's maps
+    (without `root`, only the file name is kept).
+    """
+    base, ext = os.path.splitext(image_path)
+    if output_dir:
+        if root:
+            relative = os.path.relpath(os.path.abspath(base), os.path.abspath(root))
+            if relative.split(os.sep)[0] == os.pardir:
+                raise ValueError(f"{image_path} is outside {root}")
+        else:
+            relative = os.path.basename(base)
+        base = os.path.join(output_dir, relative)
+    return {
+        "diffuse": f"{base}_4k{ext}",
+        "normal": f"{base}_normal{ext}",
+        "disp": f"{base}_disp{ext}",
+    }
 
-    upscaler = TextureUpscaler()
-    try:
-        print(f"Processing {args.image_path}...")
-        high_res = upscaler.upscale_image(args.image_path)
+def is_up_to_date(image_path, outputs):
+    """True when every output exists and is newer than the source image"""
+    source_mtime = os.path.getmtime(image_path)
+    return all(os.path.exists(p) and os.path.getmtime(p) >= source_mtime for p in outputs.values())
+
+class TextureCache:
+    """
+    Content-addressed store of finished outputs (diffuse, normal, displacement).
+
+    Entries are keyed by a hash of the decoded pixels and every parameter that
+    changes the output, so the same product shot under another name (other
+    colorway URL, another reseller) is processed once. An SQLite index keeps
+    each entry's size and last use; the least recently used entries are
+    evicted once the cache grows past `max_bytes`. Safe to share between the
+    batch worker processes.
+    """
+
+    KINDS = ("diffuse", "normal", "disp")
 
-        base, ext = os.path.splitext(args.image_path)
-        out_diffuse = f"{base}_4k{ext}"
-        out_normal = f"{base}_normal{ext}"
-        out_disp = f"{base}_disp{ext}"
+    def __init__(self, directory=TEXTURE_CACHE_DIR, max_bytes=TEXTURE_CACHE_MAX_BYTES):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=60)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
 
-        cv2.imwrite(out_diffuse, high_res)
-        print(f"Saved High-Res Texture: {out_diffuse}")
+    def close(self):
+        self.conn.close()
 
-        normal_map = upscaler.generate_normal_map(high_res)
-        cv2.imwrite(out_normal, normal_map)
-        print(f"Saved Normal Map: {out_normal}")
+    @staticmethod
+    def key(img, upscaler, scale, ext):
+        params = f"v{TEXTURE_CACHE_VERSION}|{scale}|{upscaler.denoise}|{upscaler.use_realesrgan}|{NORMAL_STRENGTH}|{ext.lower()}"
+        digest = hashlib.sha1(params.encode("utf-8"))
+        digest.update(f"{img.shape}|{img.dtype}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(img).data)
+        return digest.hexdigest()
 
-        disp_map = upscaler.generate_displacement_map(high_res)
-        cv2.imwrite(out_disp, disp_map)
-        print(f"Saved Displacement Map: {out_disp}")
+    def _entry_dir(self, key):
+        return os.path.join(self.directory, key[:2], key)
 
+    def restore(self, key, outputs):
+        """Copy a cached entry to `outputs`; False on a miss"""
+        entry = self._entry_dir(key)
+        row = self.conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        try:
+            for kind in self.KINDS:
+                ext = os.path.splitext(outputs[kind])[1]
+                shutil.copyfile(os.path.join(entry, kind + ext), outputs[kind])
+        except OSError:
+            # Evicted by another worker meanwhile
+            return False
+        self.conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return True
+
+    def store(self, key, outputs):
+        """Add freshly written outputs to the cache, then evict down to max_bytes"""
+        entry = self._entry_dir(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        # Files are staged in a private directory and renamed into place, so
+        # readers never see a half-written entry
+        staging = tempfile.mkdtemp(dir=self.directory, prefix=".staging-")
+        size = 0
+        for kind in self.KINDS:
+            ext = os.path.splitext(outputs[kind])[1]
+            target = os.path.join(staging, kind + ext)
+            shutil.copyfile(outputs[kind], target)
+            size += os.path.getsize(target)
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # Another worker stored the same image first
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (key, size, time.time()))
+        self.conn.commit()
+        self.evict()
+
+    def size(self):
+        return self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        total = self.size()
+        while total > self.max_bytes:
+            oldest = self.conn.execute("SELECT key, bytes FROM entries ORDER BY last_used LIMIT 64").fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+            self.conn.commit()
+
+def process_image(upscaler, image_path, output_dir=None, verbose=True, cache=None, scale=4, root=None):
+    """
+    Upscale one image and write its diffuse, normal and displacement maps
+    (see output_paths for `output_dir` and `root`).
+    Returns True when the outputs came from `cache` instead of being computed.
+    """
+    outputs = output_paths(image_path, output_dir, root)
+    if output_dir:
+        os.makedirs(os.path.dirname(outputs["diffuse"]), exist_ok=True)
+
+    img = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise FileNotFoundError(f"Image not found at {image_path}")
+
+    if cache is not None:
+        key = cache.key(img, upscaler, scale, os.path.splitext(image_path)[1])
+        if cache.restore(key, outputs):
+            if verbose: print(f"Restored maps from cache: {outputs['diffuse']}")
+            return True
+
+    high_res = upscaler.upscale(img, scale)
+
+    cv2.imwrite(outputs["diffuse"], high_res)
+    if verbose: print(f"Saved High-Res Texture: {outputs['diffuse']}")
+
+    maps = upscaler.generate_maps(high_res)
+    cv2.imwrite(outputs["normal"], maps["normal"])
+    if verbose: print(f"Saved Normal Map: {outputs['normal']}")
+
+    cv2.imwrite(outputs["disp"], maps["disp"])
+    if verbose: print(f"Saved Displacement Map: {outputs['disp']}")
+
+    if cache is not None:
+        cache.store(key, outputs)
+    return False
+
+def collect_inputs(target):
+    """
+    Images to process: a single image, every image in a directory (recursive),
+    or a manifest file listing one path per line (relative to the manifest).
+    """
+    if os.path.isdir(target):
+        paths = []
+        for root, _, files in os.walk(target):
+            for name in sorted(files):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in IMAGE_EXTENSIONS and not stem.endswith(OUTPUT_SUFFIXES):
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    if os.path.splitext(target)[1].lower() in (".txt", ".lst"):
+        base_dir = os.path.dirname(os.path.abspath(target))
+        with open(target, encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        return [os.path.join(base_dir, line) for line in lines if line and not line.startswith("#")]
+
+    return [target]
+
+# One upscaler (and cache connection) per worker process, created by _init_worker
+_worker_upscaler = None
+_worker_cache = None
+
+def _init_worker(upscaler_options, cache_options):
+    global _worker_upscaler, _worker_cache
+    # Parallelism comes from the process pool; OpenCV's own thread pool
+    # in every worker would oversubscribe the cores
+    cv2.setNumThreads(1)
+    _worker_upscaler = TextureUpscaler(**upscaler_options)
+    _worker_cache = TextureCache(**cache_options) if cache_options is not None else None
+
+def _process_task(task):
+    image_path, output_dir, root = task
+    try:
+        cached = process_image(_worker_upscaler, image_path, output_dir, verbose=False, cache=_worker_cache,
+                               root=root)
     except Exception as e:
-        print(f"Error: {e}")
+        return image_path, str(e), False
+    return image_path, None, cached
+
+def batch_process(image_paths, output_dir=None, workers=None, force=False, upscaler_options=None,
+                  cache_options=None, root=None):
+    """
+    Process many images on a process pool (one worker per core by default).
+    In `output_dir`, outputs mirror each image's path relative to `root`
+    (default: the images' common directory).
+    Images whose outputs are newer than the source are skipped unless `force`.
+    `upscaler_options` are passed to each worker's TextureUpscaler; with
+    `cache_options` (TextureCache arguments, {} for the defaults) duplicate
+    images are restored from the texture cache.
+    Returns {"processed": [...], "cached": [...], "skipped": [...], "failed": {path: error}, "seconds": float}.
+    """
+    # A manifest may list an image twice; it is processed once
+    image_paths = list(dict.fromkeys(image_paths))
+    if output_dir and root is None and image_paths:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in image_paths])
+
+    pending, skipped, owners = [], [], {}
+    for path in image_paths:
+        outputs = output_paths(path, output_dir, root)
+        # Workers writing the same file would silently keep only one image's maps
+        other = owners.setdefault(os.path.normcase(os.path.abspath(outputs["diffuse"])), path)
+        if other != path:
+            raise ValueError(f"{path} and {other} would both write {outputs['diffuse']}")
+        if not force and os.path.exists(path) and is_up_to_date(path, outputs):
+            skipped.append(path)
+        else:
+            pending.append(path)
+
+    report = {"processed": [], "cached": [], "skipped": skipped, "failed": {}, "seconds": 0.0}
+    if not pending:
+        print(f"All {len(skipped)} images are up to date")
+        return report
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    print(f"Processing {len(pending)} images on {workers} workers ({len(skipped)} up to date)...")
+
+    start = time.perf_counter()
+    # (path, times it was running when a worker died)
+    queue = deque((path, 0) for path in pending)
+    while queue:
+        # One task per worker, so a worker killed mid-image (e.g. by the OOM
+        # killer) only takes the images in flight down with the pool
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(upscaler_options or {}, cache_options)) as pool:
+            running, broken = {}, False
+            while running or (queue and not broken):
+                while queue and not broken and len(running) < workers:
+                    # Retried images run alone, so a repeat crash cannot take other images with it
+                    if running and (queue[0][1] or any(c for _, c in running.values())):
+                        break
+                    path, crashes = queue.popleft()
+                    running[pool.submit(_process_task, (path, output_dir, root))] = (path, crashes)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, crashes = running.pop(future)
+                    try:
+                        _, error, cached = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        # Any image in flight may have been the one that killed
+                        # the worker; each gets one more try in a fresh pool
+                        if crashes < POOL_CRASH_RETRIES:
+                            queue.append((path, crashes + 1))
+                            continue
+                        error, cached = "worker process died (out of memory?)", False
+                    if error:
+                        report["failed"][path] = error
+                        print(f"Error: {path}: {error}")
+                    else:
+                        report["processed"].append(path)
+                        if cached:
+                            report["cached"].append(path)
+        if broken and queue:
+            print(f"Warning: a worker process died, restarting the pool for {len(queue)} images")
+    report["seconds"] = time.perf_counter() - start
+
+    rate = len(report["processed"]) / report["seconds"] if report["seconds"] else 0.0
+    print(f"Processed {len(report['processed'])} images in {report['seconds']:.1f}s ({rate:.2f} images/sec), "
+          f"{len(report['cached'])} from cache, {len(skipped)} skipped, {len(report['failed'])} failed")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Texture Upscaler & Map Generator")
+    parser.add_argument("image_path", help="Input image, directory of images, or manifest (.txt, one path per line)")
+    parser.add_argument("--output-dir", help="Write maps here instead of next to each source image")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batches (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Reprocess images whose outputs are up to date")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE,
+                        help="Upscale larger images in tiles of this many source pixels (0 = whole image at once)")
+    parser.add_argument("--memmap-dir", help="Write upscaled images through memory-mapped scratch files in this directory")
+    parser.add_argument("--denoise", choices=list(DENOISE_TIERS), default=DEFAULT_DENOISE,
+                        help="Quality tier: best (NL-means, slow), balanced, fast (bulk ingest) or none")
+    parser.add_argument("--cache-dir", default=TEXTURE_CACHE_DIR, help="Content-addressed cache of finished outputs")
+    parser.add_argument("--cache-size", type=float, default=TEXTURE_CACHE_MAX_BYTES / 1024 ** 3,
+                        help="Evict least recently used cache entries above this many GB")
+    parser.add_argument("--no-cache", action="store_true", help="Always recompute, without reading or filling the cache")
+    args = parser.parse_args()
+
+    options = {"tile_size": args.tile_size or None, "memmap_dir": args.memmap_dir, "denoise": args.denoise}
+    cache_options = None if args.no_cache else {
+        "directory": args.cache_dir, "max_bytes": int(args.cache_size * 1024 ** 3),
+    }
+
+    if os.path.isfile(args.image_path) and os.path.splitext(args.image_path)[1].lower() in IMAGE_EXTENSIONS:
+        upscaler = TextureUpscaler(**options)
+        cache = TextureCache(**cache_options) if cache_options is not None else None
+        try:
+            print(f"Processing {args.image_path}...")
+            process_image(upscaler, args.image_path, args.output_dir, cache=cache)
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        finally:
+            if cache is not None:
+                cache.close()
+        return
+
+    image_paths = collect_inputs(args.image_path)
+    if not image_paths:
+        print(f"Error: no images found in {args.image_path}")
+        sys.exit(1)
+
+    # Outputs mirror the layout below a scanned directory
+    root = args.image_path if os.path.isdir(args.image_path) else None
+    report = batch_process(image_paths, args.output_dir, args.workers, args.force, options, cache_options, root)
+    if report["failed"]:
         sys.exit(1)
 
 if __name__ == "__main__":